@@ -0,0 +1,4 @@
+"""
+Benchmarks de rendimiento de Ether Blades.
+Cada módulo se ejecuta como script: python -m benchmarks.<modulo>
+"""
@@ -0,0 +1,58 @@
+"""
+Benchmark: almacén SQLite con muchos jugadores.
+Carga n_jugadores x 3 partidas y mide el guardado en lote, el listado de
+un jugador y una búsqueda entre todos por columnas indexadas.
+Ejecutar: python -m benchmarks.bench_almacen_sqlite [n_jugadores]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from servicios import AlmacenPartidasSQLite
+from servicios.persistencia_estructuras import DatosPartida, ContextoNarrativo, EstadoCombateGuardado
+from .bench_guardado import crear_partida
+
+UBICACIONES = ("Ciudad de Amarth", "Puerto Gris", "Bosque de Lys", "Minas de Korr")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    personaje, contexto = crear_partida(20)
+    base = DatosPartida(slot=1, nombre_partida="Partida", personaje=personaje.to_dict_guardado(),
+                        contexto=contexto, combate=EstadoCombateGuardado())
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen = AlmacenPartidasSQLite(str(Path(directorio) / "partidas.db"), formato="zlib")
+
+        inicio = time.perf_counter()
+        for j in range(n):
+            almacen.guardar_datos(f"jugador{j}", *(
+                base.model_copy(update={
+                    "slot": slot,
+                    "personaje": {**base.personaje, "nivel": rng.randint(1, 30)},
+                    "contexto": ContextoNarrativo(ubicacion_actual=rng.choice(UBICACIONES))
+                })
+                for slot in (1, 2, 3)
+            ))
+        carga = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for j in range(0, n, max(1, n // 500)):
+            almacen.listar_partidas(f"jugador{j}")
+        listado = (time.perf_counter() - inicio) / len(range(0, n, max(1, n // 500))) * 1e6
+
+        inicio = time.perf_counter()
+        encontradas = almacen.buscar_partidas(nivel_min=25, ubicacion="Puerto Gris", limite=50)
+        busqueda = (time.perf_counter() - inicio) * 1e3
+
+        print(f"=== Almacén SQLite ({n} jugadores, {3 * n} partidas) ===\n")
+        print(f"Guardado (3 partidas por transacción) {carga / (3 * n) * 1e3:>8.3f} ms/partida")
+        print(f"Listar partidas de un jugador         {listado:>8.1f} µs")
+        print(f"Buscar nivel>=25 en Puerto Gris       {busqueda:>8.2f} ms ({len(encontradas)} resultados)")
+        almacen.cerrar()
+
+
+if __name__ == "__main__":
+    main()
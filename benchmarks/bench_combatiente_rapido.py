@@ -0,0 +1,55 @@
+"""
+Benchmark: combates completos con Personaje contra CombatienteRapido.
+Mide el mismo combate (misma semilla) con los modelos Pydantic copiados en
+cada repetición y con combatientes rápidos + resultados compactos.
+Ejecutar: python -m benchmarks.bench_combatiente_rapido [n_combates]
+"""
+import sys
+import time
+from entidades import Personaje, Ficha, Hephix, HephixTipo, ClaseTipo, crear_espada_basica
+from patrones import EventBus
+from servicios import CombateService
+
+
+def crear_combatiente(nombre: str, fuerza: int) -> Personaje:
+    ficha = Ficha()
+    ficha.caracteristicas.fuerza = fuerza
+    ficha.caracteristicas.reflejos = 5
+    ficha.caracteristicas.resistencia = 6
+    ficha.caracteristicas.stamina = 3
+    ficha.combate.armas_cortantes = 10
+    personaje = Personaje(
+        nombre=nombre, edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+        hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=ficha
+    )
+    personaje.equipar_arma(crear_espada_basica())
+    return personaje
+
+
+def medir(plantillas, n_combates: int, rapido: bool) -> float:
+    """Milisegundos promedio por combate"""
+    inicio = time.perf_counter()
+    for semilla in range(n_combates):
+        servicio = CombateService(EventBus(guardar_historial=False), semilla=semilla,
+                                  resultados_compactos=rapido)
+        if rapido:
+            combatientes = [servicio.crear_combatiente_rapido(p) for p in plantillas]
+        else:
+            combatientes = [p.model_copy(deep=True) for p in plantillas]
+        servicio.ejecutar_combate(combatientes, limite_historial=0)
+    return (time.perf_counter() - inicio) / n_combates * 1e3
+
+
+def main():
+    n_combates = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    plantillas = [crear_combatiente("A", 7), crear_combatiente("B", 6)]
+
+    print(f"=== Costo por combate ({n_combates:,} combates) ===\n")
+    base = medir(plantillas, n_combates, rapido=False)
+    rapido = medir(plantillas, n_combates, rapido=True)
+    print(f"{'Personaje (Pydantic)':<34}{base:>8.3f} ms")
+    print(f"{'CombatienteRapido':<34}{rapido:>8.3f} ms  (x{base / rapido:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Benchmark: tiradas individuales (tirar_dados) vs tiradas en lote (tirar_dados_lote).
+Ejecutar: python -m benchmarks.bench_dados [n_tiradas]
+"""
+import sys
+import time
+from entidades import tirar_dados, tirar_dados_lote
+
+
+def medir(funcion, repeticiones: int = 3) -> float:
+    """Retorna el mejor tiempo (en segundos) de varias repeticiones"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    n_tiradas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    
+    print(f"=== Benchmark de dados ({n_tiradas:,} tiradas por pool) ===\n")
+    print(f"{'Pool':<8}{'Bucle (s)':>12}{'Lote (s)':>12}{'Aceleración':>14}")
+    
+    for cantidad, caras in [(3, 6), (2, 6), (1, 10)]:
+        t_bucle = medir(lambda: [tirar_dados(cantidad, caras) for _ in range(n_tiradas)], 1)
+        t_lote = medir(lambda: tirar_dados_lote(n_tiradas, cantidad, caras))
+        pool = f"{cantidad}d{caras}"
+        print(f"{pool:<8}{t_bucle:>12.4f}{t_lote:>12.4f}{t_bucle / t_lote:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark: auto-empaque de botín con límite de peso y de slots.
+Mide cuánto tarda Inventario.auto_empacar con cientos de candidatos, tanto
+con valores independientes del peso como con valores proporcionales al peso
+(el caso difícil para la ramificación y poda).
+Ejecutar: python -m benchmarks.bench_empaque [n_candidatos]
+"""
+import random
+import sys
+import time
+from entidades import Inventario, Item
+
+
+def generar_botin(n: int, correlacionado: bool, semilla: int = 0):
+    rng = random.Random(semilla)
+    botin = []
+    for i in range(n):
+        peso = rng.randint(1, 100) / 10
+        valor = int(peso * 10) + rng.randint(0, 10) if correlacionado else rng.randint(1, 500)
+        botin.append(Item(nombre=f"Objeto {i}", valor=valor, peso=peso,
+                          cantidad=rng.choice([1, 1, 1, 5, 20]), es_apilable=True))
+    return botin
+
+
+def medir(botin, repeticiones: int = 5) -> float:
+    """Milisegundos promedio por auto-empaque"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        Inventario(capacidad_maxima=25, peso_maximo=150.0).auto_empacar(botin)
+    return (time.perf_counter() - inicio) / repeticiones * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    print(f"=== Auto-empaque ({n} candidatos, 25 slots, 150 kg) ===\n")
+    for nombre, correlacionado in (("Valores independientes", False),
+                                   ("Valor proporcional al peso", True)):
+        print(f"{nombre:<34}{medir(generar_botin(n, correlacionado)):>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: costo por ataque de la publicación de eventos en CombateService.
+Compara el bus por defecto (con historial) contra el camino rápido
+(sin historial ni subscriptores) y contra el bus pausado (cota inferior).
+Ejecutar: python -m benchmarks.bench_eventos [n_ataques]
+"""
+import sys
+import time
+from entidades import Personaje, Ficha, Hephix, HephixTipo, ClaseTipo, crear_espada_basica
+from patrones import EventBus
+from servicios import CombateService
+
+
+def crear_combatiente(nombre: str) -> Personaje:
+    """Combatiente con mucha vida para que no muera durante la medición"""
+    ficha = Ficha()
+    ficha.caracteristicas.fuerza = 6
+    ficha.caracteristicas.reflejos = 6
+    ficha.caracteristicas.resistencia = 20
+    ficha.caracteristicas.stamina = 20
+    ficha.combate.armas_cortantes = 10
+    personaje = Personaje(
+        nombre=nombre, edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+        hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=ficha
+    )
+    personaje.equipar_arma(crear_espada_basica())
+    return personaje
+
+
+def medir_por_ataque(bus: EventBus, n_ataques: int) -> float:
+    """Microsegundos promedio por resolver_ataque"""
+    a, b = crear_combatiente("A"), crear_combatiente("B")
+    servicio = CombateService(bus, semilla=1)
+    servicio.iniciar_combate([a, b])
+
+    inicio = time.perf_counter()
+    for _ in range(n_ataques):
+        a.restaurar_stats_completos()
+        b.restaurar_stats_completos()
+        servicio.resolver_ataque(a, b)
+    return (time.perf_counter() - inicio) / n_ataques * 1e6
+
+
+def main():
+    n_ataques = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    bus_pausado = EventBus()
+    bus_pausado.pausar()
+
+    casos = [
+        ("Con historial (por defecto)", EventBus()),
+        ("Sin historial ni subscriptores", EventBus(guardar_historial=False)),
+        ("Bus pausado (sin eventos)", bus_pausado),
+    ]
+
+    print(f"=== Costo por ataque ({n_ataques:,} ataques) ===\n")
+    base = None
+    for nombre, bus in casos:
+        us = medir_por_ataque(bus, n_ataques)
+        base = base or us
+        print(f"{nombre:<34}{us:>8.2f} µs  ({base - us:+.2f} µs vs defecto)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark: tamaño y tiempos de guardado/carga de cada codec.
+Usa un personaje con inventario grande y el log narrativo completo.
+Ejecutar: python -m benchmarks.bench_formato_guardado [n_objetos]
+"""
+import sys
+import tempfile
+import time
+from patrones import SingletonMeta
+from servicios import PersistenciaService
+from .bench_guardado import crear_partida
+
+FORMATOS = ("json", "compacto", "zlib")
+
+
+def medir(funcion, repeticiones: int = 20) -> float:
+    """Milisegundos promedio por llamada"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    personaje, contexto = crear_partida(n)
+
+    print(f"=== Formatos de guardado ({n} objetos, 50 eventos narrativos) ===\n")
+    print(f"{'Codec':<10}{'Tamaño':>10}{'Guardar':>11}{'Carga confiable':>18}{'Carga validada':>17}")
+    for formato in FORMATOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            SingletonMeta.reset_instances()
+            servicio = PersistenciaService(directorio, formato=formato)
+            archivo = servicio.guardar_partida(personaje, contexto, slot=1)
+
+            guardar = medir(lambda: servicio.guardar_partida(personaje, contexto, slot=1))
+            confiable = medir(lambda: servicio.cargar_partida(1, confiable=True))
+            validada = medir(lambda: servicio.cargar_partida(1))
+            kb = archivo.stat().st_size / 1024
+            print(f"{formato:<10}{kb:>7.1f} KB{guardar:>8.2f} ms{confiable:>15.2f} ms{validada:>14.2f} ms")
+    SingletonMeta.reset_instances()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: costo de un autoguardado.
+Compara el guardado completo (todas las secciones se reserializan) contra
+el incremental, donde solo cambió el contexto o no cambió nada. Todos
+incluyen la escritura atómica con fsync. El último caso mide lo que tarda
+el hilo del juego en pedir un autoguardado a AutoguardadoService.
+Ejecutar: python -m benchmarks.bench_guardado [n_objetos]
+"""
+import sys
+import tempfile
+import time
+from entidades import Personaje, Ficha, Hephix, HephixTipo, ClaseTipo, Item, crear_espada_basica
+from patrones import SingletonMeta
+from servicios import PersistenciaService, AutoguardadoService
+from servicios.persistencia_estructuras import ContextoNarrativo, EventoNarrativo, TipoEvento
+
+
+def crear_partida(n_objetos: int):
+    """Personaje con inventario lleno y contexto con el log narrativo completo"""
+    personaje = Personaje(
+        nombre="Aldric", edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+        hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=Ficha()
+    )
+    personaje.inventario.capacidad_maxima = n_objetos + 10
+    personaje.inventario.peso_maximo = 1e9
+    personaje.equipar_arma(crear_espada_basica())
+    for i in range(n_objetos):
+        personaje.inventario.agregar_item(Item(nombre=f"Objeto {i}", valor=i, peso=0.5))
+
+    contexto = ContextoNarrativo()
+    for i in range(50):
+        contexto.agregar_evento(EventoNarrativo(
+            tipo=TipoEvento.OTRO, descripcion=f"Evento {i} " + "x" * 80,
+            datos_adicionales={"indice": i, "lugar": "Amarth"}
+        ))
+    return personaje, contexto
+
+
+def medir(servicio, personaje, contexto, modificadas, incremental: bool,
+          repeticiones: int = 50) -> float:
+    """Milisegundos promedio por guardado"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        if modificadas:
+            servicio.marcar_modificado(*modificadas)
+        servicio.guardar_partida(personaje, contexto, slot=1, incremental=incremental)
+    return (time.perf_counter() - inicio) / repeticiones * 1e3
+
+
+def medir_segundo_plano(servicio, personaje, contexto, repeticiones: int = 50) -> float:
+    """Milisegundos promedio que el hilo del juego dedica a cada solicitud"""
+    with AutoguardadoService(servicio, espera=0.01) as autoguardado:
+        total = 0.0
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            autoguardado.solicitar(personaje, contexto, slot=1)
+            total += time.perf_counter() - inicio
+            time.sleep(0.005)  # Un frame de juego entre checkpoints
+        autoguardado.vaciar()
+    return total / repeticiones * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    personaje, contexto = crear_partida(n)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        SingletonMeta.reset_instances()
+        servicio = PersistenciaService(directorio)
+        servicio.guardar_partida(personaje, contexto, slot=1)
+
+        print(f"=== Autoguardado ({n} objetos, 50 eventos narrativos) ===\n")
+        casos = (
+            ("Completo", (), False),
+            ("Incremental, contexto modificado", ("contexto",), True),
+            ("Incremental, sin cambios", (), True),
+        )
+        for nombre, modificadas, incremental in casos:
+            ms = medir(servicio, personaje, contexto, modificadas, incremental)
+            print(f"{nombre:<36}{ms:>8.2f} ms")
+        ms = medir_segundo_plano(servicio, personaje, contexto)
+        print(f"{'Segundo plano (captura completa)':<36}{ms:>8.2f} ms (hilo del juego)")
+        SingletonMeta.reset_instances()
+
+
+if __name__ == "__main__":
+    main()
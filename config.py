@@ -26,6 +26,9 @@ class Settings(BaseSettings):
     # Versión del sistema (para compatibilidad de guardados)
     version: str = "1.0.0"
     
+    # Formato de los guardados: "json" (legible), "compacto" o "zlib"
+    formato_guardado: str = "json"
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -28,7 +28,21 @@ from .dados import (
     tirar_d100,
     tirar_ataque,
     tirar_defensa,
-    establecer_semilla
+    establecer_semilla,
+    crear_generador,
+    derivar_semillas,
+    TiradasLote,
+    tirar_dados_lote
+)
+
+# Distribuciones exactas de dados
+from .distribuciones import (
+    DistribucionDados,
+    distribucion_dados,
+    distribucion_ataque,
+    distribucion_defensa,
+    distribucion_iniciativa,
+    probabilidades_ataque
 )
 
 # Hephix
@@ -40,9 +54,13 @@ from .ficha import (
     HabilidadesCombate,
     HabilidadesEducacion,
     HabilidadesTalento,
-    Ficha
+    Ficha,
+    CATEGORIA_HABILIDAD
 )
 
+# Catálogo compartido de objetos
+from .catalogo import CatalogoObjetos, ObjetoCatalogado, CATALOGO, CONTEXTO_GUARDADO
+
 # Armas y armaduras
 from .arma import (
     Arma,
@@ -63,6 +81,7 @@ from .inventario import (
     crear_botiquin_primeros_auxilios,
     crear_kit_atencion_medica
 )
+from .empaque import ResultadoEmpaque
 
 # Personaje
 from .personaje import Personaje
@@ -91,6 +110,18 @@ __all__ = [
     'tirar_ataque',
     'tirar_defensa',
     'establecer_semilla',
+    'crear_generador',
+    'derivar_semillas',
+    'TiradasLote',
+    'tirar_dados_lote',
+    
+    # Distribuciones
+    'DistribucionDados',
+    'distribucion_dados',
+    'distribucion_ataque',
+    'distribucion_defensa',
+    'distribucion_iniciativa',
+    'probabilidades_ataque',
     
     # Hephix
     'Hephix',
@@ -101,6 +132,13 @@ __all__ = [
     'HabilidadesEducacion',
     'HabilidadesTalento',
     'Ficha',
+    'CATEGORIA_HABILIDAD',
+    
+    # Catálogo
+    'CatalogoObjetos',
+    'ObjetoCatalogado',
+    'CATALOGO',
+    'CONTEXTO_GUARDADO',
     
     # Armas
     'Arma',
@@ -118,6 +156,7 @@ __all__ = [
     'crear_pocion_vida_menor',
     'crear_botiquin_primeros_auxilios',
     'crear_kit_atencion_medica',
+    'ResultadoEmpaque',
     
     # Personaje
     'Personaje',
@@ -1,14 +1,17 @@
 """
 Clases de Arma y Armadura para el sistema de combate.
 """
-from pydantic import BaseModel, Field
+from pydantic import Field
 from typing import Optional
 from .tipos import TipoArma, TipoAtaque, TipoArmadura, RarezaItem
+from .catalogo import CATALOGO, ObjetoCatalogado
+from .modelo_base import ModeloVersionado
 
 
-class Arma(BaseModel):
+class Arma(ObjetoCatalogado, ModeloVersionado):
     """
     Clase base para todas las armas del juego.
+    Versionada: las mejoras en el lugar invalidan el perfil de combate.
     """
     
     nombre: str
@@ -29,6 +32,8 @@ class Arma(BaseModel):
     # Propiedades
     rareza: RarezaItem = Field(default=RarezaItem.COMUN)
     es_magica: bool = Field(default=False)
+    valor: int = Field(default=0, ge=0, description="Valor en monedas")
+    peso: float = Field(default=0.0, ge=0.0)
     mejora_mecanica: int = Field(default=0, ge=0, le=10, description="Mejora de Manual")
     mejora_magica: int = Field(default=0, ge=0, le=10, description="Mejora de Arcanismo")
     
@@ -122,7 +127,7 @@ class Arma(BaseModel):
         return f"{self.nombre}{mejora_str} (Bonus: +{self.bonus_total()})"
 
 
-class Armadura(BaseModel):
+class Armadura(ObjetoCatalogado, ModeloVersionado):
     """
     Representa una armadura equipable.
     """
@@ -144,6 +149,8 @@ class Armadura(BaseModel):
     # Propiedades
     rareza: RarezaItem = Field(default=RarezaItem.COMUN)
     es_magica: bool = Field(default=False)
+    valor: int = Field(default=0, ge=0, description="Valor en monedas")
+    peso: float = Field(default=0.0, ge=0.0)
     
     # Durabilidad
     durabilidad_actual: Optional[int] = None
@@ -157,60 +164,69 @@ class Armadura(BaseModel):
         return f"{self.nombre} (Reducción: {self.reduccion_daño}, Bonus Reflejos: {self.bonus_reflejos:+d})"
 
 
-# Ejemplos y factory helpers
+# Definiciones del catálogo y factory helpers
+CATALOGO.registrar("espada_basica", Arma(
+    nombre="Espada Corta",
+    descripcion="Una espada de hierro común",
+    tipo_arma=TipoArma.CORTANTE_PUNZANTE,
+    tipo_ataque=TipoAtaque.MELEE,
+    daño_base=0,
+    bonus=2,
+    nivel_requerido=1,
+    habilidad_minima=0
+))
+
+CATALOGO.registrar("arco_basico", Arma(
+    nombre="Arco Corto",
+    descripcion="Un arco de madera simple",
+    tipo_arma=TipoArma.DISTANCIA,
+    tipo_ataque=TipoAtaque.DISTANCIA,
+    daño_base=0,
+    bonus=2,
+    nivel_requerido=1,
+    habilidad_minima=0
+))
+
+CATALOGO.registrar("baston_basico", Arma(
+    nombre="Bastón de Madera",
+    descripcion="Un bastón tallado con runas básicas",
+    tipo_arma=TipoArma.MAGICA,
+    tipo_ataque=TipoAtaque.MAGICO,
+    daño_base=0,
+    bonus=2,
+    nivel_requerido=1,
+    habilidad_minima=0,
+    es_magica=True
+))
+
+CATALOGO.registrar("armadura_ligera", Armadura(
+    nombre="Armadura de Cuero",
+    descripcion="Protección ligera de cuero curtido",
+    tipo=TipoArmadura.LIGERA,
+    reduccion_daño=2,
+    bonus_reflejos=0,
+    nivel_requerido=1
+))
+
+
 def crear_espada_basica() -> Arma:
     """Crea una espada básica de inicio"""
-    return Arma(
-        nombre="Espada Corta",
-        descripcion="Una espada de hierro común",
-        tipo_arma=TipoArma.CORTANTE_PUNZANTE,
-        tipo_ataque=TipoAtaque.MELEE,
-        daño_base=0,
-        bonus=2,
-        nivel_requerido=1,
-        habilidad_minima=0
-    )
+    return CATALOGO.crear("espada_basica")
 
 
 def crear_arco_basico() -> Arma:
     """Crea un arco básico de inicio"""
-    return Arma(
-        nombre="Arco Corto",
-        descripcion="Un arco de madera simple",
-        tipo_arma=TipoArma.DISTANCIA,
-        tipo_ataque=TipoAtaque.DISTANCIA,
-        daño_base=0,
-        bonus=2,
-        nivel_requerido=1,
-        habilidad_minima=0
-    )
+    return CATALOGO.crear("arco_basico")
 
 
 def crear_baston_basico() -> Arma:
     """Crea un bastón mágico básico"""
-    return Arma(
-        nombre="Bastón de Madera",
-        descripcion="Un bastón tallado con runas básicas",
-        tipo_arma=TipoArma.MAGICA,
-        tipo_ataque=TipoAtaque.MAGICO,
-        daño_base=0,
-        bonus=2,
-        nivel_requerido=1,
-        habilidad_minima=0,
-        es_magica=True
-    )
+    return CATALOGO.crear("baston_basico")
 
 
 def crear_armadura_ligera() -> Armadura:
     """Crea una armadura ligera básica"""
-    return Armadura(
-        nombre="Armadura de Cuero",
-        descripcion="Protección ligera de cuero curtido",
-        tipo=TipoArmadura.LIGERA,
-        reduccion_daño=2,
-        bonus_reflejos=0,
-        nivel_requerido=1
-    )
+    return CATALOGO.crear("armadura_ligera")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""
+Catálogo compartido de definiciones de ítems, armas y armaduras (flyweight).
+Cada definición se registra una vez con un ID. Los objetos creados desde el
+catálogo comparten sus valores (nombre, descripción, stats) y al
+serializarse para un guardado (con el contexto CONTEXTO_GUARDADO) guardan
+solo el ID y los campos que difieren de la definición (cantidad,
+durabilidad, mejoras...). Al cargar, los campos ausentes se completan
+desde el catálogo.
+"""
+from typing import Any, Dict, List, Optional, Type, TypeVar
+from pydantic import BaseModel, SerializationInfo, model_serializer, model_validator
+
+T = TypeVar("T", bound=BaseModel)
+
+# Contexto de serialización del camino de guardado: activa el formato ID + deltas
+CONTEXTO_GUARDADO = {"guardado": True}
+
+
+class CatalogoObjetos:
+    """Registro de definiciones inmutables por ID"""
+
+    def __init__(self):
+        self._definiciones: Dict[str, BaseModel] = {}
+
+    def __contains__(self, id_catalogo: str) -> bool:
+        return id_catalogo in self._definiciones
+
+    def __len__(self) -> int:
+        return len(self._definiciones)
+
+    def registrar(self, id_catalogo: str, definicion: BaseModel):
+        """
+        Registra una definición. Se guarda una copia, así que modificar el
+        objeto original después no altera el catálogo.
+        """
+        if id_catalogo in self._definiciones:
+            raise ValueError(f"Ya existe una definición con ID '{id_catalogo}'")
+        self._definiciones[id_catalogo] = definicion.model_copy(
+            update={"id_catalogo": id_catalogo}, deep=True
+        )
+
+    def definicion(self, id_catalogo: str) -> Optional[BaseModel]:
+        """Definición registrada (no modificar) o None"""
+        return self._definiciones.get(id_catalogo)
+
+    def crear(self, id_catalogo: str, **cambios) -> Any:
+        """
+        Crea una instancia de la definición con los cambios indicados.
+        Los cambios se validan (ValueError si no corresponden al modelo);
+        los valores no modificados se comparten con la definición.
+        """
+        definicion = self._definiciones.get(id_catalogo)
+        if definicion is None:
+            raise KeyError(f"No existe la definición '{id_catalogo}' en el catálogo")
+        if not cambios:
+            return definicion.model_copy()
+        
+        tipo = type(definicion)
+        desconocidos = set(cambios) - set(tipo.model_fields)
+        if desconocidos:
+            raise ValueError(f"{tipo.__name__} no tiene los campos {sorted(desconocidos)}")
+        datos = {campo: getattr(definicion, campo) for campo in tipo.model_fields}
+        datos.update(cambios)
+        return tipo.model_validate(datos)
+
+    def listar(self, tipo: Optional[Type[T]] = None) -> List[str]:
+        """IDs registrados, opcionalmente solo los de un tipo"""
+        return [id_catalogo for id_catalogo, definicion in self._definiciones.items()
+                if tipo is None or isinstance(definicion, tipo)]
+
+
+CATALOGO = CatalogoObjetos()
+
+
+class ObjetoCatalogado(BaseModel):
+    """
+    Modelo que puede provenir del catálogo.
+    Con `id_catalogo` definido (y registrado) y el contexto CONTEXTO_GUARDADO
+    se serializa como ID + deltas. Un model_dump() común da los datos completos.
+    """
+
+    id_catalogo: Optional[str] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _completar_desde_catalogo(cls, datos: Any) -> Any:
+        if not isinstance(datos, dict) or datos.get("id_catalogo") is None:
+            return datos
+        definicion = CATALOGO.definicion(datos["id_catalogo"])
+        if definicion is None:
+            return datos
+
+        completos = {campo: getattr(definicion, campo)
+                     for campo in type(definicion).model_fields if campo in cls.model_fields}
+        completos.update(datos)
+        return completos
+
+    @model_serializer(mode="wrap")
+    def _serializar_deltas(self, serializar, info: SerializationInfo) -> Dict[str, Any]:
+        datos = serializar(self)
+        if not (info.context or {}).get("guardado"):
+            return datos
+        definicion = None if self.id_catalogo is None else CATALOGO.definicion(self.id_catalogo)
+        if definicion is None or not isinstance(datos, dict):
+            return datos
+
+        return {campo: valor for campo, valor in datos.items()
+                if campo == "id_catalogo"
+                or getattr(self, campo, None) != getattr(definicion, campo, None)}
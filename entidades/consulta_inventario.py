@@ -0,0 +1,148 @@
+"""
+Índices secundarios ordenados para consultar inventarios grandes.
+Agrupa los objetos por categoría (items/armas/armaduras) y rareza, y dentro
+de cada grupo los mantiene ordenados por valor, peso y nivel requerido, así
+que los filtros por rango se resuelven con búsqueda binaria.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .tipos import RarezaItem
+
+CATEGORIAS = ("items", "armas", "armaduras")
+
+# Clave indexada -> valor por defecto para objetos que no tienen el campo
+# (los ítems no tienen nivel requerido; armas y armaduras pueden no tener valor)
+CLAVES_ORDEN: Dict[str, Any] = {"valor": 0, "peso": 0.0, "nivel_requerido": 1}
+
+Rango = Tuple[Optional[float], Optional[float]]
+
+
+def valor_clave(objeto, clave: str):
+    return getattr(objeto, clave, CLAVES_ORDEN[clave])
+
+
+class IndiceOrdenado:
+    """Objetos ordenados por una clave; inserción y borrado en O(log n) + memmove"""
+
+    def __init__(self, clave: str):
+        self.clave = clave
+        self._claves: List[Any] = []
+        self._objetos: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._objetos)
+
+    def agregar(self, objeto):
+        k = valor_clave(objeto, self.clave)
+        i = bisect_right(self._claves, k)
+        self._claves.insert(i, k)
+        self._objetos.insert(i, objeto)
+
+    def quitar(self, objeto) -> bool:
+        k = valor_clave(objeto, self.clave)
+        for i in range(bisect_left(self._claves, k), bisect_right(self._claves, k)):
+            if self._objetos[i] is objeto:
+                del self._claves[i]
+                del self._objetos[i]
+                return True
+        return False
+
+    def limites(self, rango: Rango) -> Tuple[int, int]:
+        """Posiciones [inicio, fin) de los objetos con la clave dentro del rango (inclusivo)"""
+        minimo, maximo = rango
+        inicio = 0 if minimo is None else bisect_left(self._claves, minimo)
+        fin = len(self._claves) if maximo is None else bisect_right(self._claves, maximo)
+        return inicio, max(inicio, fin)
+
+    def recorrer(self, rango: Rango, descendente: bool = False) -> Iterator[Tuple[Any, Any]]:
+        """(clave, objeto) dentro del rango, en orden"""
+        inicio, fin = self.limites(rango)
+        posiciones = range(fin - 1, inicio - 1, -1) if descendente else range(inicio, fin)
+        for i in posiciones:
+            yield self._claves[i], self._objetos[i]
+
+
+class IndiceConsultas:
+    """Índices por (categoría, rareza) y clave de orden"""
+
+    def __init__(self):
+        self._grupos: Dict[Tuple[str, RarezaItem], Dict[str, IndiceOrdenado]] = {}
+
+    @classmethod
+    def construir(cls, listas: Dict[str, Iterable]) -> "IndiceConsultas":
+        indice = cls()
+        for categoria, objetos in listas.items():
+            for objeto in objetos:
+                indice.agregar(categoria, objeto)
+        return indice
+
+    def agregar(self, categoria: str, objeto):
+        grupo = self._grupos.get((categoria, objeto.rareza))
+        if grupo is None:
+            grupo = {clave: IndiceOrdenado(clave) for clave in CLAVES_ORDEN}
+            self._grupos[(categoria, objeto.rareza)] = grupo
+        for indice in grupo.values():
+            indice.agregar(objeto)
+
+    def quitar(self, categoria: str, objeto):
+        grupo = self._grupos.get((categoria, objeto.rareza))
+        if grupo is not None:
+            for indice in grupo.values():
+                indice.quitar(objeto)
+
+    def consultar(self, categorias: Iterable[str], rarezas: Optional[Iterable[RarezaItem]],
+                  rangos: Dict[str, Rango], ordenar_por: str = "valor",
+                  descendente: bool = False, inicio: int = 0,
+                  cantidad: Optional[int] = None) -> List:
+        """
+        Objetos que cumplen todos los rangos, ordenados y paginados.
+
+        Recorre en orden el índice de `ordenar_por` (y corta al completar la
+        página), salvo que otro rango deje muchos menos candidatos: en ese
+        caso filtra por ese índice y ordena solo los candidatos.
+        """
+        if ordenar_por not in CLAVES_ORDEN:
+            raise ValueError(f"No se puede ordenar por '{ordenar_por}'. "
+                             f"Opciones: {', '.join(CLAVES_ORDEN)}")
+        rarezas = list(RarezaItem) if rarezas is None else list(rarezas)
+        grupos = [self._grupos[(c, r)] for c in categorias for r in rarezas
+                  if (c, r) in self._grupos]
+        sin_rango: Rango = (None, None)
+
+        def candidatos(clave: str) -> int:
+            total = 0
+            for g in grupos:
+                inicio_rango, fin_rango = g[clave].limites(rangos.get(clave, sin_rango))
+                total += fin_rango - inicio_rango
+            return total
+
+        en_orden = candidatos(ordenar_por)
+        selectiva = min((c for c in rangos if c != ordenar_por), key=candidatos, default=None)
+
+        if selectiva is not None and candidatos(selectiva) * 4 < en_orden:
+            resultado = [
+                o for g in grupos
+                for _, o in g[selectiva].recorrer(rangos[selectiva])
+                if _cumple(o, rangos)
+            ]
+            resultado.sort(key=lambda o: valor_clave(o, ordenar_por), reverse=descendente)
+            fin = None if cantidad is None else inicio + cantidad
+            return resultado[inicio:fin]
+
+        recorridos = [g[ordenar_por].recorrer(rangos.get(ordenar_por, sin_rango), descendente)
+                      for g in grupos]
+        fusion = heapq.merge(*recorridos, key=lambda par: par[0], reverse=descendente)
+        filtrados = (o for _, o in fusion if _cumple(o, rangos))
+        fin = None if cantidad is None else inicio + cantidad
+        return list(islice(filtrados, inicio, fin))
+
+
+def _cumple(objeto, rangos: Dict[str, Rango]) -> bool:
+    for clave, (minimo, maximo) in rangos.items():
+        k = valor_clave(objeto, clave)
+        if (minimo is not None and k < minimo) or (maximo is not None and k > maximo):
+            return False
+    return True
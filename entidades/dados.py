@@ -3,9 +3,15 @@ Sistema de tiradas de dados para Ether Blades.
 Implementa todas las mecánicas de dados del juego.
 """
 import random
-from typing import List, Tuple
+import hashlib
+from typing import List, Tuple, Optional, Iterator
 from dataclasses import dataclass
 
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para las tiradas en lote
+    np = None
+
 
 @dataclass
 class ResultadoTirada:
@@ -20,13 +26,15 @@ class ResultadoTirada:
         return f"{self.cantidad}d{self.caras}: [{dados_str}] = {self.total}"
 
 
-def tirar_dados(cantidad: int, caras: int) -> ResultadoTirada:
+def tirar_dados(cantidad: int, caras: int,
+                generador: Optional[random.Random] = None) -> ResultadoTirada:
     """
     Tira una cantidad de dados con caras especificadas.
     
     Args:
         cantidad: Número de dados a tirar
         caras: Número de caras de cada dado
+        generador: Stream aleatorio propio (None = estado global de random)
     
     Returns:
         ResultadoTirada con los valores individuales y el total
@@ -36,7 +44,8 @@ def tirar_dados(cantidad: int, caras: int) -> ResultadoTirada:
         >>> print(resultado.total)
         14
     """
-    dados = [random.randint(1, caras) for _ in range(cantidad)]
+    randint = (generador or random).randint
+    dados = [randint(1, caras) for _ in range(cantidad)]
     return ResultadoTirada(
         dados=dados,
         total=sum(dados),
@@ -45,50 +54,170 @@ def tirar_dados(cantidad: int, caras: int) -> ResultadoTirada:
     )
 
 
-def tirar_d6(cantidad: int = 1) -> ResultadoTirada:
+def tirar_d6(cantidad: int = 1, generador: Optional[random.Random] = None) -> ResultadoTirada:
     """Tirada de d6 (usado para esbirros)"""
-    return tirar_dados(cantidad, 6)
+    return tirar_dados(cantidad, 6, generador)
 
 
-def tirar_d10(cantidad: int = 1) -> ResultadoTirada:
+def tirar_d10(cantidad: int = 1, generador: Optional[random.Random] = None) -> ResultadoTirada:
     """Tirada de d10 (usado para iniciativa)"""
-    return tirar_dados(cantidad, 10)
+    return tirar_dados(cantidad, 10, generador)
 
 
-def tirar_d12(cantidad: int = 1) -> ResultadoTirada:
+def tirar_d12(cantidad: int = 1, generador: Optional[random.Random] = None) -> ResultadoTirada:
     """Tirada de d12 (usado para mentalidad)"""
-    return tirar_dados(cantidad, 12)
+    return tirar_dados(cantidad, 12, generador)
 
 
-def tirar_d20(cantidad: int = 1) -> ResultadoTirada:
+def tirar_d20(cantidad: int = 1, generador: Optional[random.Random] = None) -> ResultadoTirada:
     """Tirada de d20 (usado para sanación y otras mecánicas)"""
-    return tirar_dados(cantidad, 20)
+    return tirar_dados(cantidad, 20, generador)
 
 
-def tirar_d100(cantidad: int = 1) -> ResultadoTirada:
+def tirar_d100(cantidad: int = 1, generador: Optional[random.Random] = None) -> ResultadoTirada:
     """Tirada de d100 (usado para choque de poderes)"""
-    return tirar_dados(cantidad, 100)
+    return tirar_dados(cantidad, 100, generador)
 
 
-def tirar_ataque() -> ResultadoTirada:
+def tirar_ataque(generador: Optional[random.Random] = None) -> ResultadoTirada:
     """Tirada estándar de ataque: 3d6"""
-    return tirar_dados(3, 6)
+    return tirar_dados(3, 6, generador)
 
 
-def tirar_defensa() -> ResultadoTirada:
+def tirar_defensa(generador: Optional[random.Random] = None) -> ResultadoTirada:
     """Tirada estándar de defensa: 2d6"""
-    return tirar_dados(2, 6)
+    return tirar_dados(2, 6, generador)
 
 
 def establecer_semilla(semilla: int):
     """
     Establece la semilla del generador aleatorio.
     Útil para testing y reproducibilidad.
+    También reinicia el generador de NumPy usado por las tiradas en lote.
     
     Args:
         semilla: Valor entero para la semilla
     """
+    global _generador_lote
     random.seed(semilla)
+    if np is not None:
+        _generador_lote = np.random.default_rng(semilla)
+
+
+# ============================================================================
+# Streams aleatorios independientes
+# ============================================================================
+
+def crear_generador(semilla: Optional[int] = None) -> random.Random:
+    """
+    Crea un stream aleatorio independiente del estado global.
+    Cada combate puede tener el suyo y ser reproducible por separado,
+    incluso cuando se ejecutan muchos en paralelo.
+    
+    Args:
+        semilla: Semilla del stream (None = no reproducible)
+    """
+    return random.Random(semilla)
+
+
+def derivar_semillas(semilla_base: int, cantidad: int) -> List[int]:
+    """
+    Deriva semillas hijas independientes a partir de una semilla base.
+    Útil para repartir streams entre combates, threads o procesos.
+    
+    Args:
+        semilla_base: Semilla maestra
+        cantidad: Número de semillas a derivar
+    
+    Returns:
+        Lista de semillas de 64 bits, siempre las mismas para la misma base
+    """
+    semillas = []
+    for indice in range(cantidad):
+        digest = hashlib.sha256(f"{semilla_base}:{indice}".encode()).digest()
+        semillas.append(int.from_bytes(digest[:8], "little"))
+    return semillas
+
+
+# ============================================================================
+# Tiradas en lote (vectorizadas con NumPy)
+# ============================================================================
+
+_generador_lote = np.random.default_rng() if np is not None else None
+
+
+def _requerir_numpy():
+    """Verifica que NumPy esté disponible para las tiradas en lote"""
+    if np is None:
+        raise ImportError(
+            "Las tiradas en lote requieren NumPy. Instalar con: pip install numpy"
+        )
+
+
+@dataclass
+class TiradasLote:
+    """
+    Resultado de un lote de tiradas idénticas (NdM repetido n veces).
+    
+    Los valores se guardan en arrays de NumPy; los ResultadoTirada
+    individuales solo se construyen al acceder a ellos.
+    """
+    dados: "np.ndarray"    # Forma (n_tiradas, cantidad)
+    totales: "np.ndarray"  # Forma (n_tiradas,)
+    cantidad: int
+    caras: int
+    
+    def __len__(self) -> int:
+        return len(self.totales)
+    
+    def __getitem__(self, indice: int) -> ResultadoTirada:
+        """Construye la vista ResultadoTirada de una tirada del lote"""
+        return ResultadoTirada(
+            dados=self.dados[indice].tolist(),
+            total=int(self.totales[indice]),
+            cantidad=self.cantidad,
+            caras=self.caras
+        )
+    
+    def __iter__(self) -> Iterator[ResultadoTirada]:
+        for indice in range(len(self)):
+            yield self[indice]
+    
+    def __str__(self):
+        return f"{len(self)} × {self.cantidad}d{self.caras} (media {self.totales.mean():.2f})"
+
+
+def tirar_dados_lote(n_tiradas: int, cantidad: int, caras: int,
+                     generador: Optional["np.random.Generator"] = None) -> TiradasLote:
+    """
+    Tira n_tiradas veces cantidad dados de caras especificadas en una sola operación.
+    Pensado para simulaciones y balance, donde tirar_dados resulta lento.
+    
+    Args:
+        n_tiradas: Número de tiradas a realizar
+        cantidad: Número de dados por tirada
+        caras: Número de caras de cada dado
+        generador: Generator de NumPy a usar (None = generador del módulo)
+    
+    Returns:
+        TiradasLote con los dados individuales y los totales
+    
+    Ejemplos:
+        >>> lote = tirar_dados_lote(1_000_000, 3, 6)  # un millón de 3d6
+        >>> round(float(lote.totales.mean()), 1)
+        10.5
+    """
+    _requerir_numpy()
+    if n_tiradas < 0 or cantidad < 1 or caras < 1:
+        raise ValueError("n_tiradas debe ser >= 0 y cantidad/caras >= 1")
+    
+    generador = generador if generador is not None else _generador_lote
+    tipo_dado = np.int16 if caras <= np.iinfo(np.int16).max else np.int64
+    
+    dados = generador.integers(1, caras + 1, size=(n_tiradas, cantidad), dtype=tipo_dado)
+    totales = dados.sum(axis=1, dtype=np.int64)
+    
+    return TiradasLote(dados=dados, totales=totales, cantidad=cantidad, caras=caras)
 
 
 # Ejemplo de uso
@@ -0,0 +1,185 @@
+"""
+Distribuciones exactas de probabilidad para las tiradas de Ether Blades.
+Calcula PMF/CDF de pools NdM por convolución, sin tirar dados.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+from .tipos import Constantes
+
+
+@dataclass(frozen=True)
+class DistribucionDados:
+    """
+    Distribución discreta exacta sobre enteros consecutivos.
+
+    Guarda conteos enteros de combinaciones (no probabilidades en coma
+    flotante), así que las operaciones entre distribuciones son exactas.
+    """
+    minimo: int
+    conteos: Tuple[int, ...]  # conteos[i] = combinaciones con valor minimo + i
+    total_combinaciones: int
+
+    @property
+    def maximo(self) -> int:
+        return self.minimo + len(self.conteos) - 1
+
+    def pmf(self, valor: int) -> float:
+        """P(X = valor)"""
+        indice = valor - self.minimo
+        if 0 <= indice < len(self.conteos):
+            return self.conteos[indice] / self.total_combinaciones
+        return 0.0
+
+    def cdf(self, valor: int) -> float:
+        """P(X <= valor)"""
+        return self._acumulados()[self._indice_acotado(valor)] / self.total_combinaciones
+
+    def prob_mayor_que(self, valor: int) -> float:
+        """P(X > valor)"""
+        return 1.0 - self.cdf(valor)
+
+    def prob_entre(self, desde: int, hasta: int) -> float:
+        """P(desde <= X <= hasta)"""
+        if hasta < desde:
+            return 0.0
+        return self.cdf(hasta) - self.cdf(desde - 1)
+
+    def media(self) -> float:
+        return sum((self.minimo + i) * c for i, c in enumerate(self.conteos)) / self.total_combinaciones
+
+    def varianza(self) -> float:
+        media = self.media()
+        return sum(((self.minimo + i) - media) ** 2 * c
+                   for i, c in enumerate(self.conteos)) / self.total_combinaciones
+
+    def como_diccionario(self) -> Dict[int, float]:
+        """Retorna la PMF completa como {valor: probabilidad}"""
+        return {self.minimo + i: c / self.total_combinaciones
+                for i, c in enumerate(self.conteos) if c}
+
+    def desplazar(self, constante: int) -> "DistribucionDados":
+        """Distribución de X + constante"""
+        return DistribucionDados(self.minimo + constante, self.conteos, self.total_combinaciones)
+
+    def sumar(self, otra: "DistribucionDados") -> "DistribucionDados":
+        """Distribución de X + Y (X e Y independientes)"""
+        return DistribucionDados(
+            minimo=self.minimo + otra.minimo,
+            conteos=_convolucionar(self.conteos, otra.conteos),
+            total_combinaciones=self.total_combinaciones * otra.total_combinaciones
+        )
+
+    def restar(self, otra: "DistribucionDados") -> "DistribucionDados":
+        """Distribución de X - Y (X e Y independientes)"""
+        return DistribucionDados(
+            minimo=self.minimo - otra.maximo,
+            conteos=_convolucionar(self.conteos, otra.conteos[::-1]),
+            total_combinaciones=self.total_combinaciones * otra.total_combinaciones
+        )
+
+    def _indice_acotado(self, valor: int) -> int:
+        """Índice en la tabla acumulada; -1 apunta al 0 centinela"""
+        return max(-1, min(valor - self.minimo, len(self.conteos) - 1))
+
+    def _acumulados(self) -> Tuple[int, ...]:
+        return _acumular(self.conteos)
+
+
+def _convolucionar(a: Tuple[int, ...], b: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Convolución discreta de dos tablas de conteos"""
+    resultado = [0] * (len(a) + len(b) - 1)
+    for i, ca in enumerate(a):
+        if ca:
+            for j, cb in enumerate(b):
+                resultado[i + j] += ca * cb
+    return tuple(resultado)
+
+
+@lru_cache(maxsize=None)
+def _acumular(conteos: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Tabla acumulada con un 0 centinela al final (índice -1)"""
+    acumulados = []
+    total = 0
+    for c in conteos:
+        total += c
+        acumulados.append(total)
+    acumulados.append(0)
+    return tuple(acumulados)
+
+
+@lru_cache(maxsize=None)
+def distribucion_dados(cantidad: int, caras: int) -> DistribucionDados:
+    """
+    Distribución exacta de la suma de cantidad dados de caras especificadas.
+    Se calcula por convolución y se memoriza por (cantidad, caras).
+
+    Ejemplos:
+        >>> distribucion_dados(3, 6).pmf(10)
+        0.125
+    """
+    if cantidad < 1 or caras < 1:
+        raise ValueError("cantidad y caras deben ser >= 1")
+
+    if cantidad == 1:
+        return DistribucionDados(minimo=1, conteos=(1,) * caras, total_combinaciones=caras)
+
+    # Dividir a la mitad reaprovecha las tablas ya memorizadas
+    mitad = cantidad // 2
+    return distribucion_dados(mitad, caras).sumar(distribucion_dados(cantidad - mitad, caras))
+
+
+# Pools fijos del sistema
+def distribucion_ataque() -> DistribucionDados:
+    """Distribución de la tirada de ataque: 3d6"""
+    return distribucion_dados(Constantes.DADOS_ATAQUE, 6)
+
+
+def distribucion_defensa() -> DistribucionDados:
+    """Distribución de la tirada de defensa: 2d6"""
+    return distribucion_dados(Constantes.DADOS_DEFENSA, 6)
+
+
+def distribucion_iniciativa() -> DistribucionDados:
+    """Distribución de la tirada de iniciativa: 1d10"""
+    return distribucion_dados(Constantes.DADOS_INICIATIVA, 10)
+
+
+@lru_cache(maxsize=None)
+def distribucion_diferencia_ataque() -> DistribucionDados:
+    """Distribución de 3d6 - 2d6 (parte aleatoria de CA - CD)"""
+    return distribucion_ataque().restar(distribucion_defensa())
+
+
+def probabilidades_ataque(base_ataque: int, base_defensa: int) -> Dict[str, float]:
+    """
+    Probabilidades exactas de cada desenlace de una tirada de ataque.
+
+    Args:
+        base_ataque: Parte fija del CA (stat + bonus de arma + bonus de habilidad)
+        base_defensa: Parte fija del CD (reflejos + bonus de armadura)
+
+    Returns:
+        Dict con las claves "exito" (CA - CD > 0), "bloqueado"
+        (umbral < CA - CD <= 0) y "contraataque" (CA - CD <= umbral)
+    """
+    diferencia = distribucion_diferencia_ataque().desplazar(base_ataque - base_defensa)
+    umbral = Constantes.UMBRAL_CONTRAATAQUE
+
+    return {
+        "exito": diferencia.prob_mayor_que(0),
+        "bloqueado": diferencia.prob_entre(umbral + 1, 0),
+        "contraataque": diferencia.cdf(umbral)
+    }
+
+
+if __name__ == "__main__":
+    print("=== Distribuciones exactas de dados ===\n")
+
+    ataque = distribucion_ataque()
+    print(f"3d6: media {ataque.media():.2f}, varianza {ataque.varianza():.2f}")
+    print(f"  P(3d6 >= 15) = {ataque.prob_mayor_que(14):.4f}")
+
+    print("\nAtaque base 10 vs defensa base 6:")
+    for desenlace, prob in probabilidades_ataque(10, 6).items():
+        print(f"  {desenlace}: {prob:.4f}")
@@ -0,0 +1,192 @@
+"""
+Empaque automático de botín: mochila acotada con límite de peso y de slots.
+Cada grupo (una pila de ítems, un arma, una armadura) ocupa un slot si se
+lleva al menos una unidad. Se resuelve con ramificación y poda sobre los
+grupos ordenados por utilidad por unidad de peso.
+"""
+import math
+from bisect import bisect_right, insort
+from dataclasses import dataclass, field
+from typing import Any, List, Sequence
+
+_EPS = 1e-9
+
+
+@dataclass
+class GrupoEmpaque:
+    """Candidato a llevar: hasta `unidades` unidades, cada una con su peso y utilidad"""
+    objeto: Any
+    categoria: str  # "items", "armas" o "armaduras"
+    unidades: int
+    peso: float
+    utilidad: float
+
+    def densidad(self) -> float:
+        return math.inf if self.peso <= 0 else self.utilidad / self.peso
+
+
+@dataclass
+class ResultadoEmpaque:
+    """Resumen de un auto-empaque"""
+    utilidad_total: float
+    peso_total: float
+    slots_usados: int
+    descartados: List[Any] = field(default_factory=list)
+
+
+def _cota_fraccionaria(totales: Sequence[float], pesos: Sequence[float],
+                       peso_maximo: float, precio_slot: float, slots: int) -> float:
+    """
+    Cota lagrangiana: cada grupo "paga" precio_slot por su slot y el resto
+    se resuelve como mochila fraccionaria. Vale para cualquier precio >= 0.
+    """
+    netos = sorted(((t - precio_slot, p) for t, p in zip(totales, pesos) if t > precio_slot),
+                   key=lambda par: math.inf if par[1] <= 0 else par[0] / par[1], reverse=True)
+    cota, restante = precio_slot * slots, peso_maximo
+    for neto, peso in netos:
+        if peso <= restante:
+            cota += neto
+            restante -= peso
+        else:
+            cota += neto * restante / peso
+            break
+    return cota
+
+
+def _precio_slot(totales: Sequence[float], pesos: Sequence[float],
+                 peso_maximo: float, slots: int) -> float:
+    """Precio por slot que minimiza la cota (la función es convexa en el precio)"""
+    bajo, alto = 0.0, max(totales, default=0.0)
+    for _ in range(25):
+        m1, m2 = bajo + (alto - bajo) / 3, alto - (alto - bajo) / 3
+        if (_cota_fraccionaria(totales, pesos, peso_maximo, m1, slots)
+                <= _cota_fraccionaria(totales, pesos, peso_maximo, m2, slots)):
+            alto = m2
+        else:
+            bajo = m1
+    return bajo
+
+
+def resolver_empaque(grupos: Sequence[GrupoEmpaque], peso_maximo: float, slots: int,
+                     limite_nodos: int = 200_000) -> List[int]:
+    """
+    Unidades a llevar de cada grupo maximizando la utilidad total.
+
+    Los grupos se recorren ordenados por utilidad neta por peso, donde la
+    neta descuenta un precio por slot elegido para que la cota sea lo más
+    ajustada posible (relajación lagrangiana del límite de slots).
+
+    Es exacto salvo que la búsqueda supere `limite_nodos`; en ese caso
+    retorna la mejor solución encontrada (nunca peor que la voraz). Los
+    grupos con utilidad cero se agregan al final si queda lugar, en el
+    orden recibido; los de utilidad negativa nunca se llevan.
+    """
+    positivos = [i for i, g in enumerate(grupos) if g.utilidad > 0]
+    totales = [grupos[i].utilidad * grupos[i].unidades for i in positivos]
+    pesos = [grupos[i].peso * grupos[i].unidades for i in positivos]
+    precio = _precio_slot(totales, pesos, peso_maximo, slots)
+
+    def densidad_neta(i: int) -> float:
+        g = grupos[i]
+        neto = g.utilidad * g.unidades - precio
+        peso = g.peso * g.unidades
+        if peso <= 0:
+            return math.inf if neto > 0 else neto
+        return neto / peso
+
+    indices = sorted(positivos, key=densidad_neta, reverse=True)
+    gs = [grupos[i] for i in indices]
+    n = len(gs)
+
+    # Cota por slots: con s slots no se supera la suma de los s mejores grupos
+    # restantes. mejores_sufijo[i][s] es esa suma para los grupos i..n-1
+    mejores: List[float] = []
+    mejores_sufijo: List[List[float]] = [[0.0]] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        insort(mejores, -gs[i].utilidad * gs[i].unidades)
+        del mejores[slots:]
+        acumulado = [0.0]
+        for total in mejores:
+            acumulado.append(acumulado[-1] - total)
+        mejores_sufijo[i] = acumulado
+
+    # Sumas acumuladas de peso y utilidad neta llevando cada grupo completo
+    # (los grupos con neta negativa quedan al final y no suman a la cota)
+    pesos_acum, neta_acum = [0.0], [0.0]
+    for g in gs:
+        neto = max(g.utilidad * g.unidades - precio, 0.0)
+        pesos_acum.append(pesos_acum[-1] + (g.peso * g.unidades if neto > 0 else 0.0))
+        neta_acum.append(neta_acum[-1] + neto)
+
+    def cota(i: int, peso: float, slots_libres: int) -> float:
+        """Mínimo entre la cota lagrangiana y la cota por slots"""
+        if slots_libres <= 0:
+            return 0.0
+        # Último j tal que los grupos i..j-1 entran completos
+        j = bisect_right(pesos_acum, pesos_acum[i] + peso + _EPS, i) - 1
+        por_peso = neta_acum[j] - neta_acum[i]
+        if j < n:
+            peso_j = pesos_acum[j + 1] - pesos_acum[j]
+            por_peso += (neta_acum[j + 1] - neta_acum[j]) * (
+                peso - (pesos_acum[j] - pesos_acum[i])) / peso_j
+        por_slots = mejores_sufijo[i]
+        return min(precio * slots_libres + por_peso,
+                   por_slots[min(slots_libres, len(por_slots) - 1)])
+
+    def maximo_unidades(g: GrupoEmpaque, peso: float) -> int:
+        if g.peso <= 0 or peso == math.inf:
+            return g.unidades
+        return min(g.unidades, int((peso + _EPS) / g.peso))
+
+    # Solución inicial voraz en el mismo orden
+    actual = [0] * n
+    peso, slots_libres, valor = peso_maximo, slots, 0.0
+    for i, g in enumerate(gs):
+        k = maximo_unidades(g, peso) if slots_libres > 0 else 0
+        if k:
+            actual[i] = k
+            peso -= k * g.peso
+            slots_libres -= 1
+            valor += k * g.utilidad
+    mejor_valor, mejor = valor, list(actual)
+
+    actual = [0] * n
+    nodos = 0
+
+    def explorar(i: int, valor: float, peso: float, slots_libres: int):
+        nonlocal mejor_valor, mejor, nodos
+        if valor > mejor_valor + _EPS:
+            mejor_valor, mejor = valor, list(actual)
+        if i == n or slots_libres == 0 or nodos >= limite_nodos:
+            return
+        nodos += 1
+        g = gs[i]
+
+        # Con menos unidades la cota no mejora: al primer corte se pasa a k = 0
+        for k in range(maximo_unidades(g, peso), 0, -1):
+            valor_k, peso_k = valor + k * g.utilidad, peso - k * g.peso
+            if valor_k + cota(i + 1, peso_k, slots_libres - 1) <= mejor_valor + _EPS:
+                break
+            actual[i] = k
+            explorar(i + 1, valor_k, peso_k, slots_libres - 1)
+        actual[i] = 0
+        if valor + cota(i + 1, peso, slots_libres) > mejor_valor + _EPS:
+            explorar(i + 1, valor, peso, slots_libres)
+
+    explorar(0, 0.0, peso_maximo, slots)
+
+    unidades = [0] * len(grupos)
+    for i, k in zip(indices, mejor):
+        unidades[i] = k
+
+    # Completar con lo que todavía entre (grupos de utilidad cero, restos)
+    peso = peso_maximo - sum(k * g.peso for k, g in zip(unidades, grupos))
+    slots_libres = slots - sum(1 for k in unidades if k)
+    for i, g in enumerate(grupos):
+        if unidades[i] == 0 and slots_libres > 0 and g.utilidad >= 0:
+            k = maximo_unidades(g, peso)
+            if k:
+                unidades[i] = k
+                peso -= k * g.peso
+                slots_libres -= 1
+    return unidades
@@ -2,12 +2,13 @@
 Clase Ficha - Representa las estadísticas completas de un personaje.
 Incluye características, habilidades y cálculos derivados.
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import Field, PrivateAttr, field_validator
+from typing import Dict, Optional, Tuple
 from .tipos import Constantes, NombresHabilidades, HephixTipo
+from .modelo_base import ModeloVersionado
 
 
-class Caracteristicas(BaseModel):
+class Caracteristicas(ModeloVersionado):
     """
     Las 6 características principales del personaje.
     Total de puntos iniciales: 20
@@ -29,7 +30,7 @@ class Caracteristicas(BaseModel):
         return self.total_puntos() <= puntos_maximos
 
 
-class HabilidadesCombate(BaseModel):
+class HabilidadesCombate(ModeloVersionado):
     """
     Habilidades de combate.
     Total de puntos iniciales: 10
@@ -46,7 +47,7 @@ class HabilidadesCombate(BaseModel):
                 self.armas_magicas + self.armas_distancia + self.pugilismo)
 
 
-class HabilidadesEducacion(BaseModel):
+class HabilidadesEducacion(ModeloVersionado):
     """
     Habilidades de educación.
     Total de puntos iniciales: 10
@@ -61,7 +62,7 @@ class HabilidadesEducacion(BaseModel):
         return self.medicina + self.elocuencia + self.manual + self.arcanismo
 
 
-class HabilidadesTalento(BaseModel):
+class HabilidadesTalento(ModeloVersionado):
     """
     Habilidades de talento.
     Total de puntos iniciales: 10
@@ -76,7 +77,7 @@ class HabilidadesTalento(BaseModel):
         return self.sigilo + self.percepcion + self.mentalidad + self.astralidad
 
 
-class Ficha(BaseModel):
+class Ficha(ModeloVersionado):
     """
     Ficha completa de un personaje con todas sus estadísticas.
     Incluye características, habilidades y cálculos derivados.
@@ -93,6 +94,18 @@ class Ficha(BaseModel):
     # Tipo de Hephix (necesario para cálculos)
     hephix_tipo: Optional[HephixTipo] = None
     
+    # Stats derivados cacheados y las versiones con que se calcularon
+    _derivados: Tuple[int, int, int, int, int] = PrivateAttr(default=(0, 0, 0, 0, 0))
+    _clave_derivados: Optional[Tuple[int, int]] = PrivateAttr(default=None)
+    
+    def version_stats(self) -> Tuple[int, int, int, int, int]:
+        """
+        Versión de la ficha y de sus categorías.
+        Cambia con cualquier edición de características, habilidades o Hephix.
+        """
+        return (self._version, self.caracteristicas._version, self.combate._version,
+                self.educacion._version, self.talento._version)
+    
     # ========================================================================
     # Propiedades calculadas (Stats derivados)
     # ========================================================================
@@ -121,6 +134,38 @@ class Ficha(BaseModel):
     def stamina(self) -> int:
         return self.caracteristicas.stamina
     
+    def _stats_derivados(self) -> Tuple[int, int, int, int, int]:
+        """
+        (PV, PM, PCF, PCT, PS) máximos, cacheados hasta que cambie una
+        característica o el Hephix.
+        """
+        clave = (self._version, self.caracteristicas._version)
+        if self._clave_derivados != clave:
+            self._derivados = self._calcular_stats_derivados()
+            self._clave_derivados = clave
+        return self._derivados
+    
+    def _calcular_stats_derivados(self) -> Tuple[int, int, int, int, int]:
+        """
+        PV = Res × 10 (+ Vol × 5 con Hephix Sangriento)
+        PM = Vol × 5, PCF = Fue × 5, PCT = Pun × 5 (0 con Hephix Sangriento)
+        PS = Sta × 5
+        """
+        c = self.caracteristicas
+        pv = c.resistencia * Constantes.MULTIPLICADOR_PV
+        ps = c.stamina * Constantes.MULTIPLICADOR_STAMINA
+        
+        # El Hephix Sangriento cambia magia y conexiones por vida
+        if self.hephix_tipo == HephixTipo.SANGRIENTA:
+            pv += c.voluntad * Constantes.MULTIPLICADOR_PV_SANGRIENTO
+            return pv, 0, 0, 0, ps
+        
+        return (pv,
+                c.voluntad * Constantes.MULTIPLICADOR_PM,
+                c.fuerza * Constantes.MULTIPLICADOR_PCF,
+                c.punteria * Constantes.MULTIPLICADOR_PCT,
+                ps)
+    
     @property
     def pv_maximos(self) -> int:
         """
@@ -128,13 +173,7 @@ class Ficha(BaseModel):
         Fórmula: Res × 10
         Bonus: +Vol × 5 si tiene Hephix Sangriento
         """
-        pv_base = self.resistencia * Constantes.MULTIPLICADOR_PV
-        
-        # Bonus Hephix Sangriento
-        if self.hephix_tipo == HephixTipo.SANGRIENTA:
-            pv_base += self.voluntad * Constantes.MULTIPLICADOR_PV_SANGRIENTO
-        
-        return pv_base
+        return self._stats_derivados()[0]
     
     @property
     def pm_maximos(self) -> int:
@@ -143,9 +182,7 @@ class Ficha(BaseModel):
         Fórmula: Vol × 5
         Excepción: 0 si tiene Hephix Sangriento
         """
-        if self.hephix_tipo == HephixTipo.SANGRIENTA:
-            return 0
-        return self.voluntad * Constantes.MULTIPLICADOR_PM
+        return self._stats_derivados()[1]
     
     @property
     def pcf_maximos(self) -> int:
@@ -154,9 +191,7 @@ class Ficha(BaseModel):
         Fórmula: Fue × 5
         Excepción: 0 si tiene Hephix Sangriento
         """
-        if self.hephix_tipo == HephixTipo.SANGRIENTA:
-            return 0
-        return self.fuerza * Constantes.MULTIPLICADOR_PCF
+        return self._stats_derivados()[2]
     
     @property
     def pct_maximos(self) -> int:
@@ -165,9 +200,7 @@ class Ficha(BaseModel):
         Fórmula: Pun × 5
         Excepción: 0 si tiene Hephix Sangriento
         """
-        if self.hephix_tipo == HephixTipo.SANGRIENTA:
-            return 0
-        return self.punteria * Constantes.MULTIPLICADOR_PCT
+        return self._stats_derivados()[3]
     
     @property
     def ps_maximos(self) -> int:
@@ -175,7 +208,7 @@ class Ficha(BaseModel):
         Puntos de Stamina (para combate).
         Fórmula: Sta × 5
         """
-        return self.stamina * Constantes.MULTIPLICADOR_STAMINA
+        return self._stats_derivados()[4]
     
     # ========================================================================
     # Métodos de validación
@@ -215,16 +248,11 @@ class Ficha(BaseModel):
         Returns:
             Bonus de daño
         """
-        # Buscar la habilidad en las categorías
-        if hasattr(self.combate, habilidad):
-            nivel = getattr(self.combate, habilidad)
-        elif hasattr(self.educacion, habilidad):
-            nivel = getattr(self.educacion, habilidad)
-        elif hasattr(self.talento, habilidad):
-            nivel = getattr(self.talento, habilidad)
-        else:
+        categoria = CATEGORIA_HABILIDAD.get(habilidad)
+        if categoria is None:
             return 0
         
+        nivel = getattr(getattr(self, categoria), habilidad)
         return nivel // Constantes.BONUS_HABILIDAD_POR_NIVEL
     
     def calcular_habilidades_extra_mentalidad(self) -> int:
@@ -270,16 +298,23 @@ class Ficha(BaseModel):
             bonificaciones: Dict con habilidad: puntos_bonus
         """
         for habilidad, puntos in bonificaciones.items():
-            # Buscar en qué categoría está la habilidad
-            if hasattr(self.combate, habilidad):
-                valor_actual = getattr(self.combate, habilidad)
-                setattr(self.combate, habilidad, valor_actual + puntos)
-            elif hasattr(self.educacion, habilidad):
-                valor_actual = getattr(self.educacion, habilidad)
-                setattr(self.educacion, habilidad, valor_actual + puntos)
-            elif hasattr(self.talento, habilidad):
-                valor_actual = getattr(self.talento, habilidad)
-                setattr(self.talento, habilidad, valor_actual + puntos)
+            # Las habilidades desconocidas (p. ej. características) se ignoran
+            categoria = CATEGORIA_HABILIDAD.get(habilidad)
+            if categoria is None:
+                continue
+            
+            grupo = getattr(self, categoria)
+            setattr(grupo, habilidad, getattr(grupo, habilidad) + puntos)
+
+
+# Nombre de habilidad -> campo de Ficha que la contiene
+CATEGORIA_HABILIDAD: Dict[str, str] = {
+    habilidad: categoria
+    for categoria, modelo in (("combate", HabilidadesCombate),
+                              ("educacion", HabilidadesEducacion),
+                              ("talento", HabilidadesTalento))
+    for habilidad in modelo.model_fields
+}
 
 
 # Ejemplo de uso
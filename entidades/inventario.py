@@ -1,13 +1,18 @@
 """
 Sistema de inventario para gestionar ítems, armas y objetos.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import Field, PrivateAttr, field_validator
+import math
+from typing import Any, Callable, ClassVar, Dict, Iterable, Optional, List, Tuple, Union
 from .arma import Arma, Armadura
 from .tipos import RarezaItem
+from .modelo_base import ModeloConCache
+from .catalogo import CATALOGO, ObjetoCatalogado
+from .consulta_inventario import CATEGORIAS, IndiceConsultas
+from .empaque import GrupoEmpaque, ResultadoEmpaque, resolver_empaque
 
 
-class Item(BaseModel):
+class Item(ObjetoCatalogado):
     """
     Representa un ítem genérico del inventario.
     """
@@ -20,6 +25,14 @@ class Item(BaseModel):
     peso: float = Field(default=0.0, ge=0.0)
     rareza: RarezaItem = Field(default=RarezaItem.COMUN)
     
+    # Cambios de cantidad o peso en cualquier ítem (invalida pesos cacheados)
+    _cambios_peso: ClassVar[int] = 0
+    
+    def __setattr__(self, nombre: str, valor):
+        super().__setattr__(nombre, valor)
+        if nombre == "cantidad" or nombre == "peso":
+            Item._cambios_peso += 1
+    
     def __str__(self) -> str:
         cantidad_str = f" x{self.cantidad}" if self.cantidad > 1 else ""
         return f"{self.nombre}{cantidad_str}"
@@ -52,9 +65,22 @@ class ItemDroga(Item):
     es_apilable: bool = Field(default=True)
 
 
-class Inventario(BaseModel):
+class Inventario(ModeloConCache):
     """
     Sistema de inventario con gestión de ítems, armas y equipamiento.
+    
+    Mantiene índices por nombre (en minúsculas) y el peso total al día, así
+    que las búsquedas y el apilado no recorren las listas. Los índices no se
+    serializan: se reconstruyen solos cuando las listas cambian de identidad
+    (al cargar, copiar o reasignar). Las listas deben modificarse con los
+    métodos del inventario. El peso se recalcula si cambia la cantidad o el
+    peso de algún ítem fuera de esos métodos; cambiar el peso de un arma o
+    armadura ya guardada no lo actualiza.
+    
+    Para `consultar` se arman además índices por rareza ordenados por valor,
+    peso y nivel requerido; se construyen en la primera consulta y después
+    se mantienen al agregar y quitar. Cambiar el valor, peso, rareza o nivel
+    de un objeto ya guardado no actualiza esos índices.
     """
     
     # Capacidad
@@ -69,15 +95,38 @@ class Inventario(BaseModel):
     # Moneda
     monedas: int = Field(default=0, ge=0)
     
+    # Índices nombre.casefold() -> objetos con ese nombre (en orden de la lista)
+    _indice_items: Dict[str, List[Item]] = PrivateAttr(default_factory=dict)
+    _indice_armas: Dict[str, List[Arma]] = PrivateAttr(default_factory=dict)
+    _indice_armaduras: Dict[str, List[Armadura]] = PrivateAttr(default_factory=dict)
+    _peso: float = PrivateAttr(default=0.0)
+    _cambios_peso: int = PrivateAttr(default=-1)
+    _listas_indexadas: Optional[Tuple[list, list, list]] = PrivateAttr(default=None)
+    _consultas: Optional[IndiceConsultas] = PrivateAttr(default=None)
+    
+    @field_validator("items", mode="before")
+    @classmethod
+    def _restaurar_tipo_catalogo(cls, items):
+        """Los ítems del catálogo se cargan con su clase (p. ej. ItemConsumible)"""
+        if not isinstance(items, list):
+            return items
+        restaurados = []
+        for item in items:
+            if isinstance(item, dict) and item.get("id_catalogo") is not None:
+                definicion = CATALOGO.definicion(item["id_catalogo"])
+                if isinstance(definicion, Item):
+                    item = type(definicion).model_validate(item)
+            restaurados.append(item)
+        return restaurados
+    
     def cantidad_items_totales(self) -> int:
         """Calcula el total de slots ocupados (incluyendo armas y armaduras)"""
         return len(self.items) + len(self.armas) + len(self.armaduras)
     
     def peso_total(self) -> float:
         """Calcula el peso total del inventario"""
-        peso = sum(item.peso * item.cantidad for item in self.items)
-        # Las armas y armaduras podrían tener peso (no implementado aún)
-        return peso
+        self._verificar_indices()
+        return self._peso
     
     def tiene_espacio(self, slots_necesarios: int = 1) -> bool:
         """Verifica si hay espacio disponible"""
@@ -91,18 +140,25 @@ class Inventario(BaseModel):
         Returns:
             True si se agregó exitosamente, False si no hay espacio
         """
+        self._verificar_indices()
         if item.es_apilable:
             # Buscar si ya existe
-            for item_existente in self.items:
-                if item_existente.nombre == item.nombre:
-                    item_existente.cantidad += item.cantidad
-                    return True
+            item_existente = _buscar_exacto(self._indice_items, item.nombre)
+            if item_existente is not None:
+                item_existente.cantidad += item.cantidad
+                self._peso += item.peso * item.cantidad
+                self._cambios_peso = Item._cambios_peso
+                return True
         
         # Verificar espacio
         if not self.tiene_espacio():
             return False
         
         self.items.append(item)
+        self._indice_items.setdefault(item.nombre.casefold(), []).append(item)
+        self._peso += item.peso * item.cantidad
+        if self._consultas is not None:
+            self._consultas.agregar("items", item)
         return True
     
     def agregar_arma(self, arma: Arma) -> bool:
@@ -110,7 +166,12 @@ class Inventario(BaseModel):
         if not self.tiene_espacio():
             return False
         
+        self._verificar_indices()
         self.armas.append(arma)
+        self._indice_armas.setdefault(arma.nombre.casefold(), []).append(arma)
+        self._peso += arma.peso
+        if self._consultas is not None:
+            self._consultas.agregar("armas", arma)
         return True
     
     def agregar_armadura(self, armadura: Armadura) -> bool:
@@ -118,7 +179,12 @@ class Inventario(BaseModel):
         if not self.tiene_espacio():
             return False
         
+        self._verificar_indices()
         self.armaduras.append(armadura)
+        self._indice_armaduras.setdefault(armadura.nombre.casefold(), []).append(armadura)
+        self._peso += armadura.peso
+        if self._consultas is not None:
+            self._consultas.agregar("armaduras", armadura)
         return True
     
     def remover_item(self, nombre: str, cantidad: int = 1) -> bool:
@@ -128,16 +194,19 @@ class Inventario(BaseModel):
         Returns:
             True si se removió, False si no se encontró o no hay suficiente cantidad
         """
-        for i, item in enumerate(self.items):
-            if item.nombre == nombre:
-                if item.cantidad >= cantidad:
-                    item.cantidad -= cantidad
-                    if item.cantidad == 0:
-                        self.items.pop(i)
-                    return True
-                else:
-                    return False
-        return False
+        self._verificar_indices()
+        item = _buscar_exacto(self._indice_items, nombre)
+        if item is None or item.cantidad < cantidad:
+            return False
+        
+        item.cantidad -= cantidad
+        self._peso -= item.peso * cantidad
+        self._cambios_peso = Item._cambios_peso
+        if item.cantidad == 0:
+            _quitar(self.items, self._indice_items, item)
+            if self._consultas is not None:
+                self._consultas.quitar("items", item)
+        return True
     
     def remover_arma(self, nombre: str) -> Optional[Arma]:
         """
@@ -146,10 +215,14 @@ class Inventario(BaseModel):
         Returns:
             El arma removida o None si no se encontró
         """
-        for i, arma in enumerate(self.armas):
-            if arma.nombre == nombre:
-                return self.armas.pop(i)
-        return None
+        self._verificar_indices()
+        arma = _buscar_exacto(self._indice_armas, nombre)
+        if arma is not None:
+            _quitar(self.armas, self._indice_armas, arma)
+            self._peso -= arma.peso
+            if self._consultas is not None:
+                self._consultas.quitar("armas", arma)
+        return arma
     
     def remover_armadura(self, nombre: str) -> Optional[Armadura]:
         """
@@ -158,31 +231,194 @@ class Inventario(BaseModel):
         Returns:
             La armadura removida o None si no se encontró
         """
-        for i, armadura in enumerate(self.armaduras):
-            if armadura.nombre == nombre:
-                return self.armaduras.pop(i)
-        return None
+        self._verificar_indices()
+        armadura = _buscar_exacto(self._indice_armaduras, nombre)
+        if armadura is not None:
+            _quitar(self.armaduras, self._indice_armaduras, armadura)
+            self._peso -= armadura.peso
+            if self._consultas is not None:
+                self._consultas.quitar("armaduras", armadura)
+        return armadura
     
     def buscar_item(self, nombre: str) -> Optional[Item]:
         """Busca un ítem por nombre"""
-        for item in self.items:
-            if item.nombre.lower() == nombre.lower():
-                return item
-        return None
+        self._verificar_indices()
+        candidatos = self._indice_items.get(nombre.casefold())
+        return candidatos[0] if candidatos else None
     
     def buscar_arma(self, nombre: str) -> Optional[Arma]:
         """Busca un arma por nombre"""
-        for arma in self.armas:
-            if arma.nombre.lower() == nombre.lower():
-                return arma
-        return None
+        self._verificar_indices()
+        candidatos = self._indice_armas.get(nombre.casefold())
+        return candidatos[0] if candidatos else None
     
     def buscar_armadura(self, nombre: str) -> Optional[Armadura]:
         """Busca una armadura por nombre"""
-        for armadura in self.armaduras:
-            if armadura.nombre.lower() == nombre.lower():
-                return armadura
-        return None
+        self._verificar_indices()
+        candidatos = self._indice_armaduras.get(nombre.casefold())
+        return candidatos[0] if candidatos else None
+    
+    def __copy__(self) -> "Inventario":
+        """
+        Copia superficial con listas propias (los objetos se comparten).
+        Así agregar o quitar en la copia no desincroniza los índices ni el
+        peso del original.
+        """
+        copia = super().__copy__()
+        for campo in ("items", "armas", "armaduras"):
+            copia.__dict__[campo] = list(copia.__dict__[campo])
+        copia._listas_indexadas = None
+        copia._consultas = None
+        return copia
+    
+    def _verificar_indices(self):
+        """
+        Reconstruye los índices si las listas no son las que se indexaron,
+        y el peso si además cambió algún ítem por fuera del inventario.
+        """
+        indexadas = self._listas_indexadas
+        if (indexadas is not None and indexadas[0] is self.items
+                and indexadas[1] is self.armas and indexadas[2] is self.armaduras):
+            if self._cambios_peso != Item._cambios_peso:
+                self._recalcular_peso()
+            return
+        
+        self._indice_items = _indexar(self.items)
+        self._indice_armas = _indexar(self.armas)
+        self._indice_armaduras = _indexar(self.armaduras)
+        self._recalcular_peso()
+        self._consultas = None
+        self._listas_indexadas = (self.items, self.armas, self.armaduras)
+    
+    def _recalcular_peso(self):
+        self._peso = (sum(item.peso * item.cantidad for item in self.items)
+                      + sum(arma.peso for arma in self.armas)
+                      + sum(armadura.peso for armadura in self.armaduras))
+        self._cambios_peso = Item._cambios_peso
+    
+    def consultar(self, categoria: Optional[str] = None,
+                  rareza: Union[RarezaItem, Iterable[RarezaItem], None] = None,
+                  valor_min: Optional[int] = None, valor_max: Optional[int] = None,
+                  peso_min: Optional[float] = None, peso_max: Optional[float] = None,
+                  nivel_min: Optional[int] = None, nivel_max: Optional[int] = None,
+                  ordenar_por: str = "valor", descendente: bool = False,
+                  pagina: int = 0, por_pagina: Optional[int] = None) -> list:
+        """
+        Consulta ítems, armas y/o armaduras por rareza y rangos (inclusivos).
+        Ejemplo: armas épicas de hasta 5 kg, de la más cara a la más barata:
+        
+            inv.consultar("armas", RarezaItem.EPICO, peso_max=5,
+                          descendente=True)
+        
+        Args:
+            categoria: "items", "armas", "armaduras" o None (todas)
+            rareza: Una rareza, varias o None (todas)
+            ordenar_por: "valor", "peso" o "nivel_requerido"
+            pagina: Página a retornar (desde 0)
+            por_pagina: Resultados por página (None = todos)
+        
+        Los ítems se consideran de nivel requerido 1.
+        """
+        if categoria is not None and categoria not in CATEGORIAS:
+            raise ValueError(f"Categoría inválida: {categoria}. "
+                             f"Opciones: {', '.join(CATEGORIAS)}")
+        if isinstance(rareza, RarezaItem):
+            rareza = [rareza]
+        
+        self._verificar_indices()
+        if self._consultas is None:
+            self._consultas = IndiceConsultas.construir(
+                {"items": self.items, "armas": self.armas, "armaduras": self.armaduras}
+            )
+        
+        rangos = {}
+        for clave, minimo, maximo in (("valor", valor_min, valor_max),
+                                      ("peso", peso_min, peso_max),
+                                      ("nivel_requerido", nivel_min, nivel_max)):
+            if minimo is not None or maximo is not None:
+                rangos[clave] = (minimo, maximo)
+        
+        return self._consultas.consultar(
+            CATEGORIAS if categoria is None else (categoria,), rareza, rangos,
+            ordenar_por=ordenar_por, descendente=descendente,
+            inicio=pagina * por_pagina if por_pagina else 0, cantidad=por_pagina
+        )
+    
+    def auto_empacar(self, candidatos: Iterable[Union[Item, Arma, Armadura]] = (),
+                     utilidad: Optional[Callable[[Any], float]] = None) -> ResultadoEmpaque:
+        """
+        Elige qué llevar entre el inventario actual y el botín candidato,
+        maximizando la utilidad sin pasar peso_maximo ni capacidad_maxima.
+        
+        Es una transacción: se calcula todo y recién después se reemplazan
+        las listas del inventario. Las pilas se pueden llevar parcialmente
+        y los ítems apilables con el mismo nombre se juntan en una pila.
+        Los objetos recibidos no se modifican (se copian si cambia su cantidad).
+        
+        Args:
+            candidatos: Botín a considerar además de lo que ya se lleva
+            utilidad: objeto -> utilidad por unidad (por defecto su valor)
+        
+        Returns:
+            ResultadoEmpaque con lo que quedó afuera en `descartados`
+        """
+        utilidad = utilidad or (lambda objeto: objeto.valor)
+        grupos: List[GrupoEmpaque] = []
+        pilas: Dict[str, Tuple[GrupoEmpaque, List[Any]]] = {}
+        
+        for objeto in [*self.items, *self.armas, *self.armaduras, *candidatos]:
+            if isinstance(objeto, Item):
+                if objeto.es_apilable:
+                    pila = pilas.get(objeto.nombre)
+                    if pila is not None:
+                        pila[0].unidades += objeto.cantidad
+                        pila[1].append(objeto)
+                        continue
+                    grupo = GrupoEmpaque(objeto, "items", objeto.cantidad,
+                                         objeto.peso, utilidad(objeto))
+                    pilas[objeto.nombre] = (grupo, [objeto])
+                else:
+                    grupo = GrupoEmpaque(objeto, "items", 1, objeto.peso * objeto.cantidad,
+                                         utilidad(objeto) * objeto.cantidad)
+            else:
+                categoria = "armas" if isinstance(objeto, Arma) else "armaduras"
+                grupo = GrupoEmpaque(objeto, categoria, 1, objeto.peso, utilidad(objeto))
+            grupos.append(grupo)
+        
+        peso_maximo = math.inf if self.peso_maximo is None else self.peso_maximo
+        unidades = resolver_empaque(grupos, peso_maximo, self.capacidad_maxima)
+        
+        nuevas: Dict[str, list] = {categoria: [] for categoria in CATEGORIAS}
+        descartados = []
+        for grupo, llevar in zip(grupos, unidades):
+            objeto = grupo.objeto
+            apilado = grupo.categoria == "items" and objeto.es_apilable
+            if llevar:
+                if apilado and llevar != objeto.cantidad:
+                    objeto = objeto.model_copy(update={"cantidad": llevar})
+                nuevas[grupo.categoria].append(objeto)
+            
+            if not apilado:
+                if not llevar:
+                    descartados.append(objeto)
+            elif llevar < grupo.unidades:
+                partes = pilas[grupo.objeto.nombre][1]
+                if llevar == 0 and len(partes) == 1:
+                    descartados.append(grupo.objeto)
+                else:
+                    descartados.append(grupo.objeto.model_copy(
+                        update={"cantidad": grupo.unidades - llevar}))
+        
+        self.items = nuevas["items"]
+        self.armas = nuevas["armas"]
+        self.armaduras = nuevas["armaduras"]
+        
+        return ResultadoEmpaque(
+            utilidad_total=sum(k * g.utilidad for k, g in zip(unidades, grupos)),
+            peso_total=self.peso_total(),
+            slots_usados=self.cantidad_items_totales(),
+            descartados=descartados
+        )
     
     def listar_consumibles(self) -> List[ItemConsumible]:
         """Lista todos los ítems consumibles"""
@@ -237,50 +473,89 @@ class Inventario(BaseModel):
         return "\n".join(lineas)
 
 
-# Factory functions para crear ítems comunes
+def _indexar(objetos: list) -> Dict[str, list]:
+    indice: Dict[str, list] = {}
+    for objeto in objetos:
+        indice.setdefault(objeto.nombre.casefold(), []).append(objeto)
+    return indice
+
+
+def _buscar_exacto(indice: Dict[str, list], nombre: str):
+    """Primer objeto con exactamente ese nombre (respetando mayúsculas)"""
+    for objeto in indice.get(nombre.casefold(), ()):
+        if objeto.nombre == nombre:
+            return objeto
+    return None
+
+
+def _quitar(lista: list, indice: Dict[str, list], objeto):
+    """Quita el objeto (por identidad) de la lista y del índice"""
+    for i, otro in enumerate(lista):
+        if otro is objeto:
+            del lista[i]
+            break
+    
+    clave = objeto.nombre.casefold()
+    candidatos = indice[clave]
+    for i, otro in enumerate(candidatos):
+        if otro is objeto:
+            del candidatos[i]
+            break
+    if not candidatos:
+        del indice[clave]
+
+
+# Definiciones del catálogo y factory functions para crear ítems comunes
+CATALOGO.registrar("pocion_vida_menor", ItemConsumible(
+    nombre="Poción de Vida Menor",
+    descripcion="Restaura 20 PV",
+    cantidad=1,
+    valor=50,
+    peso=0.2,
+    efecto="restaurar_pv",
+    valor_efecto=20
+))
+
+CATALOGO.registrar("botiquin_primeros_auxilios", ItemConsumible(
+    nombre="Botiquín de Primeros Auxilios",
+    descripcion="Kit básico para curar heridas",
+    cantidad=1,
+    valor=30,
+    peso=0.5,
+    efecto="sanacion",
+    valor_efecto=10,
+    es_botiquin=True,
+    tipo_botiquin="primeros_auxilios",
+    turnos_uso=1
+))
+
+CATALOGO.registrar("kit_atencion_medica", ItemConsumible(
+    nombre="Kit de Atención Médica",
+    descripcion="Kit completo para tratamiento médico",
+    cantidad=1,
+    valor=100,
+    peso=1.5,
+    efecto="sanacion",
+    valor_efecto=30,
+    es_botiquin=True,
+    tipo_botiquin="atencion_medica",
+    turnos_uso=2
+))
+
+
 def crear_pocion_vida_menor() -> ItemConsumible:
     """Crea una poción de vida menor"""
-    return ItemConsumible(
-        nombre="Poción de Vida Menor",
-        descripcion="Restaura 20 PV",
-        cantidad=1,
-        valor=50,
-        peso=0.2,
-        efecto="restaurar_pv",
-        valor_efecto=20
-    )
+    return CATALOGO.crear("pocion_vida_menor")
 
 
 def crear_botiquin_primeros_auxilios() -> ItemConsumible:
     """Crea un botiquín de primeros auxilios"""
-    return ItemConsumible(
-        nombre="Botiquín de Primeros Auxilios",
-        descripcion="Kit básico para curar heridas",
-        cantidad=1,
-        valor=30,
-        peso=0.5,
-        efecto="sanacion",
-        valor_efecto=10,
-        es_botiquin=True,
-        tipo_botiquin="primeros_auxilios",
-        turnos_uso=1
-    )
+    return CATALOGO.crear("botiquin_primeros_auxilios")
 
 
 def crear_kit_atencion_medica() -> ItemConsumible:
     """Crea un kit de atención médica"""
-    return ItemConsumible(
-        nombre="Kit de Atención Médica",
-        descripcion="Kit completo para tratamiento médico",
-        cantidad=1,
-        valor=100,
-        peso=1.5,
-        efecto="sanacion",
-        valor_efecto=30,
-        es_botiquin=True,
-        tipo_botiquin="atencion_medica",
-        turnos_uso=2
-    )
+    return CATALOGO.crear("kit_atencion_medica")
 
 
 if __name__ == "__main__":
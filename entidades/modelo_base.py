@@ -0,0 +1,34 @@
+"""
+Modelos base para entidades con cachés internos.
+Los cachés viven en atributos privados y no forman parte de la identidad
+del modelo: dos entidades con los mismos campos son iguales aunque una
+tenga sus cachés calculados y la otra no.
+"""
+from pydantic import BaseModel, PrivateAttr
+
+
+class ModeloConCache(BaseModel):
+    """Modelo cuya igualdad ignora el estado privado (cachés, índices, versiones)"""
+    
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, BaseModel):
+            return NotImplemented
+        return (type(self) is type(otro)
+                and self.__dict__ == otro.__dict__
+                and self.__pydantic_extra__ == otro.__pydantic_extra__)
+    
+    __hash__ = None
+
+
+class ModeloVersionado(ModeloConCache):
+    """
+    Modelo que cuenta sus modificaciones.
+    Cada asignación a un campo incrementa _version, lo que permite a los
+    cachés derivados saber si siguen vigentes sin comparar valores.
+    """
+    _version: int = PrivateAttr(default=0)
+    
+    def __setattr__(self, nombre: str, valor):
+        super().__setattr__(nombre, valor)
+        if not nombre.startswith("_"):
+            self._version += 1
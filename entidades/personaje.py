@@ -2,16 +2,23 @@
 Clase Personaje - Entidad central del juego.
 Integra todas las entidades: Ficha, Hephix, Inventario, etc.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from pydantic import Field, PrivateAttr
+from typing import Any, Callable, Optional, Dict, Tuple, TypeVar
 from .ficha import Ficha
 from .hephix import Hephix
 from .tipos import ClaseTipo, HephixTipo, TipoArma
 from .inventario import Inventario
 from .arma import Arma, Armadura
+from .catalogo import CONTEXTO_GUARDADO
+from .modelo_base import ModeloConCache
 
+T = TypeVar("T")
 
-class Personaje(BaseModel):
+# Campos cuya asignación invalida el perfil de combate
+_CAMPOS_PERFIL_COMBATE = frozenset({"ficha", "arma_equipada", "armadura_equipada", "nivel", "hephix"})
+
+
+class Personaje(ModeloConCache):
     """
     Representa un personaje jugador completo con todas sus estadísticas,
     equipamiento, progreso e historia.
@@ -62,6 +69,15 @@ class Personaje(BaseModel):
     esta_vivo: bool = Field(default=True)
     esta_inconsciente: bool = Field(default=False)
     
+    # Perfil de combate precalculado y las versiones (ficha y equipo) con que se calculó
+    _perfil_combate: Any = PrivateAttr(default=None)
+    _version_perfil: Optional[Tuple[int, ...]] = PrivateAttr(default=None)
+    
+    def __setattr__(self, nombre: str, valor):
+        super().__setattr__(nombre, valor)
+        if nombre in _CAMPOS_PERFIL_COMBATE:
+            self._perfil_combate = None
+    
     def model_post_init(self, __context):
         """Inicializa valores después de crear el modelo"""
         # Sincronizar hephix_tipo en ficha
@@ -99,6 +115,25 @@ class Personaje(BaseModel):
     # Gestión de vida y recursos
     # ========================================================================
     
+    def obtener_perfil_combate(self, calcular: Callable[["Personaje"], T]) -> T:
+        """
+        Retorna el perfil de combate cacheado, calculándolo con `calcular`
+        si no existe o quedó desactualizado (equipamiento, nivel, edición
+        de la ficha o mejoras del arma o armadura equipadas).
+        """
+        version = self.ficha.version_stats() + (
+            self.arma_equipada._version if self.arma_equipada else -1,
+            self.armadura_equipada._version if self.armadura_equipada else -1,
+        )
+        if self._perfil_combate is None or self._version_perfil != version:
+            self._perfil_combate = calcular(self)
+            self._version_perfil = version
+        return self._perfil_combate
+    
+    def invalidar_perfil_combate(self):
+        """Descarta el perfil cacheado (p. ej. al cambiar el registro de estrategias)"""
+        self._perfil_combate = None
+    
     def restaurar_stats_completos(self):
         """Restaura todos los stats a sus valores máximos"""
         self.pv_actuales = self.pv_maximos
@@ -290,6 +325,7 @@ class Personaje(BaseModel):
         
         self.nivel += 1
         self.hephix.subir_nivel()
+        self.invalidar_perfil_combate()
         
         # Restaurar stats al subir de nivel
         self.restaurar_stats_completos()
@@ -350,8 +386,8 @@ class Personaje(BaseModel):
         return "\n".join(lineas)
     
     def to_dict_guardado(self) -> dict:
-        """Serializa el personaje para guardado (compatible con JSON)"""
-        return self.model_dump(mode='json')
+        """Serializa el personaje para guardado (compatible con JSON, objetos del catálogo como ID + deltas)"""
+        return self.model_dump(mode='json', context=CONTEXTO_GUARDADO)
     
     @classmethod
     def from_dict_guardado(cls, data: dict) -> "Personaje":
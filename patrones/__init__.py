@@ -5,7 +5,14 @@ Exporta las clases principales de cada patrón.
 
 from .singleton import SingletonMeta
 from .factory_method import Factory, FactoryConRegistro, FactoryDesdeJSON
-from .observer import EventBus, Evento, TipoEvento, EventCallback
+from .contenido_compilado import (
+    ContenidoCompilado,
+    PackCompilado,
+    compilar_contenido,
+    cargar_contenido,
+    cargar_json
+)
+from .observer import EventBus, Evento, TipoEvento, EventCallback, DatosEvento
 from .strategy import (
     EstrategiaAtaque,
     EstrategiaAtaqueMelee,
@@ -29,11 +36,19 @@ __all__ = [
     'FactoryConRegistro',
     'FactoryDesdeJSON',
     
+    # Contenido compilado
+    'ContenidoCompilado',
+    'PackCompilado',
+    'compilar_contenido',
+    'cargar_contenido',
+    'cargar_json',
+    
     # Observer
     'EventBus',
     'Evento',
     'TipoEvento',
     'EventCallback',
+    'DatosEvento',
     
     # Strategy - Ataque
     'EstrategiaAtaque',
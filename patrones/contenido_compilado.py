@@ -0,0 +1,259 @@
+"""
+Compilador de contenido: convierte packs JSON en un binario indexado.
+El archivo compilado se abre con mmap y cada definición se decodifica
+recién al accederla, así que el arranque no depende del tamaño del
+contenido. Si una fuente cambia (mtime o hash), se recompila sola; si
+solo cambió su mtime, se reescribe la firma sin recompilar.
+
+Las definiciones decodificadas se cachean y se comparten entre todos los
+que abren el mismo archivo en el proceso: son de solo lectura. Quien
+necesite modificarlas debe copiarlas (copy.deepcopy).
+
+Formato (versión 1):
+    cabecera   "<4sHHI": mágico, versión, reservado, largo del índice
+    índice     JSON: fuentes (ruta, mtime_ns, tamaño, sha256) y, por pack,
+               clave -> [offset, largo] relativos a la sección de datos
+    datos      JSON compacto de cada definición, uno detrás de otro
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+MAGICO = b"EBCC"
+VERSION_FORMATO = 1
+_CABECERA = struct.Struct("<4sHHI")
+DIRECTORIO_COMPILADOS = "__contenido__"
+
+Ruta = Union[str, Path]
+
+
+class PackCompilado(Mapping):
+    """
+    Vista de solo lectura de un pack; decodifica cada clave al primer acceso.
+    El valor retornado es compartido: no modificarlo.
+    """
+
+    def __init__(self, contenido: "ContenidoCompilado", entradas: Dict[str, List[int]]):
+        self._contenido = contenido
+        self._entradas = entradas
+        self._decodificados: Dict[str, Any] = {}
+
+    def __getitem__(self, clave: str) -> Any:
+        try:
+            return self._decodificados[clave]
+        except KeyError:
+            offset, largo = self._entradas[clave]
+            valor = self._contenido._decodificar(offset, largo)
+            self._decodificados[clave] = valor
+            return valor
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._entradas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entradas)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+class ContenidoCompilado:
+    """Archivo compilado abierto con mmap"""
+
+    def __init__(self, ruta: Ruta):
+        self.ruta = Path(ruta)
+        with open(self.ruta, "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magico, version, _, largo_indice = _CABECERA.unpack_from(self._mapa, 0)
+            if magico != MAGICO or version != VERSION_FORMATO:
+                raise ValueError(f"{self.ruta} no es contenido compilado v{VERSION_FORMATO}")
+            inicio_indice = _CABECERA.size
+            self.indice = json.loads(self._mapa[inicio_indice:inicio_indice + largo_indice])
+        except (struct.error, ValueError) as e:
+            self._mapa.close()
+            raise ValueError(f"{self.ruta} está dañado: {e}") from e
+        self._inicio_datos = _CABECERA.size + largo_indice
+        self._packs: Dict[str, PackCompilado] = {}
+
+    def packs(self) -> List[str]:
+        return list(self.indice["packs"])
+
+    def pack(self, nombre: str) -> PackCompilado:
+        vista = self._packs.get(nombre)
+        if vista is None:
+            if nombre not in self.indice["packs"]:
+                raise KeyError(f"El pack '{nombre}' no está en {self.ruta}")
+            vista = PackCompilado(self, self.indice["packs"][nombre])
+            self._packs[nombre] = vista
+        return vista
+
+    def cerrar(self):
+        self._mapa.close()
+
+    def _decodificar(self, offset: int, largo: int) -> Any:
+        inicio = self._inicio_datos + offset
+        return json.loads(self._mapa[inicio:inicio + largo])
+
+
+def _firma_fuente(ruta: Path, con_hash: bool = True) -> Dict[str, Any]:
+    estado = ruta.stat()
+    firma = {"ruta": str(ruta), "mtime_ns": estado.st_mtime_ns, "tamaño": estado.st_size}
+    if con_hash:
+        firma["sha256"] = hashlib.sha256(ruta.read_bytes()).hexdigest()
+    return firma
+
+
+def compilar_contenido(fuentes: Sequence[Ruta], destino: Ruta) -> Path:
+    """
+    Compila los JSON indicados (cada uno es un pack con el nombre del
+    archivo sin extensión) en `destino`. La escritura es atómica.
+    """
+    rutas = [Path(f).resolve() for f in fuentes]
+    nombres = [ruta.stem for ruta in rutas]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError(f"Hay packs con el mismo nombre: {nombres}")
+
+    datos = bytearray()
+    packs: Dict[str, Dict[str, List[int]]] = {}
+    firmas = []
+    for ruta, nombre in zip(rutas, nombres):
+        firmas.append(_firma_fuente(ruta))
+        with open(ruta, "r", encoding="utf-8") as f:
+            definiciones = json.load(f)
+        if not isinstance(definiciones, dict):
+            raise ValueError(f"{ruta} debe contener un objeto JSON en la raíz")
+
+        entradas = packs[nombre] = {}
+        for clave, valor in definiciones.items():
+            codificado = json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            entradas[clave] = [len(datos), len(codificado)]
+            datos += codificado
+
+    return _escribir_compilado(Path(destino), firmas, packs, datos)
+
+
+def _escribir_compilado(destino: Path, firmas: List[Dict[str, Any]],
+                        packs: Dict[str, Dict[str, List[int]]], datos: bytes) -> Path:
+    """Escribe cabecera, índice y datos de forma atómica"""
+    indice = json.dumps({"fuentes": firmas, "packs": packs},
+                        ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_name(f".{destino.name}.{os.getpid()}.tmp")
+    with open(temporal, "wb") as f:
+        f.write(_CABECERA.pack(MAGICO, VERSION_FORMATO, 0, len(indice)))
+        f.write(indice)
+        f.write(datos)
+    os.replace(temporal, destino)
+    return destino
+
+
+def _firmas_vigentes(contenido: ContenidoCompilado,
+                     fuentes: Sequence[Path]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Compara las fuentes con las registradas: primero mtime/tamaño y, si
+    difieren, el hash. Retorna None si alguna cambió; si no, las firmas
+    actuales (distintas de las registradas cuando solo cambió un mtime).
+    """
+    registradas = contenido.indice["fuentes"]
+    if [f["ruta"] for f in registradas] != [str(ruta) for ruta in fuentes]:
+        return None
+    vigentes = []
+    for firma, ruta in zip(registradas, fuentes):
+        try:
+            actual = _firma_fuente(ruta, con_hash=False)
+        except OSError:
+            return None
+        if actual["mtime_ns"] == firma["mtime_ns"] and actual["tamaño"] == firma["tamaño"]:
+            vigentes.append(firma)
+            continue
+        actual = _firma_fuente(ruta)
+        if actual["sha256"] != firma["sha256"]:
+            return None
+        vigentes.append(actual)
+    return vigentes
+
+
+def _reescribir_firmas(contenido: ContenidoCompilado,
+                       firmas: List[Dict[str, Any]]) -> ContenidoCompilado:
+    """
+    Guarda las firmas nuevas copiando los datos ya compilados, así las
+    próximas aperturas no vuelven a calcular el hash.
+    """
+    datos = contenido._mapa[contenido._inicio_datos:]
+    _escribir_compilado(contenido.ruta, firmas, contenido.indice["packs"], datos)
+    return ContenidoCompilado(contenido.ruta)
+
+
+_abiertos: Dict[Path, ContenidoCompilado] = {}
+
+
+def cargar_contenido(fuentes: Sequence[Ruta], destino: Ruta) -> ContenidoCompilado:
+    """
+    Abre el contenido compilado en `destino`, recompilándolo si falta, es
+    de otra versión o alguna fuente cambió. Los archivos abiertos (y sus
+    definiciones decodificadas, de solo lectura) se reutilizan dentro del
+    proceso.
+    """
+    rutas = [Path(f).resolve() for f in fuentes]
+    destino = Path(destino).resolve()
+
+    contenido = _abiertos.get(destino)
+    if contenido is None and destino.exists():
+        try:
+            contenido = ContenidoCompilado(destino)
+        except (OSError, ValueError):
+            contenido = None
+    firmas = None if contenido is None else _firmas_vigentes(contenido, rutas)
+    if firmas is not None:
+        if firmas != contenido.indice["fuentes"]:
+            # Mismo contenido con otro mtime (p. ej. tras un checkout)
+            contenido = _reescribir_firmas(contenido, firmas)
+        _abiertos[destino] = contenido
+        return contenido
+
+    # El mapeo anterior no se cierra: puede haber packs en uso que lo lean
+    _abiertos.pop(destino, None)
+    compilar_contenido(rutas, destino)
+    contenido = ContenidoCompilado(destino)
+    _abiertos[destino] = contenido
+    return contenido
+
+
+def cargar_json(ruta: Ruta) -> Mapping:
+    """
+    Carga un JSON (objeto en la raíz) a través de su versión compilada,
+    guardada en __contenido__/ junto al archivo. Si no se puede escribir
+    el compilado, se lee el JSON directamente. Las definiciones retornadas
+    son compartidas: copiarlas antes de modificarlas.
+    """
+    ruta = Path(ruta)
+    destino = ruta.parent / DIRECTORIO_COMPILADOS / f"{ruta.stem}.ebc"
+    try:
+        return cargar_contenido([ruta], destino).pack(ruta.stem)
+    except OSError:
+        if not ruta.exists():
+            raise
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compila packs de contenido JSON")
+    parser.add_argument("fuentes", nargs="+", help="Archivos JSON a compilar")
+    parser.add_argument("-o", "--destino", required=True, help="Archivo compilado de salida")
+    argumentos = parser.parse_args()
+
+    salida = compilar_contenido(argumentos.fuentes, argumentos.destino)
+    contenido = ContenidoCompilado(salida)
+    for nombre in contenido.packs():
+        print(f"  {nombre}: {len(contenido.pack(nombre))} definiciones")
+    print(f"✅ Compilado en {salida}")
+    contenido.cerrar()
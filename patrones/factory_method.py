@@ -3,9 +3,9 @@ Patrón Factory Method - Creación de objetos sin acoplar al código cliente.
 Permite crear diferentes tipos de entidades desde definiciones JSON.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Type, TypeVar, Generic
-import json
+from typing import Any, Dict, Mapping, Type, TypeVar, Generic
 from pathlib import Path
+from .contenido_compilado import cargar_json
 
 
 T = TypeVar('T')
@@ -90,18 +90,20 @@ class FactoryDesdeJSON(Factory[T]):
         """
         self.ruta_json = Path(ruta_json)
         self.factory_base = factory_base
-        self._definiciones: Dict[str, Dict[str, Any]] = {}
+        self._definiciones: Mapping[str, Dict[str, Any]] = {}
         self._cargar_definiciones()
     
     def _cargar_definiciones(self):
-        """Carga las definiciones desde el archivo JSON"""
+        """
+        Carga las definiciones desde el archivo JSON (a través de su versión
+        compilada: cada definición se decodifica al usarla)
+        """
         if not self.ruta_json.exists():
             raise FileNotFoundError(
                 f"No se encontró el archivo: {self.ruta_json}"
             )
         
-        with open(self.ruta_json, 'r', encoding='utf-8') as f:
-            self._definiciones = json.load(f)
+        self._definiciones = cargar_json(self.ruta_json)
     
     def crear(self, tipo: str, **kwargs_extra) -> T:
         """
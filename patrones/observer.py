@@ -2,7 +2,8 @@
 Patrón Observer - Sistema de eventos para desacoplar componentes.
 Permite que múltiples objetos reaccionen a eventos sin conocerse entre sí.
 """
-from typing import Callable, Dict, List, Any
+from collections import deque
+from typing import Callable, Dict, List, Any, Union
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -61,6 +62,9 @@ class Evento:
 # Tipo para callbacks
 EventCallback = Callable[[Evento], None]
 
+# Datos de un evento: dict ya armado o función que lo arma bajo demanda
+DatosEvento = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
 
 class EventBus:
     """
@@ -68,10 +72,16 @@ class EventBus:
     Implementa el patrón Observer/Pub-Sub.
     """
     
-    def __init__(self):
+    def __init__(self, guardar_historial: bool = True):
+        """
+        Args:
+            guardar_historial: Si se guardan los últimos eventos publicados.
+                Sin historial, los eventos sin subscriptores no cuestan nada.
+        """
         self._subscriptores: Dict[TipoEvento, List[EventCallback]] = {}
-        self._historial: List[Evento] = []
         self._max_historial = 100  # Mantener últimos 100 eventos
+        self._historial: deque = deque(maxlen=self._max_historial)
+        self._guardar_historial = guardar_historial
         self._activo = True
     
     def suscribir(self, tipo_evento: TipoEvento, callback: EventCallback) -> None:
@@ -109,14 +119,23 @@ class EventBus:
             except ValueError:
                 pass  # El callback no estaba suscrito
     
-    def publicar(self, tipo_evento: TipoEvento, datos: Dict[str, Any] = None, 
+    def tiene_interesados(self, tipo_evento: TipoEvento) -> bool:
+        """
+        Indica si publicar este tipo de evento tendría algún efecto
+        (subscriptores o historial activo).
+        """
+        return self._activo and (self._guardar_historial or bool(self._subscriptores.get(tipo_evento)))
+    
+    def publicar(self, tipo_evento: TipoEvento, datos: DatosEvento = None, 
                  prioridad: int = 0) -> None:
         """
         Publica un evento, notificando a todos los subscriptores.
         
         Args:
             tipo_evento: Tipo de evento a publicar
-            datos: Información asociada al evento
+            datos: Información asociada al evento, o una función sin
+                argumentos que la construye. La función solo se llama si
+                alguien va a recibir el evento.
             prioridad: Prioridad del evento (mayor = más importante)
         
         Ejemplo:
@@ -124,10 +143,21 @@ class EventBus:
                 TipoEvento.DAÑO_RECIBIDO,
                 {"personaje": "Aldric", "daño": 25, "pv_restantes": 45}
             )
+            
+            # Diferido: el dict no se arma si nadie escucha
+            bus.publicar(TipoEvento.DAÑO_RECIBIDO, lambda: {"daño": calcular()})
         """
         if not self._activo:
             return
         
+        # Camino rápido: nadie escucha y no hay historial
+        subscriptores = self._subscriptores.get(tipo_evento)
+        if not subscriptores and not self._guardar_historial:
+            return
+        
+        if callable(datos):
+            datos = datos()
+        
         # Crear evento
         evento = Evento(
             tipo=tipo_evento,
@@ -136,14 +166,13 @@ class EventBus:
             prioridad=prioridad
         )
         
-        # Agregar al historial
-        self._historial.append(evento)
-        if len(self._historial) > self._max_historial:
-            self._historial.pop(0)
+        # Agregar al historial (deque acotado descarta el más antiguo)
+        if self._guardar_historial:
+            self._historial.append(evento)
         
         # Notificar subscriptores
-        if tipo_evento in self._subscriptores:
-            for callback in self._subscriptores[tipo_evento]:
+        if subscriptores:
+            for callback in subscriptores:
                 try:
                     callback(evento)
                 except Exception as e:
@@ -162,7 +191,7 @@ class EventBus:
         Returns:
             Lista de eventos (más recientes primero)
         """
-        eventos = self._historial[::-1]  # Invertir (más recientes primero)
+        eventos = list(reversed(self._historial))  # Más recientes primero
         
         if tipo_evento:
             eventos = [e for e in eventos if e.tipo == tipo_evento]
@@ -176,6 +205,10 @@ class EventBus:
         """Limpia el historial de eventos"""
         self._historial.clear()
     
+    def activar_historial(self, activo: bool = True) -> None:
+        """Activa o desactiva el guardado de historial"""
+        self._guardar_historial = activo
+    
     def pausar(self) -> None:
         """Pausa la publicación de eventos (útil para debugging)"""
         self._activo = False
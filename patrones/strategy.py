@@ -113,6 +113,7 @@ class RegistroEstrategiasAtaque:
         TipoAtaque.DISTANCIA: EstrategiaAtaqueDistancia(),
         TipoAtaque.MAGICO: EstrategiaAtaqueMagico()
     }
+    _version: int = 0  # Cambia con cada registro (invalida perfiles cacheados)
     
     @classmethod
     def obtener(cls, tipo: TipoAtaque) -> EstrategiaAtaque:
@@ -123,6 +124,12 @@ class RegistroEstrategiasAtaque:
     def registrar(cls, tipo: TipoAtaque, estrategia: EstrategiaAtaque):
         """Permite registrar estrategias personalizadas"""
         cls._estrategias[tipo] = estrategia
+        cls._version += 1
+    
+    @classmethod
+    def version(cls) -> int:
+        """Versión del registro; cambia cada vez que se registra una estrategia"""
+        return cls._version
 
 
 # ============================================================================
@@ -9,9 +9,14 @@ from .combate_estructuras import (
     ResultadoAtaque,
     TipoResultadoAtaque,
     EstadoCombate,
-    EstadoCombatiente
+    EstadoCombatiente,
+    PerfilCombate,
+    ResultadoAtaqueCompacto,
+    CombatienteRapido
 )
 from .persistencia_service import PersistenciaService
+from .autoguardado_service import AutoguardadoService
+from .almacen_sqlite import AlmacenPartidasSQLite, PoolConexiones
 from .persistencia_estructuras import (
     ContextoNarrativo,
     EventoNarrativo,
@@ -19,6 +24,20 @@ from .persistencia_estructuras import (
     DatosPartida,
     InfoSlot
 )
+from .registro_combate import RegistroCombate, AtaqueRegistrado, ReproductorCombate
+from .planificador_turnos import PlanificadorTurnos, Turno
+from .batalla_estructuras import EstadoBatalla, VistaCombatiente, ResultadoRonda
+from .batalla_service import BatallaMasivaService
+from .simulacion_service import SimuladorDuelos, ResultadoSimulacion, PerfilDuelo
+from .torneo_service import TorneoRoundRobin, ResultadoTorneo, generar_builds
+from .escenarios_service import (
+    Escenario,
+    ResumenEscenario,
+    EjecutorEscenarios,
+    ejecutar_escenario
+)
+from .botin_estructuras import TablaBotin, EntradaBotin, TablaAlias, BotinLote
+from .botin_service import BotinService
 from .narrador_service import NarradorService
 from .cliente_ia import ClienteIA, ClienteIAMock
 
@@ -29,12 +48,42 @@ __all__ = [
     'TipoResultadoAtaque',
     'EstadoCombate',
     'EstadoCombatiente',
+    'PerfilCombate',
+    'ResultadoAtaqueCompacto',
+    'CombatienteRapido',
     'PersistenciaService',
+    'AutoguardadoService',
+    'AlmacenPartidasSQLite',
+    'PoolConexiones',
     'ContextoNarrativo',
     'EventoNarrativo',
     'TipoEventoNarrativo',
     'DatosPartida',
     'InfoSlot',
+    'RegistroCombate',
+    'AtaqueRegistrado',
+    'ReproductorCombate',
+    'PlanificadorTurnos',
+    'Turno',
+    'BatallaMasivaService',
+    'EstadoBatalla',
+    'VistaCombatiente',
+    'ResultadoRonda',
+    'SimuladorDuelos',
+    'ResultadoSimulacion',
+    'PerfilDuelo',
+    'TorneoRoundRobin',
+    'ResultadoTorneo',
+    'generar_builds',
+    'Escenario',
+    'ResumenEscenario',
+    'EjecutorEscenarios',
+    'ejecutar_escenario',
+    'TablaBotin',
+    'EntradaBotin',
+    'TablaAlias',
+    'BotinLote',
+    'BotinService',
     'NarradorService',
     'ClienteIA',
     'ClienteIAMock',
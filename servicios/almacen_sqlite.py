@@ -0,0 +1,346 @@
+"""
+Almacén de partidas en SQLite.
+Alternativa a los archivos de PersistenciaService para un servidor que
+aloja a muchos jugadores: cada jugador tiene su propio espacio de slots
+(sin límite), y los datos de resumen (personaje, nivel, ubicación, fecha)
+van en columnas indexadas para listar y buscar sin abrir las partidas.
+Las partidas se guardan con el mismo codec que los archivos (ver
+codec_guardado) y se pueden importar y exportar en ese formato JSON.
+"""
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+from entidades import Personaje
+from .carga_confiable import adaptador
+from .codec_guardado import CODECS, leer_guardado
+from .escritura_atomica import escribir_atomico
+from .persistencia_estructuras import (
+    DatosPartida, ContextoNarrativo, EstadoCombateGuardado, InfoSlot
+)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    jugador          TEXT    NOT NULL,
+    slot             INTEGER NOT NULL CHECK (slot >= 1),
+    nombre_partida   TEXT    NOT NULL,
+    nombre_personaje TEXT,
+    nivel            INTEGER,
+    ubicacion        TEXT,
+    timestamp        TEXT    NOT NULL,
+    tiempo_jugado    TEXT,
+    version          TEXT    NOT NULL,
+    datos            BLOB    NOT NULL,
+    PRIMARY KEY (jugador, slot)
+);
+CREATE INDEX IF NOT EXISTS idx_partidas_personaje ON partidas (nombre_personaje);
+CREATE INDEX IF NOT EXISTS idx_partidas_nivel ON partidas (nivel);
+CREATE INDEX IF NOT EXISTS idx_partidas_ubicacion ON partidas (ubicacion);
+CREATE INDEX IF NOT EXISTS idx_partidas_timestamp ON partidas (timestamp);
+"""
+
+_COLUMNAS_INFO = "slot, nombre_personaje, nivel, ubicacion, timestamp, tiempo_jugado"
+
+
+class PoolConexiones:
+    """
+    Conexiones SQLite reutilizables entre hilos.
+    Se abren a demanda hasta `tamaño`; con todas en uso, se espera a que
+    alguna se libere (a lo sumo `timeout` segundos).
+    """
+
+    def __init__(self, ruta: str, tamaño: int = 4, timeout: float = 5.0):
+        if tamaño < 1:
+            raise ValueError("El pool necesita al menos una conexión")
+        self.ruta = ruta
+        self.tamaño = tamaño
+        self.timeout = timeout
+        self._libres: queue.LifoQueue = queue.LifoQueue()
+        self._abiertas: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def conexion(self) -> Iterator[sqlite3.Connection]:
+        """Presta una conexión; la transacción se confirma con `with conexion:`"""
+        conexion = self._tomar()
+        try:
+            yield conexion
+        finally:
+            self._libres.put(conexion)
+
+    def cerrar(self):
+        """Cierra todas las conexiones (deben estar devueltas)"""
+        with self._lock:
+            for conexion in self._abiertas:
+                conexion.close()
+            self._abiertas.clear()
+            self._libres = queue.LifoQueue()
+
+    def _tomar(self) -> sqlite3.Connection:
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._abiertas) < self.tamaño:
+                conexion = self._abrir()
+                self._abiertas.append(conexion)
+                return conexion
+        try:
+            return self._libres.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No se liberó ninguna conexión en {self.timeout} s") from None
+
+    def _abrir(self) -> sqlite3.Connection:
+        conexion = sqlite3.connect(self.ruta, timeout=self.timeout, check_same_thread=False)
+        # WAL: los lectores no bloquean al escritor; NORMAL es seguro con WAL
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        return conexion
+
+
+class AlmacenPartidasSQLite:
+    """
+    Partidas de muchos jugadores en una base SQLite (modo WAL).
+    A diferencia de PersistenciaService no es un singleton: cada instancia
+    trabaja sobre su propia base y se puede usar desde varios hilos.
+    """
+
+    def __init__(self, ruta_db: str = "guardados/partidas.db",
+                 formato: Optional[str] = None, tamaño_pool: int = 4):
+        """
+        Args:
+            ruta_db: Archivo de la base (se crea si no existe)
+            formato: Codec de las partidas ("json", "compacto", "zlib");
+                     None = Settings.formato_guardado
+            tamaño_pool: Conexiones simultáneas como máximo
+        """
+        Path(ruta_db).parent.mkdir(parents=True, exist_ok=True)
+        if formato is None:
+            from config import settings
+            formato = settings.formato_guardado
+        self.codec = CODECS.crear(formato)
+        self.pool = PoolConexiones(ruta_db, tamaño_pool)
+
+        with self.pool.conexion() as conexion:
+            conexion.executescript(_ESQUEMA)
+
+    def cerrar(self):
+        self.pool.cerrar()
+
+    # ========================================================================
+    # Guardado y carga
+    # ========================================================================
+
+    def guardar_partida(
+        self,
+        jugador: str,
+        personaje: Personaje,
+        contexto: ContextoNarrativo,
+        slot: int = 1,
+        nombre_partida: Optional[str] = None,
+        combate: Optional[EstadoCombateGuardado] = None,
+        tiempo_jugado: str = "0h 0m"
+    ):
+        """
+        Guarda (o reemplaza) la partida de un jugador en un slot.
+
+        Raises:
+            ValueError: Si el slot es menor que 1
+        """
+        self.guardar_datos(jugador, DatosPartida(
+            slot=slot,
+            nombre_partida=nombre_partida or f"Partida de {personaje.nombre}",
+            tiempo_jugado=tiempo_jugado,
+            personaje=personaje.to_dict_guardado(),
+            contexto=contexto,
+            combate=combate or EstadoCombateGuardado()
+        ))
+
+    def guardar_datos(self, jugador: str, *partidas: DatosPartida):
+        """Guarda partidas ya armadas en una sola transacción"""
+        filas = [self._fila(jugador, datos) for datos in partidas]
+        with self.pool.conexion() as conexion, conexion:
+            conexion.executemany(
+                "INSERT OR REPLACE INTO partidas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", filas
+            )
+
+    def cargar_partida(self, jugador: str, slot: int, confiable: bool = False) -> DatosPartida:
+        """
+        Carga la partida de un jugador.
+
+        Args:
+            confiable: Validar en una sola pasada si el hash de integridad coincide
+
+        Raises:
+            KeyError: Si el jugador no tiene partida en ese slot
+        """
+        with self.pool.conexion() as conexion:
+            fila = conexion.execute(
+                "SELECT datos FROM partidas WHERE jugador = ? AND slot = ?", (jugador, slot)
+            ).fetchone()
+        if fila is None:
+            raise KeyError(f"El jugador '{jugador}' no tiene partida en el slot {slot}")
+
+        leido = leer_guardado(fila[0])
+        if confiable and leido.verificado:
+            return adaptador(DatosPartida).validate_json(leido.cuerpo)
+        return DatosPartida.model_validate_json(leido.cuerpo)
+
+    def cargar_personaje(self, jugador: str, slot: int, confiable: bool = False) -> Personaje:
+        """Carga solo el personaje de una partida"""
+        datos = self.cargar_partida(jugador, slot, confiable)
+        return Personaje.from_dict_guardado(datos.personaje)
+
+    def eliminar_partida(self, jugador: str, slot: int) -> bool:
+        """Elimina una partida; retorna False si no existía"""
+        with self.pool.conexion() as conexion, conexion:
+            cursor = conexion.execute(
+                "DELETE FROM partidas WHERE jugador = ? AND slot = ?", (jugador, slot)
+            )
+        return cursor.rowcount > 0
+
+    def eliminar_jugador(self, jugador: str) -> int:
+        """Elimina todas las partidas de un jugador; retorna cuántas había"""
+        with self.pool.conexion() as conexion, conexion:
+            cursor = conexion.execute("DELETE FROM partidas WHERE jugador = ?", (jugador,))
+        return cursor.rowcount
+
+    # ========================================================================
+    # Listado y búsqueda (solo columnas indexadas, sin abrir las partidas)
+    # ========================================================================
+
+    def listar_partidas(self, jugador: str) -> List[InfoSlot]:
+        """Partidas de un jugador ordenadas por slot"""
+        with self.pool.conexion() as conexion:
+            filas = conexion.execute(
+                f"SELECT {_COLUMNAS_INFO} FROM partidas WHERE jugador = ? ORDER BY slot",
+                (jugador,)
+            ).fetchall()
+        return [_info(fila) for fila in filas]
+
+    def buscar_partidas(
+        self,
+        nombre_personaje: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        ubicacion: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        limite: int = 100
+    ) -> List[Tuple[str, InfoSlot]]:
+        """
+        Busca partidas de todos los jugadores, las más recientes primero.
+
+        Returns:
+            Pares (jugador, info del slot)
+        """
+        condiciones, parametros = [], []
+        for condicion, valor in (
+            ("nombre_personaje = ?", nombre_personaje),
+            ("nivel >= ?", nivel_min),
+            ("nivel <= ?", nivel_max),
+            ("ubicacion = ?", ubicacion),
+            ("timestamp >= ?", desde.isoformat() if desde else None),
+        ):
+            if valor is not None:
+                condiciones.append(condicion)
+                parametros.append(valor)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        with self.pool.conexion() as conexion:
+            filas = conexion.execute(
+                f"SELECT jugador, {_COLUMNAS_INFO} FROM partidas {donde} "
+                f"ORDER BY timestamp DESC LIMIT ?", (*parametros, limite)
+            ).fetchall()
+        return [(fila[0], _info(fila[1:])) for fila in filas]
+
+    def contar_jugadores(self) -> int:
+        with self.pool.conexion() as conexion:
+            return conexion.execute("SELECT COUNT(DISTINCT jugador) FROM partidas").fetchone()[0]
+
+    # ========================================================================
+    # Importación y exportación (formato de archivos de PersistenciaService)
+    # ========================================================================
+
+    def importar(self, jugador: str, archivos: Iterable[Path]) -> int:
+        """
+        Importa archivos de guardado (cualquier codec) a un jugador, en una
+        sola transacción. Cada archivo se valida por completo.
+
+        Args:
+            archivos: Archivos de slot de cualquier formato (por ejemplo,
+                directorio.glob("slot_*"))
+
+        Returns:
+            Cantidad de partidas importadas
+        """
+        partidas = [
+            DatosPartida.model_validate_json(leer_guardado(Path(archivo).read_bytes()).cuerpo)
+            for archivo in archivos
+        ]
+        self.guardar_datos(jugador, *partidas)
+        return len(partidas)
+
+    def exportar(self, jugador: str, directorio: str) -> List[Path]:
+        """
+        Exporta las partidas de un jugador como archivos JSON firmados
+        (slot_XX.json), legibles por PersistenciaService. Los slots por
+        encima de 10 no existen en archivos y no se exportan. Cada archivo
+        se escribe de forma atómica.
+
+        Returns:
+            Archivos escritos (para saber qué slots quedaron afuera,
+            comparar con listar_partidas)
+        """
+        destino = Path(directorio)
+        destino.mkdir(parents=True, exist_ok=True)
+        codec_json = CODECS.crear("json")
+
+        with self.pool.conexion() as conexion:
+            filas = conexion.execute(
+                "SELECT slot, version, datos FROM partidas "
+                "WHERE jugador = ? AND slot <= 10 ORDER BY slot",
+                (jugador,)
+            ).fetchall()
+
+        archivos = []
+        for slot, version, blob in filas:
+            datos = json.loads(leer_guardado(blob).cuerpo)
+            fragmentos = {clave: codec_json.fragmento(valor) for clave, valor in datos.items()}
+            archivo = destino / f"slot_{slot:02d}.json"
+            escribir_atomico(archivo, codec_json.armar(fragmentos, version))
+            archivos.append(archivo)
+        return archivos
+
+    # ========================================================================
+    # Utilidades privadas
+    # ========================================================================
+
+    def _fila(self, jugador: str, datos: DatosPartida) -> tuple:
+        contenido = datos.to_dict_guardado()
+        fragmentos = {clave: self.codec.fragmento(valor) for clave, valor in contenido.items()}
+        return (
+            jugador, datos.slot, datos.nombre_partida,
+            datos.personaje.get('nombre'), datos.personaje.get('nivel'),
+            datos.contexto.ubicacion_actual, contenido['timestamp'],
+            datos.tiempo_jugado, datos.version,
+            self.codec.armar(fragmentos, datos.version)
+        )
+
+
+def _info(fila: tuple) -> InfoSlot:
+    slot, nombre, nivel, ubicacion, timestamp, tiempo_jugado = fila
+    return InfoSlot(
+        slot=slot,
+        existe=True,
+        nombre_personaje=nombre,
+        nivel=nivel,
+        ubicacion=ubicacion,
+        timestamp=timestamp,
+        tiempo_jugado=tiempo_jugado
+    )
@@ -0,0 +1,185 @@
+"""
+Servicio de Autoguardado - Guardados automáticos en segundo plano.
+El hilo del juego solo captura el estado (PersistenciaService.capturar);
+un hilo aparte serializa y escribe. Las solicitudes seguidas sobre un
+mismo slot se agrupan en una sola escritura.
+"""
+import atexit
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from entidades import Personaje
+from patrones import EventBus, TipoEvento
+from .persistencia_service import PersistenciaService
+from .persistencia_estructuras import ContextoNarrativo, EstadoCombateGuardado, InstantaneaPartida
+
+
+class _Pendiente:
+    """Última captura de un slot a la espera de escribirse"""
+    __slots__ = ("instantanea", "primera", "ultima", "solicitudes")
+
+    def __init__(self, instantanea: InstantaneaPartida, ahora: float):
+        self.instantanea = instantanea
+        self.primera = ahora
+        self.ultima = ahora
+        self.solicitudes = 1
+
+
+class AutoguardadoService:
+    """
+    Autoguardado con un hilo de escritura.
+
+    Cada slot se escribe cuando pasan `espera` segundos sin nuevas
+    solicitudes (debounce), o a lo sumo `espera_maxima` segundos después de
+    la primera solicitud pendiente, para que los checkpoints continuos no
+    posterguen el guardado indefinidamente.
+
+    El resultado se informa por el EventBus: PARTIDA_GUARDADA con
+    {"slot", "archivo", "solicitudes"} o ERROR_SISTEMA con
+    {"origen": "autoguardado", "slot", "error"}. Los callbacks corren en el
+    hilo de escritura.
+    """
+
+    def __init__(self, persistencia: PersistenciaService,
+                 event_bus: Optional[EventBus] = None,
+                 espera: float = 0.5, espera_maxima: float = 5.0):
+        """
+        Args:
+            persistencia: Servicio que captura y escribe las partidas
+            event_bus: Bus donde informar guardados y errores (opcional)
+            espera: Segundos sin solicitudes antes de escribir un slot
+            espera_maxima: Demora máxima desde la primera solicitud pendiente
+        """
+        self.persistencia = persistencia
+        self.event_bus = event_bus or EventBus()
+        self.espera = espera
+        self.espera_maxima = espera_maxima
+
+        self._pendientes: Dict[int, _Pendiente] = {}
+        self._escribiendo = 0
+        self._vaciar = False
+        self._cerrado = False
+        self._condicion = threading.Condition()
+        self._hilo = threading.Thread(target=self._bucle, name="autoguardado", daemon=True)
+        self._hilo.start()
+        atexit.register(self.cerrar)
+
+    # ========================================================================
+    # API del hilo del juego
+    # ========================================================================
+
+    def solicitar(self, personaje: Personaje, contexto: ContextoNarrativo,
+                  slot: int = 1, combate: Optional[EstadoCombateGuardado] = None):
+        """
+        Pide un autoguardado. Captura el estado completo (una copia que el
+        juego puede seguir modificando) y retorna sin esperar la escritura.
+
+        Raises:
+            RuntimeError: Si el servicio ya fue cerrado
+        """
+        instantanea = self.persistencia.capturar(personaje, contexto, slot, combate=combate)
+        with self._condicion:
+            if self._cerrado:
+                raise RuntimeError("El autoguardado está cerrado")
+            ahora = time.monotonic()
+            pendiente = self._pendientes.get(slot)
+            if pendiente is None:
+                self._pendientes[slot] = _Pendiente(instantanea, ahora)
+            else:
+                pendiente.instantanea = instantanea
+                pendiente.ultima = ahora
+                pendiente.solicitudes += 1
+            self._condicion.notify()
+
+    def pendientes(self) -> List[int]:
+        """Slots con solicitudes aún no escritas"""
+        with self._condicion:
+            return sorted(self._pendientes)
+
+    def vaciar(self, timeout: Optional[float] = None) -> bool:
+        """
+        Escribe ya todo lo pendiente y espera a que termine.
+
+        Returns:
+            True si no quedó nada pendiente dentro del timeout
+        """
+        with self._condicion:
+            self._vaciar = True
+            self._condicion.notify_all()
+            listo = self._condicion.wait_for(
+                lambda: not self._pendientes and not self._escribiendo, timeout
+            )
+            self._vaciar = False
+            return listo
+
+    def cerrar(self, timeout: Optional[float] = None):
+        """Escribe lo pendiente y detiene el hilo (se llama también al salir)"""
+        with self._condicion:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            self._condicion.notify_all()
+        self._hilo.join(timeout)
+        atexit.unregister(self.cerrar)
+
+    def __enter__(self) -> "AutoguardadoService":
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # ========================================================================
+    # Hilo de escritura
+    # ========================================================================
+
+    def _bucle(self):
+        while True:
+            with self._condicion:
+                trabajos = self._esperar_trabajos()
+                if trabajos is None:
+                    return
+                self._escribiendo = len(trabajos)
+
+            for slot, pendiente in trabajos:
+                self._escribir(slot, pendiente)
+
+            with self._condicion:
+                self._escribiendo = 0
+                self._condicion.notify_all()
+
+    def _esperar_trabajos(self) -> Optional[List[Tuple[int, _Pendiente]]]:
+        """Espera (con el lock tomado) hasta que haya slots listos; None = terminar"""
+        while True:
+            if not self._pendientes:
+                if self._cerrado:
+                    return None
+                self._condicion.wait()
+                continue
+
+            ahora = time.monotonic()
+            urgente = self._cerrado or self._vaciar
+            plazos = {
+                slot: min(p.ultima + self.espera, p.primera + self.espera_maxima)
+                for slot, p in self._pendientes.items()
+            }
+            listos = [slot for slot, plazo in plazos.items() if urgente or plazo <= ahora]
+            if listos:
+                return [(slot, self._pendientes.pop(slot)) for slot in listos]
+            self._condicion.wait(min(plazos.values()) - ahora)
+
+    def _escribir(self, slot: int, pendiente: _Pendiente):
+        try:
+            archivo = self.persistencia.escribir(pendiente.instantanea)
+        except Exception as e:
+            self.event_bus.publicar(TipoEvento.ERROR_SISTEMA, {
+                "origen": "autoguardado",
+                "slot": slot,
+                "error": str(e)
+            }, prioridad=1)
+            return
+
+        self.event_bus.publicar(TipoEvento.PARTIDA_GUARDADA, {
+            "slot": slot,
+            "archivo": str(archivo),
+            "solicitudes": pendiente.solicitudes
+        })
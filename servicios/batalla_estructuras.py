@@ -0,0 +1,188 @@
+"""
+Estructuras de datos para batallas masivas.
+El estado vive en arrays de NumPy (una fila por combatiente) y los modelos
+Pydantic son vistas que leen esas filas en vivo, sin copiar PV/PS.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+from pydantic import BaseModel, PrivateAttr
+from entidades import Personaje
+from .combate_estructuras import PerfilCombate
+
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para las batallas masivas
+    np = None
+
+
+class VistaCombatiente(BaseModel):
+    """
+    Vista en vivo de una fila de EstadoBatalla.
+    Expone la misma interfaz de lectura que EstadoCombatiente.
+    """
+    nombre: str
+    bando: Optional[str] = None
+    iniciativa: int = 0
+
+    _batalla: "EstadoBatalla" = PrivateAttr()
+    _fila: int = PrivateAttr()
+
+    @classmethod
+    def de_fila(cls, batalla: "EstadoBatalla", fila: int) -> "VistaCombatiente":
+        vista = cls(nombre=batalla.nombres[fila], bando=batalla.bandos[fila],
+                    iniciativa=int(batalla.iniciativa[fila]))
+        vista._batalla = batalla
+        vista._fila = fila
+        return vista
+
+    @property
+    def pv_actuales(self) -> int:
+        return int(self._batalla.pv[self._fila])
+
+    @property
+    def pv_maximos(self) -> int:
+        return int(self._batalla.pv_maximos[self._fila])
+
+    @property
+    def ps_actuales(self) -> int:
+        return int(self._batalla.ps[self._fila])
+
+    @property
+    def ps_maximos(self) -> int:
+        return int(self._batalla.ps_maximos[self._fila])
+
+    @property
+    def esta_vivo(self) -> bool:
+        return bool(self._batalla.vivos[self._fila])
+
+    @property
+    def esta_inconsciente(self) -> bool:
+        return not self.esta_vivo
+
+    def porcentaje_vida(self) -> float:
+        """Retorna el porcentaje de vida actual"""
+        if self.pv_maximos == 0:
+            return 0.0
+        return (self.pv_actuales / self.pv_maximos) * 100
+
+    def porcentaje_stamina(self) -> float:
+        """Retorna el porcentaje de stamina actual"""
+        if self.ps_maximos == 0:
+            return 0.0
+        return (self.ps_actuales / self.ps_maximos) * 100
+
+
+class EstadoBatalla:
+    """
+    Estado de una batalla en formato struct-of-arrays.
+
+    Cada combatiente es una fila; los arrays guardan PV, PS, reflejos
+    (modificador con armadura), ataque (parte fija del CA), reducción de
+    armadura y si sigue vivo. El índice nombre -> fila evita búsquedas
+    lineales.
+    """
+
+    def __init__(self, personajes: Sequence[Personaje], perfiles: Sequence[PerfilCombate],
+                 ataque: Sequence[int], bandos: Optional[Dict[str, str]] = None,
+                 iniciativa: Optional[Sequence[int]] = None):
+        """
+        Args:
+            personajes: Combatientes (el orden define las filas)
+            perfiles: Perfil de combate de cada combatiente (CombateService.perfil_combate)
+            ataque: Parte fija del CA de cada combatiente (CombateService.base_ataque)
+            bandos: Nombre -> bando. Sin bando, el combatiente lucha solo
+            iniciativa: Iniciativa de cada combatiente (opcional)
+        """
+        if np is None:
+            raise ImportError("Las batallas masivas requieren NumPy. Instalar con: pip install numpy")
+
+        bandos = bandos or {}
+        self.nombres: List[str] = [p.nombre for p in personajes]
+        self.bandos: List[Optional[str]] = [bandos.get(n) for n in self.nombres]
+        self.indice: Dict[str, int] = {n: i for i, n in enumerate(self.nombres)}
+        if len(self.indice) != len(self.nombres):
+            raise ValueError("Los nombres de los combatientes deben ser únicos")
+
+        self.pv = np.array([p.pv_actuales for p in personajes], dtype=np.int64)
+        self.pv_maximos = np.array([p.pv_maximos for p in personajes], dtype=np.int64)
+        self.ps = np.array([p.ps_actuales for p in personajes], dtype=np.int64)
+        self.ps_maximos = np.array([p.ps_maximos for p in personajes], dtype=np.int64)
+        self.reflejos = np.array([p.modificador_reflejos for p in perfiles], dtype=np.int64)
+        self.ataque = np.asarray(ataque, dtype=np.int64)
+        self.reduccion = np.array([p.reduccion_daño for p in perfiles], dtype=np.int64)
+        self.vivos = np.array([p.esta_en_condiciones_combate() for p in personajes], dtype=bool)
+        self.iniciativa = np.zeros(len(personajes), dtype=np.int64) if iniciativa is None \
+            else np.asarray(iniciativa, dtype=np.int64)
+
+        # Código entero por bando; quien no tiene bando recibe uno propio
+        codigos: Dict[str, int] = {}
+        self.codigo_bando = np.array([
+            codigos.setdefault(b if b is not None else f"\0{n}", len(codigos))
+            for n, b in zip(self.nombres, self.bandos)
+        ], dtype=np.int64)
+
+        self.ronda = 0
+        self.activa = True
+        self.ganador: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def fila(self, nombre: str) -> int:
+        """Fila de un combatiente (KeyError si no participa)"""
+        return self.indice[nombre]
+
+    def vista(self, nombre: str) -> VistaCombatiente:
+        """Vista en vivo de un combatiente"""
+        return VistaCombatiente.de_fila(self, self.indice[nombre])
+
+    def vistas(self) -> List[VistaCombatiente]:
+        """Vistas en vivo de todos los combatientes, en orden de fila"""
+        return [VistaCombatiente.de_fila(self, i) for i in range(len(self))]
+
+    def vivos_por_bando(self) -> Dict[str, int]:
+        """Bando (o nombre, si no tiene) -> combatientes en pie"""
+        conteo: Dict[str, int] = {}
+        for i in np.flatnonzero(self.vivos):
+            clave = self.bandos[i] or self.nombres[i]
+            conteo[clave] = conteo.get(clave, 0) + 1
+        return conteo
+
+    def verificar_fin(self) -> bool:
+        """Termina la batalla cuando queda un solo bando en pie"""
+        vivos = np.flatnonzero(self.vivos)
+        if np.unique(self.codigo_bando[vivos]).size <= 1:
+            self.activa = False
+            if vivos.size:
+                self.ganador = self.bandos[vivos[0]] or self.nombres[vivos[0]]
+            return True
+        return False
+
+    def volcar_en_personajes(self, personajes: Sequence[Personaje]):
+        """Copia PV/PS/estado vital de vuelta a los personajes"""
+        for personaje in personajes:
+            i = self.indice[personaje.nombre]
+            personaje.pv_actuales = int(self.pv[i])
+            personaje.ps_actuales = int(self.ps[i])
+            if not self.vivos[i]:
+                personaje.esta_vivo = False
+                personaje.esta_inconsciente = True
+
+    def resumen(self) -> str:
+        """Genera un resumen del estado de la batalla"""
+        lineas = [f"=== BATALLA - Ronda {self.ronda} ({int(self.vivos.sum())}/{len(self)} en pie) ==="]
+        for bando, vivos in sorted(self.vivos_por_bando().items(), key=lambda x: -x[1]):
+            lineas.append(f"  {bando}: {vivos}")
+        return "\n".join(lineas)
+
+
+@dataclass
+class ResultadoRonda:
+    """Lo ocurrido en una ronda de batalla masiva"""
+    ronda: int
+    ataques: int = 0
+    exitos: int = 0
+    contraataques: int = 0
+    golpes_gracia: int = 0
+    daño_total: int = 0
+    muertos: List[str] = field(default_factory=list)
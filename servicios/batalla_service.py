@@ -0,0 +1,233 @@
+"""
+Servicio de Batalla Masiva - Escaramuzas de cientos de combatientes.
+Resuelve todos los ataques de una ronda a la vez sobre EstadoBatalla.
+"""
+from typing import Dict, Optional, Sequence
+from entidades import Personaje, Constantes
+from patrones import EventBus, TipoEvento
+from .batalla_estructuras import EstadoBatalla, ResultadoRonda, np
+from .combate_service import CombateService
+
+
+class BatallaMasivaService:
+    """
+    Motor de batallas masivas con las reglas de CombateService.
+
+    Cada ronda, todo combatiente en pie ataca a un enemigo en pie elegido
+    al azar. Los ataques de la ronda son simultáneos: se leen los valores
+    al inicio de la ronda y los efectos se acumulan, así que quien cae
+    durante la ronda igual ejecuta su ataque. Dentro de la ronda, un golpe
+    es de gracia si el objetivo ya no tenía stamina cuando llegó (en orden
+    de resolución), igual que en resolver_ataque.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus] = None,
+                 semilla: Optional[int] = None, max_contraataques: int = 50):
+        """
+        Args:
+            event_bus: Bus de eventos para notificaciones (opcional)
+            semilla: Semilla del generador de la batalla (opcional)
+            max_contraataques: Contraataques encadenados máximos por ataque
+        """
+        if np is None:
+            raise ImportError("Las batallas masivas requieren NumPy. Instalar con: pip install numpy")
+
+        self.event_bus = event_bus or EventBus(guardar_historial=False)
+        self.rng = np.random.default_rng(semilla)
+        self.max_contraataques = max_contraataques
+        self.estado: Optional[EstadoBatalla] = None
+
+    # ========================================================================
+    # Inicialización
+    # ========================================================================
+
+    def iniciar_batalla(self, combatientes: Sequence[Personaje],
+                        bandos: Optional[Dict[str, str]] = None) -> EstadoBatalla:
+        """
+        Crea el estado de la batalla con stamina completa e iniciativa (Sta + 1d10).
+
+        Args:
+            combatientes: Personajes que participan
+            bandos: Nombre del personaje -> bando
+        """
+        if len(combatientes) < 2:
+            raise ValueError("Se necesitan al menos 2 combatientes")
+
+        for c in combatientes:
+            c.restaurar_stamina_completa()
+
+        # Mismos perfiles de combate que usa CombateService
+        servicio = CombateService(self.event_bus)
+        perfiles = [servicio.perfil_combate(c) for c in combatientes]
+        ataque = [servicio.base_ataque(c) for c in combatientes]
+        iniciativa = [c.ficha.stamina for c in combatientes] + \
+            self.rng.integers(1, 11, len(combatientes))
+
+        self.estado = EstadoBatalla(combatientes, perfiles, ataque, bandos, iniciativa)
+
+        self.event_bus.publicar(TipoEvento.COMBATE_INICIADO, lambda: {
+            "combatientes": list(self.estado.nombres),
+            "bandos": sorted({b for b in self.estado.bandos if b})
+        })
+        return self.estado
+
+    # ========================================================================
+    # Resolución por rondas
+    # ========================================================================
+
+    def resolver_ronda(self) -> ResultadoRonda:
+        """Resuelve los ataques de todos los combatientes en pie"""
+        if self.estado is None:
+            raise ValueError("No hay batalla en curso")
+
+        estado = self.estado
+        estado.ronda += 1
+        resultado = ResultadoRonda(ronda=estado.ronda)
+
+        atacantes, objetivos = self._elegir_objetivos()
+        resultado.ataques = int(atacantes.size)
+
+        golpes_a, golpes_d = [], []  # Ataques exitosos, en orden de resolución
+        for cadena in range(self.max_contraataques + 1):
+            if atacantes.size == 0:
+                break
+            if cadena:
+                resultado.contraataques += int(atacantes.size)
+
+            ca = estado.ataque[atacantes] + self._tirar(atacantes.size, Constantes.DADOS_ATAQUE)
+            cd = estado.reflejos[objetivos] + self._tirar(atacantes.size, Constantes.DADOS_DEFENSA)
+            diferencia = ca - cd
+
+            exito = diferencia > 0
+            golpes_a.append(atacantes[exito])
+            golpes_d.append((objetivos[exito], diferencia[exito]))
+
+            # Contraataque: el defensor responde al atacante
+            contra = diferencia <= Constantes.UMBRAL_CONTRAATAQUE
+            atacantes, objetivos = objetivos[contra], atacantes[contra]
+
+        if golpes_a:
+            self._aplicar_golpes(
+                np.concatenate(golpes_a),
+                np.concatenate([d for d, _ in golpes_d]),
+                np.concatenate([dif for _, dif in golpes_d]),
+                resultado
+            )
+
+        caidos = np.flatnonzero(estado.vivos & (estado.pv == 0))
+        estado.vivos[caidos] = False
+        resultado.muertos = [estado.nombres[i] for i in caidos]
+
+        if resultado.muertos and self.event_bus.tiene_interesados(TipoEvento.PERSONAJE_MUERTO):
+            for nombre in resultado.muertos:
+                self.event_bus.publicar(TipoEvento.PERSONAJE_MUERTO, {"personaje": nombre})
+
+        estado.verificar_fin()
+        return resultado
+
+    def ejecutar_batalla(self, combatientes: Sequence[Personaje],
+                         bandos: Optional[Dict[str, str]] = None,
+                         max_rondas: int = 100) -> EstadoBatalla:
+        """
+        Ejecuta una batalla completa y vuelca PV/PS finales en los personajes.
+
+        Returns:
+            Estado final (ganador = bando o nombre del último en pie)
+        """
+        estado = self.iniciar_batalla(combatientes, bandos)
+
+        while not estado.verificar_fin() and estado.ronda < max_rondas:
+            self.resolver_ronda()
+
+        estado.volcar_en_personajes(combatientes)
+        return estado
+
+    def _elegir_objetivos(self):
+        """
+        Elige para cada combatiente en pie un enemigo en pie al azar.
+        Ordenando los vivos por bando, los enemigos de un combatiente son
+        todos menos el bloque contiguo de su propio bando.
+        """
+        estado = self.estado
+        vivos = np.flatnonzero(estado.vivos)
+        ordenados = vivos[np.argsort(estado.codigo_bando[vivos], kind="stable")]
+        codigos = estado.codigo_bando[ordenados]
+
+        inicio = np.searchsorted(codigos, codigos, side="left")
+        tamaño = np.searchsorted(codigos, codigos, side="right") - inicio
+        enemigos = ordenados.size - tamaño
+
+        # Posición al azar entre los enemigos, saltando el bloque propio
+        posicion = (self.rng.random(ordenados.size) * enemigos).astype(np.int64)
+        posicion += np.where(posicion >= inicio, tamaño, 0)
+
+        con_enemigos = enemigos > 0
+        atacantes = ordenados[con_enemigos]
+        objetivos = ordenados[np.minimum(posicion, ordenados.size - 1)][con_enemigos]
+
+        # Los atacantes actúan en orden de fila
+        orden = np.argsort(atacantes, kind="stable")
+        atacantes, objetivos = atacantes[orden], objetivos[orden]
+        return atacantes, objetivos
+
+    def _aplicar_golpes(self, atacantes, objetivos, diferencias, resultado: ResultadoRonda):
+        """Aplica el desgaste de stamina y los golpes de gracia de la ronda"""
+        estado = self.estado
+        resultado.exitos = int(atacantes.size)
+
+        # Stamina restante de cada objetivo antes de cada golpe (orden de resolución)
+        orden = np.argsort(objetivos, kind="stable")
+        obj_ord, dif_ord = objetivos[orden], diferencias[orden]
+        acumulado = np.cumsum(dif_ord)
+        inicio_grupo = np.searchsorted(obj_ord, obj_ord, side="left")
+        previo = acumulado - dif_ord - np.where(inicio_grupo > 0, acumulado[inicio_grupo - 1], 0)
+        ps_antes = np.maximum(0, estado.ps[obj_ord] - previo)
+
+        np.subtract.at(estado.ps, objetivos, diferencias)
+        np.maximum(estado.ps, 0, out=estado.ps)
+
+        # Golpe de gracia: el golpe que deja (o encuentra) al objetivo sin stamina
+        gracia = orden[ps_antes - dif_ord <= 0]
+        if gracia.size == 0:
+            return
+
+        g_atk, g_obj = atacantes[gracia], objetivos[gracia]
+        ca = estado.ataque[g_atk] + self._tirar(gracia.size, Constantes.DADOS_ATAQUE)
+        daño = np.maximum(0, ca - estado.reduccion[g_obj])
+
+        pv_antes = estado.pv.copy()
+        np.subtract.at(estado.pv, g_obj, daño)
+        np.maximum(estado.pv, 0, out=estado.pv)
+
+        resultado.golpes_gracia = int(gracia.size)
+        resultado.daño_total = int((pv_antes - estado.pv).sum())
+
+    def _tirar(self, n: int, cantidad: int) -> "np.ndarray":
+        """n tiradas de cantidad d6 sumadas"""
+        return self.rng.integers(1, 7, (n, cantidad)).sum(axis=1)
+
+
+if __name__ == "__main__":
+    import time
+    from entidades import Ficha, Hephix, HephixTipo, ClaseTipo, crear_espada_basica
+
+    def soldado(nombre: str, fuerza: int) -> Personaje:
+        ficha = Ficha()
+        ficha.caracteristicas.fuerza = fuerza
+        ficha.caracteristicas.reflejos = 4
+        ficha.caracteristicas.resistencia = 5
+        ficha.caracteristicas.stamina = 3
+        ficha.combate.armas_cortantes = 10
+        p = Personaje(nombre=nombre, edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+                      hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=ficha)
+        p.equipar_arma(crear_espada_basica())
+        return p
+
+    ejercito = [soldado(f"Rojo {i}", 7) for i in range(150)] + \
+               [soldado(f"Azul {i}", 6) for i in range(150)]
+    bandos = {p.nombre: p.nombre.split()[0] for p in ejercito}
+
+    inicio = time.perf_counter()
+    estado = BatallaMasivaService(semilla=1).ejecutar_batalla(ejercito, bandos)
+    print(estado.resumen())
+    print(f"Ganador: {estado.ganador} ({time.perf_counter() - inicio:.3f}s)")
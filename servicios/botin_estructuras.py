@@ -0,0 +1,200 @@
+"""
+Estructuras de datos para las tablas de botín.
+Una TablaBotin se define en JSON y, para cada nivel, se compila a una tabla
+de alias (método de Walker/Vose) que sortea una entrada en O(1).
+"""
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from entidades import RarezaItem, CATALOGO, Item
+
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para los sorteos en lote
+    np = None
+
+# Peso relativo de cada rareza si la tabla no indica otro
+PESOS_RAREZA_BASE: Dict[RarezaItem, float] = {
+    RarezaItem.COMUN: 60.0,
+    RarezaItem.POCO_COMUN: 25.0,
+    RarezaItem.RARO: 10.0,
+    RarezaItem.EPICO: 4.0,
+    RarezaItem.LEGENDARIO: 1.0,
+}
+_ORDEN_RAREZA = {rareza: i for i, rareza in enumerate(RarezaItem)}
+
+
+def _requerir_numpy():
+    """Verifica que NumPy esté disponible para los sorteos en lote"""
+    if np is None:
+        raise ImportError(
+            "Los sorteos en lote requieren NumPy. Instalar con: pip install numpy"
+        )
+
+
+class EntradaBotin(BaseModel):
+    """Un resultado posible de la tabla"""
+    objeto: Optional[str] = None  # ID del catálogo (None = no cae nada)
+    peso: float = Field(default=1.0, gt=0)
+    cantidad: int = Field(default=1, ge=1)
+    rareza: Optional[RarezaItem] = None  # None = la de la definición del catálogo
+    nivel_minimo: int = Field(default=1, ge=1)
+    nivel_maximo: Optional[int] = None
+
+    @model_validator(mode="after")
+    def _validar_cantidad(self) -> "EntradaBotin":
+        """Solo los ítems se apilan: un arma o armadura cae de a una"""
+        definicion = CATALOGO.definicion(self.objeto) if self.objeto else None
+        if self.cantidad > 1 and definicion is not None and not isinstance(definicion, Item):
+            raise ValueError(
+                f"'{self.objeto}' no es un ítem apilable: la cantidad debe ser 1"
+            )
+        return self
+
+    def rareza_efectiva(self) -> RarezaItem:
+        if self.rareza is not None:
+            return self.rareza
+        definicion = CATALOGO.definicion(self.objeto) if self.objeto else None
+        return getattr(definicion, "rareza", RarezaItem.COMUN)
+
+    def disponible(self, nivel: int) -> bool:
+        return self.nivel_minimo <= nivel and (self.nivel_maximo is None or nivel <= self.nivel_maximo)
+
+
+class TablaBotin(BaseModel):
+    """
+    Tabla de botín ponderada por rareza y nivel.
+
+    El peso efectivo de una entrada es su peso por el de su rareza; con
+    bonus_rareza_por_nivel > 0 las rarezas altas ganan peso con el nivel
+    (cada escalón de rareza suma ese bonus por nivel por encima del 1).
+    """
+    nombre: str
+    descripcion: str = ""
+    pesos_rareza: Dict[RarezaItem, float] = Field(default_factory=lambda: dict(PESOS_RAREZA_BASE))
+    bonus_rareza_por_nivel: float = Field(default=0.0, ge=0)
+    entradas: List[EntradaBotin] = Field(default_factory=list)
+
+    # Tablas compiladas por nivel (no se serializan)
+    _compiladas: Dict[int, "TablaAlias"] = PrivateAttr(default_factory=dict)
+
+    def peso_efectivo(self, entrada: EntradaBotin, nivel: int) -> float:
+        rareza = entrada.rareza_efectiva()
+        escalon = _ORDEN_RAREZA[rareza]
+        factor_nivel = 1.0 + self.bonus_rareza_por_nivel * (nivel - 1) * escalon
+        return entrada.peso * self.pesos_rareza.get(rareza, 0.0) * factor_nivel
+
+    def compilar(self, nivel: int = 1) -> "TablaAlias":
+        """Tabla de alias para un nivel (se compila una vez y se reutiliza)"""
+        tabla = self._compiladas.get(nivel)
+        if tabla is None:
+            entradas = [e for e in self.entradas if e.disponible(nivel)]
+            pesos = [self.peso_efectivo(e, nivel) for e in entradas]
+            tabla = TablaAlias.construir(entradas, pesos)
+            self._compiladas[nivel] = tabla
+        return tabla
+
+
+class TablaAlias:
+    """
+    Distribución discreta con sorteo O(1) (método de alias de Vose).
+    Cada columna i guarda la probabilidad de quedarse en i o pasar a alias[i].
+    """
+    __slots__ = ("entradas", "probabilidad", "alias", "_probabilidad_np", "_alias_np")
+
+    def __init__(self, entradas: Sequence[EntradaBotin], probabilidad: List[float],
+                 alias: List[int]):
+        self.entradas = list(entradas)
+        self.probabilidad = probabilidad
+        self.alias = alias
+        self._probabilidad_np = None
+        self._alias_np = None
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    @classmethod
+    def construir(cls, entradas: Sequence[EntradaBotin], pesos: Sequence[float]) -> "TablaAlias":
+        """Construye la tabla en O(n)"""
+        disponibles = [(e, p) for e, p in zip(entradas, pesos) if p > 0]
+        if not disponibles:
+            raise ValueError("La tabla de botín no tiene entradas con peso positivo")
+        entradas = [e for e, _ in disponibles]
+        n = len(entradas)
+        total = sum(p for _, p in disponibles)
+        escalados = [p * n / total for _, p in disponibles]
+
+        probabilidad = [1.0] * n
+        alias = list(range(n))
+        chicos = [i for i, p in enumerate(escalados) if p < 1.0]
+        grandes = [i for i, p in enumerate(escalados) if p >= 1.0]
+        while chicos and grandes:
+            chico, grande = chicos.pop(), grandes.pop()
+            probabilidad[chico] = escalados[chico]
+            alias[chico] = grande
+            escalados[grande] -= 1.0 - escalados[chico]
+            (chicos if escalados[grande] < 1.0 else grandes).append(grande)
+        # Lo que queda tiene probabilidad 1 salvo error de redondeo
+        return cls(entradas, probabilidad, alias)
+
+    def sortear(self, generador: Optional[random.Random] = None) -> int:
+        """Índice de una entrada sorteada en O(1)"""
+        r = (generador or random).random() * len(self.entradas)
+        i = int(r)
+        return i if r - i < self.probabilidad[i] else self.alias[i]
+
+    def sortear_lote(self, n: int, generador: Optional["np.random.Generator"] = None) -> "np.ndarray":
+        """Índices de n sorteos en una sola operación vectorizada"""
+        _requerir_numpy()
+        if self._probabilidad_np is None:
+            self._probabilidad_np = np.asarray(self.probabilidad)
+            self._alias_np = np.asarray(self.alias, dtype=np.intp)
+        generador = generador or np.random.default_rng()
+        r = generador.random(n) * len(self.entradas)
+        columnas = r.astype(np.intp)
+        return np.where(r - columnas < self._probabilidad_np[columnas],
+                        columnas, self._alias_np[columnas])
+
+    def probabilidades(self) -> List[float]:
+        """Probabilidad de cada entrada (para verificar o mostrar la tabla)"""
+        n = len(self.entradas)
+        resultado = [p / n for p in self.probabilidad]
+        for i, p in enumerate(self.probabilidad):
+            if self.alias[i] != i:
+                resultado[self.alias[i]] += (1.0 - p) / n
+        return resultado
+
+    def materializar(self, indice: int):
+        """Crea el objeto de una entrada desde el catálogo (None si no cae nada)"""
+        entrada = self.entradas[indice]
+        if entrada.objeto is None:
+            return None
+        if entrada.cantidad > 1:
+            return CATALOGO.crear(entrada.objeto, cantidad=entrada.cantidad)
+        return CATALOGO.crear(entrada.objeto)
+
+
+@dataclass
+class BotinLote:
+    """
+    Resultado de sortear una tabla muchas veces.
+    Guarda solo los índices; los objetos se crean al acceder a ellos.
+    """
+    tabla: TablaAlias
+    indices: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, posicion: int):
+        return self.tabla.materializar(int(self.indices[posicion]))
+
+    def conteos(self) -> Dict[Optional[str], int]:
+        """Cuántas veces salió cada objeto (None = nada)"""
+        conteos: Dict[Optional[str], int] = {}
+        for i, veces in enumerate(np.bincount(self.indices, minlength=len(self.tabla))):
+            if veces:
+                objeto = self.tabla.entradas[i].objeto
+                conteos[objeto] = conteos.get(objeto, 0) + int(veces)
+        return conteos
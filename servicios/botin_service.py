@@ -0,0 +1,63 @@
+"""
+Servicio de Botín - Generación de loot y stock de mercaderes.
+Carga las tablas desde JSON con FactoryDesdeJSON y sortea con tablas de
+alias compiladas por nivel, así que cada sorteo cuesta O(1) sin importar
+cuántas entradas tenga la tabla.
+"""
+import random
+from typing import Dict, List, Optional
+from patrones import FactoryConRegistro, FactoryDesdeJSON
+from .botin_estructuras import TablaBotin, BotinLote, np
+
+
+class BotinService:
+    """
+    Genera botín a partir de las tablas definidas en JSON.
+    Cada definición indica su "tipo_clase" ("tabla_botin").
+    """
+
+    def __init__(self, ruta_tablas: str = "data/botin.json"):
+        fabrica = FactoryConRegistro[TablaBotin]()
+        fabrica.registrar("tabla_botin", TablaBotin)
+        self._fabrica = FactoryDesdeJSON(ruta_tablas, fabrica)
+        self._tablas: Dict[str, TablaBotin] = {}
+
+    def obtener_tablas_disponibles(self) -> List[str]:
+        """IDs de las tablas definidas en el JSON"""
+        return self._fabrica.obtener_tipos_disponibles()
+
+    def tabla(self, id_tabla: str) -> TablaBotin:
+        """Tabla cargada (se construye una sola vez por ID)"""
+        tabla = self._tablas.get(id_tabla)
+        if tabla is None:
+            tabla = self._fabrica.crear(id_tabla)
+            self._tablas[id_tabla] = tabla
+        return tabla
+
+    def generar(self, id_tabla: str, nivel: int = 1, sorteos: int = 1,
+                generador: Optional[random.Random] = None) -> list:
+        """
+        Sortea la tabla y crea los objetos obtenidos.
+
+        Args:
+            id_tabla: ID de la tabla en el JSON
+            nivel: Nivel del enemigo o mercader (filtra y pondera entradas)
+            sorteos: Cantidad de sorteos
+            generador: Stream aleatorio (None = el global)
+
+        Returns:
+            Objetos obtenidos (los sorteos sin botín no aparecen)
+        """
+        alias = self.tabla(id_tabla).compilar(nivel)
+        objetos = (alias.materializar(alias.sortear(generador)) for _ in range(sorteos))
+        return [objeto for objeto in objetos if objeto is not None]
+
+    def generar_lote(self, id_tabla: str, sorteos: int, nivel: int = 1,
+                     generador: Optional["np.random.Generator"] = None) -> BotinLote:
+        """
+        Sortea la tabla muchas veces en una operación vectorizada (NumPy).
+        Pensado para resolver el botín de miles de enemigos por tick: los
+        objetos solo se crean al acceder a cada posición del lote.
+        """
+        alias = self.tabla(id_tabla).compilar(nivel)
+        return BotinLote(alias, alias.sortear_lote(sorteos, generador))
@@ -0,0 +1,74 @@
+"""
+Carga confiable de archivos propios.
+Los guardados llevan como primera clave un hash SHA-256 del resto del
+archivo. Si coincide, el archivo es tal cual lo escribió el juego y se puede
+cargar por el camino rápido; si no, se valida todo por el camino normal.
+"""
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from pydantic import TypeAdapter
+
+CLAVE_INTEGRIDAD = "integridad"
+
+# El archivo firmado empieza con '{\n  "integridad": "<64 hex>",' y sigue
+# con el JSON original sin su llave de apertura
+_PREFIJO = '{\n  "' + CLAVE_INTEGRIDAD + '": "'
+_LARGO_HASH = 64
+
+
+@lru_cache(maxsize=None)
+def adaptador(tipo: Any) -> TypeAdapter:
+    """TypeAdapter cacheado por tipo (construirlos es caro)"""
+    return TypeAdapter(tipo)
+
+
+def serializar_firmado(datos: Dict[str, Any]) -> str:
+    """
+    Serializa los datos como JSON indentado con su hash de integridad.
+    El resultado sigue siendo JSON válido (la firma es una clave más).
+    """
+    return firmar_fragmentos({clave: fragmento_json(valor) for clave, valor in datos.items()})
+
+
+def fragmento_json(valor: Any) -> str:
+    """
+    JSON de un valor indentado como queda bajo una clave de primer nivel.
+    Permite serializar cada sección una vez y reutilizarla en otros guardados.
+    """
+    return json.dumps(valor, ensure_ascii=False, indent=2, default=str).replace("\n", "\n  ")
+
+
+def firmar_fragmentos(fragmentos: Dict[str, str]) -> str:
+    """
+    Arma el archivo firmado a partir de fragmentos de fragmento_json.
+    El resultado es idéntico a serializar_firmado con los mismos datos.
+    """
+    if not fragmentos:
+        raise ValueError("No se pueden firmar datos vacíos")
+    cuerpo = "{\n" + ",\n".join(
+        f"  {json.dumps(clave, ensure_ascii=False)}: {fragmento}"
+        for clave, fragmento in fragmentos.items()
+    ) + "\n}"
+    firma = hashlib.sha256(cuerpo.encode("utf-8")).hexdigest()
+    return f'{_PREFIJO}{firma}",{cuerpo[1:]}'
+
+
+def extraer_verificado(texto: str) -> Optional[str]:
+    """
+    Retorna el JSON original si la firma coincide, o None si el archivo no
+    está firmado o fue modificado.
+    """
+    if not texto.startswith(_PREFIJO):
+        return None
+    inicio = len(_PREFIJO)
+    firma = texto[inicio:inicio + _LARGO_HASH]
+    resto = texto[inicio + _LARGO_HASH:]
+    if not resto.startswith('",'):
+        return None
+
+    cuerpo = "{" + resto[2:]
+    if hashlib.sha256(cuerpo.encode("utf-8")).hexdigest() != firma:
+        return None
+    return cuerpo
@@ -0,0 +1,149 @@
+"""
+Codecs de guardado.
+Un codec define cómo se serializa cada sección de una partida y cómo se
+arma el archivo. "json" es el formato original (JSON indentado y firmado,
+legible a mano); los binarios escriben una cabecera con el codec y la
+versión del esquema seguida del JSON compacto, opcionalmente comprimido.
+La lectura detecta el formato sola, así que los slots JSON existentes se
+siguen cargando con cualquier codec configurado. Cada codec tiene su
+extensión de archivo, para que un binario nunca quede en un ".json".
+
+Cabecera de los formatos binarios:
+    "<4sB8sBBB32s": mágico, versión de cabecera, nombre del codec (ASCII,
+    hasta 8 bytes), versión del esquema (mayor, menor, parche), SHA-256 del JSON
+"""
+import hashlib
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional
+from patrones import FactoryConRegistro
+from .carga_confiable import fragmento_json, firmar_fragmentos, extraer_verificado
+
+_MAGIA = b"EBSV"
+_VERSION_CABECERA = 1
+_CABECERA = struct.Struct("<4sB8sBBB32s")
+_LARGO_NOMBRE = 8
+
+
+class GuardadoLeido(NamedTuple):
+    """Contenido de un archivo de guardado ya decodificado"""
+    cuerpo: str                      # JSON de la partida
+    verificado: bool                 # El hash de integridad coincide
+    codec: str
+    version_esquema: Optional[str]   # None en los JSON (va dentro del cuerpo)
+
+
+class CodecGuardado:
+    """Codec "json": JSON indentado con el hash de integridad como primera clave"""
+    nombre = "json"
+    extension = ".json"
+
+    def fragmento(self, valor: Any) -> str:
+        """Serializa una sección (el resultado se puede reutilizar entre guardados)"""
+        return fragmento_json(valor)
+
+    def armar(self, fragmentos: Dict[str, str], version_esquema: str) -> bytes:
+        """Arma el archivo completo a partir de las secciones serializadas"""
+        return firmar_fragmentos(fragmentos).encode("utf-8")
+
+
+class CodecCompacto(CodecGuardado):
+    """Codec "compacto": cabecera binaria y JSON sin espacios"""
+    nombre = "compacto"
+    extension = ".ebs"
+
+    def fragmento(self, valor: Any) -> str:
+        return json.dumps(valor, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def armar(self, fragmentos: Dict[str, str], version_esquema: str) -> bytes:
+        if not fragmentos:
+            raise ValueError("No se pueden guardar datos vacíos")
+        nombre = self.nombre.encode("ascii")
+        if len(nombre) > _LARGO_NOMBRE:
+            raise ValueError(f"El nombre del codec '{self.nombre}' supera los "
+                             f"{_LARGO_NOMBRE} bytes de la cabecera")
+        cuerpo = ("{" + ",".join(
+            f"{json.dumps(clave, ensure_ascii=False)}:{fragmento}"
+            for clave, fragmento in fragmentos.items()
+        ) + "}").encode("utf-8")
+
+        cabecera = _CABECERA.pack(
+            _MAGIA, _VERSION_CABECERA, nombre,
+            *_partes_version(version_esquema), hashlib.sha256(cuerpo).digest()
+        )
+        return cabecera + self.codificar(cuerpo)
+
+    def codificar(self, cuerpo: bytes) -> bytes:
+        return cuerpo
+
+    def decodificar(self, datos: bytes) -> bytes:
+        return datos
+
+
+class CodecZlib(CodecCompacto):
+    """Codec "zlib": como el compacto, con el JSON comprimido"""
+    nombre = "zlib"
+    extension = ".ebz"
+
+    def __init__(self, nivel: int = 6):
+        self.nivel = nivel
+
+    def codificar(self, cuerpo: bytes) -> bytes:
+        return zlib.compress(cuerpo, self.nivel)
+
+    def decodificar(self, datos: bytes) -> bytes:
+        return zlib.decompress(datos)
+
+
+CODECS = FactoryConRegistro[CodecGuardado]()
+CODECS.registrar(CodecGuardado.nombre, CodecGuardado)
+CODECS.registrar(CodecCompacto.nombre, CodecCompacto)
+CODECS.registrar(CodecZlib.nombre, CodecZlib)
+
+
+def extensiones_guardado() -> List[str]:
+    """Extensiones de todos los codecs registrados ("json" primero)"""
+    extensiones = []
+    for nombre in CODECS.obtener_tipos_disponibles():
+        extension = CODECS.crear(nombre).extension
+        if extension not in extensiones:
+            extensiones.append(extension)
+    return extensiones
+
+
+def leer_guardado(datos: bytes) -> GuardadoLeido:
+    """
+    Decodifica un archivo de guardado de cualquier codec registrado.
+
+    Raises:
+        ValueError: Si la cabecera es de otra versión o el codec no existe
+    """
+    if not datos.startswith(_MAGIA):
+        texto = datos.decode("utf-8")
+        cuerpo = extraer_verificado(texto)
+        return GuardadoLeido(cuerpo if cuerpo is not None else texto,
+                             cuerpo is not None, CodecGuardado.nombre, None)
+
+    try:
+        _, version, nombre, mayor, menor, parche, firma = _CABECERA.unpack_from(datos)
+    except struct.error as e:
+        raise ValueError(f"Cabecera de guardado dañada: {e}") from e
+    if version != _VERSION_CABECERA:
+        raise ValueError(f"Versión de cabecera no soportada: {version}")
+
+    nombre = nombre.rstrip(b"\0").decode("ascii")
+    codec = CODECS.crear(nombre)
+    try:
+        cuerpo = codec.decodificar(datos[_CABECERA.size:])
+    except zlib.error as e:
+        raise ValueError(f"Guardado dañado: {e}") from e
+    return GuardadoLeido(cuerpo.decode("utf-8"), hashlib.sha256(cuerpo).digest() == firma,
+                         nombre, f"{mayor}.{menor}.{parche}")
+
+
+def _partes_version(version: str) -> tuple:
+    partes = [int(p) for p in version.split(".")]
+    if len(partes) != 3 or not all(0 <= p <= 255 for p in partes):
+        raise ValueError(f"Versión de esquema inválida: {version}")
+    return tuple(partes)
@@ -2,9 +2,12 @@
 Estructuras de datos para el sistema de combate.
 Define los resultados y estados del combate.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from dataclasses import dataclass, field, fields
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Optional, List, Dict, Union
 from enum import Enum
+from entidades import Personaje, Ficha
+from patrones import EstrategiaAtaque
 
 
 class TipoResultadoAtaque(str, Enum):
@@ -17,6 +20,28 @@ class TipoResultadoAtaque(str, Enum):
     FALLO = "fallo"
 
 
+@dataclass(frozen=True)
+class PerfilCombate:
+    """
+    Partes fijas del CA y el CD de un personaje.
+    Se cachea en el personaje y se recalcula al cambiar equipo, nivel o ficha.
+    """
+    estrategia: EstrategiaAtaque
+    aditiva: bool  # La estrategia es stat + dados + bonus (se puede sumar directo)
+    stat_base: int
+    bonus_arma: int
+    bonus_habilidad: int
+    modificador_reflejos: int
+    reduccion_daño: int
+    arma_usada: str
+    version_estrategias: int
+    
+    @property
+    def base_ataque(self) -> int:
+        """Parte fija del CA (sin dados)"""
+        return self.stat_base + self.bonus_arma + self.bonus_habilidad
+
+
 class ResultadoAtaque(BaseModel):
     """
     Resultado detallado de un ataque.
@@ -68,6 +93,127 @@ class ResultadoAtaque(BaseModel):
             return f"❌ Ataque fallido"
 
 
+@dataclass(slots=True)
+class ResultadoAtaqueCompacto:
+    """
+    Contraparte sin validación de ResultadoAtaque, con los mismos campos.
+    La produce CombateService(resultados_compactos=True) en bucles internos.
+    """
+    tipo: TipoResultadoAtaque
+    atacante_nombre: str
+    defensor_nombre: str
+    coeficiente_ataque: int = 0
+    coeficiente_defensa: int = 0
+    diferencia: int = 0
+    daño_infligido: int = 0
+    stamina_perdida: int = 0
+    defensor_pv_restantes: int = 0
+    defensor_stamina_restante: int = 0
+    defensor_muerto: bool = False
+    defensor_sin_stamina: bool = False
+    fue_golpe_gracia: bool = False
+    fue_contraataque: bool = False
+    arma_usada: Optional[str] = None
+    dados_ataque: List[int] = field(default_factory=list)
+    dados_defensa: List[int] = field(default_factory=list)
+    
+    descripcion_corta = ResultadoAtaque.descripcion_corta
+    
+    @classmethod
+    def desde_resultado(cls, resultado: ResultadoAtaque) -> "ResultadoAtaqueCompacto":
+        """Convierte un ResultadoAtaque sin perder campos"""
+        return cls(**resultado.model_dump())
+    
+    def a_resultado(self) -> ResultadoAtaque:
+        """Convierte al modelo Pydantic (validado)"""
+        return ResultadoAtaque(**{
+            f.name: list(v) if isinstance(v := getattr(self, f.name), list) else v
+            for f in fields(self)
+        })
+
+
+# Con resultados_compactos los ataques retornan la variante sin validación
+Resultado = Union[ResultadoAtaque, ResultadoAtaqueCompacto]
+
+
+@dataclass(slots=True, eq=False)
+class CombatienteRapido:
+    """
+    Combatiente sin validación para bucles de simulación.
+    
+    Guarda el estado dinámico de combate en slots y las partes fijas en un
+    PerfilCombate. La ficha es la del personaje original (compartida, solo
+    lectura), así que las IA y la iniciativa funcionan igual. El resto de
+    los datos del personaje queda en `origen`.
+    """
+    nombre: str
+    ficha: Ficha
+    perfil: PerfilCombate
+    pv_actuales: int
+    pv_maximos: int
+    ps_actuales: int
+    ps_maximos: int
+    pm_actuales: int
+    esta_vivo: bool
+    esta_inconsciente: bool
+    origen: Personaje
+    
+    @classmethod
+    def desde_personaje(cls, personaje: Personaje, perfil: PerfilCombate) -> "CombatienteRapido":
+        """Crea el combatiente con el perfil calculado por CombateService.perfil_combate"""
+        return cls(
+            nombre=personaje.nombre,
+            ficha=personaje.ficha,
+            perfil=perfil,
+            pv_actuales=personaje.pv_actuales,
+            pv_maximos=personaje.pv_maximos,
+            ps_actuales=personaje.ps_actuales,
+            ps_maximos=personaje.ps_maximos,
+            pm_actuales=personaje.pm_actuales,
+            esta_vivo=personaje.esta_vivo,
+            esta_inconsciente=personaje.esta_inconsciente,
+            origen=personaje
+        )
+    
+    def a_personaje(self, copiar: bool = False) -> Personaje:
+        """
+        Vuelca el estado de combate en el personaje de origen y lo retorna.
+        
+        Args:
+            copiar: Volcar en una copia profunda y dejar intacto el original
+        """
+        personaje = self.origen.model_copy(deep=True) if copiar else self.origen
+        personaje.pv_actuales = self.pv_actuales
+        personaje.ps_actuales = self.ps_actuales
+        personaje.pm_actuales = self.pm_actuales
+        personaje.esta_vivo = self.esta_vivo
+        personaje.esta_inconsciente = self.esta_inconsciente
+        return personaje
+    
+    # Misma interfaz que Personaje para lo que usa CombateService
+    
+    def esta_en_condiciones_combate(self) -> bool:
+        return self.esta_vivo and not self.esta_inconsciente and self.pv_actuales > 0
+    
+    def recibir_daño(self, cantidad: int) -> int:
+        """Aplica daño reducido por la armadura; retorna el daño recibido"""
+        daño_final = max(0, cantidad - self.perfil.reduccion_daño)
+        self.pv_actuales = max(0, self.pv_actuales - daño_final)
+        if self.pv_actuales == 0:
+            self.esta_vivo = False
+            self.esta_inconsciente = True
+        return daño_final
+    
+    def gastar_stamina(self, cantidad: int):
+        self.ps_actuales = max(0, self.ps_actuales - cantidad)
+    
+    def esta_sin_stamina(self) -> bool:
+        return self.ps_actuales <= 0
+    
+    def restaurar_stamina_completa(self):
+        self.ps_actuales = self.ps_maximos
+
+
 class EstadoCombatiente(BaseModel):
     """Estado actual de un combatiente en el combate"""
     nombre: str
@@ -78,6 +224,7 @@ class EstadoCombatiente(BaseModel):
     esta_vivo: bool
     esta_inconsciente: bool
     iniciativa: int = 0
+    bando: Optional[str] = None  # None = lucha por su cuenta
     
     def porcentaje_vida(self) -> float:
         """Retorna el porcentaje de vida actual"""
@@ -104,19 +251,23 @@ class EstadoCombate(BaseModel):
     combate_activo: bool = True
     ganador: Optional[str] = None
     
-    # Historial
-    historial_ataques: List[ResultadoAtaque] = Field(default_factory=list)
+    # Historial (limite_historial = últimos ataques conservados, None = todos).
+    # Durante el combate puede tener hasta el doble; ver recortar_historial.
+    # Los resultados compactos se guardan tal cual (ver obtener_historial)
+    historial_ataques: List[Resultado] = Field(default_factory=list)
+    limite_historial: Optional[int] = None
+    ataques_totales: int = 0
+    
+    # Índice nombre -> combatiente (se reconstruye si cambia la lista)
+    _indice_nombres: Dict[str, EstadoCombatiente] = PrivateAttr(default_factory=dict)
+    _lista_indexada: Optional[list] = PrivateAttr(default=None)
     
     def obtener_combatiente_actual(self) -> Optional[EstadoCombatiente]:
         """Obtiene el combatiente del turno actual"""
         if not self.orden_turnos:
             return None
         
-        nombre = self.orden_turnos[self.indice_turno_actual]
-        for combatiente in self.combatientes:
-            if combatiente.nombre == nombre:
-                return combatiente
-        return None
+        return self.obtener_combatiente_por_nombre(self.orden_turnos[self.indice_turno_actual])
     
     def avanzar_turno(self):
         """Avanza al siguiente turno"""
@@ -124,16 +275,44 @@ class EstadoCombate(BaseModel):
         if self.indice_turno_actual == 0:
             self.turno_actual += 1
     
-    def agregar_resultado_ataque(self, resultado: ResultadoAtaque):
-        """Agrega un resultado al historial"""
+    def agregar_resultado_ataque(self, resultado: Resultado):
+        """
+        Agrega un resultado al historial, descartando los más viejos si hay límite.
+        Los resultados compactos no se validan al agregarse: se serializan
+        igual que ResultadoAtaque y se cargan como ResultadoAtaque.
+        """
+        self.ataques_totales += 1
+        if self.limite_historial == 0:
+            return
         self.historial_ataques.append(resultado)
+        # Se recorta en bloque al llegar al doble del límite: O(1) amortizado
+        # por ataque en lugar de desplazar la lista en cada uno
+        if self.limite_historial is not None and len(self.historial_ataques) >= 2 * self.limite_historial:
+            self.recortar_historial()
+    
+    def obtener_historial(self) -> List[ResultadoAtaque]:
+        """Historial como ResultadoAtaque; los compactos se convierten al leerlos"""
+        historial = self.historial_ataques
+        for i, resultado in enumerate(historial):
+            if type(resultado) is ResultadoAtaqueCompacto:
+                historial[i] = resultado.a_resultado()
+        return historial
+    
+    def recortar_historial(self):
+        """Deja en el historial solo los últimos limite_historial resultados"""
+        if self.limite_historial is not None and len(self.historial_ataques) > self.limite_historial:
+            del self.historial_ataques[:len(self.historial_ataques) - self.limite_historial]
     
     def obtener_combatiente_por_nombre(self, nombre: str) -> Optional[EstadoCombatiente]:
         """Busca un combatiente por nombre"""
-        for combatiente in self.combatientes:
-            if combatiente.nombre == nombre:
-                return combatiente
-        return None
+        combatiente = self._indice_nombres.get(nombre)
+        if (combatiente is None or combatiente.nombre != nombre
+                or self._lista_indexada is not self.combatientes
+                or len(self._indice_nombres) != len(self.combatientes)):
+            self._indice_nombres = {c.nombre: c for c in self.combatientes}
+            self._lista_indexada = self.combatientes
+            combatiente = self._indice_nombres.get(nombre)
+        return combatiente
     
     def verificar_fin_combate(self) -> bool:
         """
@@ -141,11 +320,12 @@ class EstadoCombate(BaseModel):
         Actualiza el estado y determina el ganador.
         """
         vivos = [c for c in self.combatientes if c.esta_vivo]
+        bandos_vivos = {c.bando or c.nombre for c in vivos}
         
-        if len(vivos) <= 1:
+        if len(bandos_vivos) <= 1:
             self.combate_activo = False
             if vivos:
-                self.ganador = vivos[0].nombre
+                self.ganador = vivos[0].bando or vivos[0].nombre
             return True
         
         return False
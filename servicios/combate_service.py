@@ -2,16 +2,76 @@
 Servicio de Combate - Motor de combate determinista.
 Implementa todas las reglas de combate de Ether Blades.
 """
-from typing import List, Optional
+import random
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Union
 from entidades import (
     Personaje, tirar_dados, tirar_d10, Constantes,
-    TipoAtaque
+    TipoAtaque, probabilidades_ataque, crear_generador
+)
+from patrones import (
+    EventBus, TipoEvento, RegistroEstrategiasAtaque, EstrategiaAtaque,
+    EstrategiaAtaqueMelee, EstrategiaAtaqueDistancia, EstrategiaAtaqueMagico,
+    ComportamientoIA, RegistroComportamientosIA
 )
-from patrones import EventBus, TipoEvento, RegistroEstrategiasAtaque
 from .combate_estructuras import (
     ResultadoAtaque, TipoResultadoAtaque,
-    EstadoCombate, EstadoCombatiente
+    EstadoCombate, EstadoCombatiente, PerfilCombate,
+    ResultadoAtaqueCompacto, CombatienteRapido, Resultado
 )
+from .planificador_turnos import PlanificadorTurnos
+from .registro_combate import RegistroCombate, GeneradorRegistrado
+
+# Estrategias cuyo CA es stat + dados + bonus_arma + bonus_habilidad
+_ESTRATEGIAS_ADITIVAS = (EstrategiaAtaqueMelee, EstrategiaAtaqueDistancia, EstrategiaAtaqueMagico)
+
+# Los métodos de combate aceptan Personaje o su contraparte rápida
+Combatiente = Union[Personaje, CombatienteRapido]
+
+
+class _BandosEnPie:
+    """
+    Vivos por bando y objetivos de cada bando durante ejecutar_combate.
+    Se actualiza solo cuando alguien cae, así el turno no recorre a todos
+    los combatientes.
+    """
+    __slots__ = ("combatientes", "bandos", "vivos", "_objetivos")
+
+    def __init__(self, combatientes: List[Combatiente], bandos: Dict[str, str]):
+        self.combatientes = combatientes
+        self.bandos = bandos
+        self.vivos = Counter(self.bando(c) for c in combatientes if c.esta_vivo)
+        self._objetivos: Dict[str, List[Combatiente]] = {}
+
+    def bando(self, combatiente: Combatiente) -> str:
+        return self.bandos.get(combatiente.nombre, combatiente.nombre)
+
+    def terminado(self) -> bool:
+        """Queda a lo sumo un bando con miembros vivos"""
+        return len(self.vivos) <= 1
+
+    def objetivos(self, actor: Combatiente) -> List[Combatiente]:
+        """Enemigos del actor en condiciones de combatir (en el orden original)"""
+        bando = self.bando(actor)
+        objetivos = self._objetivos.get(bando)
+        if objetivos is None:
+            objetivos = self._objetivos[bando] = [
+                c for c in self.combatientes
+                if c.esta_en_condiciones_combate() and self.bando(c) != bando
+            ]
+        return objetivos
+
+    def actualizar(self, anterior: EstadoCombatiente, personaje: Combatiente):
+        """Registra una caída comparando el estado previo con el personaje"""
+        if anterior.esta_vivo and not personaje.esta_vivo:
+            bando = self.bando(personaje)
+            self.vivos[bando] -= 1
+            if not self.vivos[bando]:
+                del self.vivos[bando]
+        en_condiciones = (anterior.esta_vivo and not anterior.esta_inconsciente
+                          and anterior.pv_actuales > 0)
+        if en_condiciones != personaje.esta_en_condiciones_combate():
+            self._objetivos.clear()
 
 
 class CombateService:
@@ -20,19 +80,46 @@ class CombateService:
     Implementa todas las mecánicas de combate del juego.
     """
     
-    def __init__(self, event_bus: Optional[EventBus] = None):
+    def __init__(self, event_bus: Optional[EventBus] = None,
+                 generador: Optional[random.Random] = None,
+                 semilla: Optional[int] = None,
+                 registro: Optional[RegistroCombate] = None,
+                 resultados_compactos: bool = False):
         """
         Args:
             event_bus: Bus de eventos para notificaciones (opcional)
+            generador: Stream aleatorio propio del combate (opcional)
+            semilla: Crea un stream propio con esta semilla si no se pasa generador
+            registro: Registro compacto donde anotar dados y ataques (opcional)
+            resultados_compactos: Retornar ResultadoAtaqueCompacto (sin
+                validación) en lugar de ResultadoAtaque
+        
+        Sin generador ni semilla se usa el estado global de random (salvo
+        con registro, que siempre usa un stream propio con semilla conocida).
+        Todos los métodos de combate aceptan Personaje o CombatienteRapido.
         """
         self.event_bus = event_bus or EventBus()
         self.estado: Optional[EstadoCombate] = None
+        self.registro = registro
+        self._en_pie: Optional[_BandosEnPie] = None
+        self._crear_resultado = ResultadoAtaqueCompacto if resultados_compactos else ResultadoAtaque
+        
+        if registro is not None and generador is None:
+            if semilla is None:
+                semilla = registro.semilla if registro.semilla is not None else random.randrange(2 ** 64)
+            registro.semilla = semilla
+        
+        if generador is None and semilla is not None:
+            generador = crear_generador(semilla)
+        if registro is not None:
+            generador = GeneradorRegistrado(generador, registro)
+        self.generador = generador
     
     # ========================================================================
     # Inicialización de combate
     # ========================================================================
     
-    def iniciar_combate(self, combatientes: List[Personaje]) -> EstadoCombate:
+    def iniciar_combate(self, combatientes: List[Combatiente]) -> EstadoCombate:
         """
         Inicia un nuevo combate entre los combatientes.
         
@@ -45,6 +132,9 @@ class CombateService:
         if len(combatientes) < 2:
             raise ValueError("Se necesitan al menos 2 combatientes")
         
+        if self.registro is not None:
+            self.registro.iniciar([c.nombre for c in combatientes])
+        
         # Restaurar stamina de todos
         for c in combatientes:
             c.restaurar_stamina_completa()
@@ -52,9 +142,7 @@ class CombateService:
         # Calcular iniciativa (Sta + 1d10)
         iniciativas = []
         for combatiente in combatientes:
-            tirada = tirar_d10()
-            iniciativa_total = combatiente.ficha.stamina + tirada.total
-            iniciativas.append((combatiente, iniciativa_total))
+            iniciativas.append((combatiente, self._tirar_iniciativa(combatiente)))
         
         # Ordenar por iniciativa (mayor primero)
         iniciativas.sort(key=lambda x: x[1], reverse=True)
@@ -84,11 +172,47 @@ class CombateService:
         
         return self.estado
     
+    def crear_combatiente_rapido(self, personaje: Personaje) -> CombatienteRapido:
+        """Contraparte sin validación del personaje, para simulaciones"""
+        return CombatienteRapido.desde_personaje(personaje, self.perfil_combate(personaje))
+    
+    def _tirar_iniciativa(self, combatiente: Combatiente) -> int:
+        """Iniciativa: Sta + 1d10"""
+        return combatiente.ficha.stamina + tirar_d10(generador=self.generador).total
+    
+    def crear_planificador(self, combatientes: List[Combatiente],
+                           reroll_iniciativa: bool = False,
+                           acciones_por_ronda: Optional[Dict[str, int]] = None) -> PlanificadorTurnos:
+        """
+        Crea un planificador de turnos para el combate iniciado.
+        
+        Args:
+            combatientes: Personajes del combate (los mismos de iniciar_combate)
+            reroll_iniciativa: Si la iniciativa se vuelve a tirar cada ronda
+            acciones_por_ronda: Nombre -> turnos por ronda (por defecto 1)
+        """
+        acciones_por_ronda = acciones_por_ronda or {}
+        por_nombre = {c.nombre: c for c in combatientes}
+        
+        def tirar(nombre: str) -> int:
+            iniciativa = self._tirar_iniciativa(por_nombre[nombre])
+            self.estado.obtener_combatiente_por_nombre(nombre).iniciativa = iniciativa
+            return iniciativa
+        
+        planificador = PlanificadorTurnos(
+            tirar_iniciativa=tirar if reroll_iniciativa else None,
+            puede_actuar=lambda nombre: por_nombre[nombre].esta_en_condiciones_combate()
+        )
+        for comb in self.estado.combatientes:
+            planificador.agregar(comb.nombre, comb.iniciativa,
+                                 acciones_por_ronda.get(comb.nombre, 1))
+        return planificador
+    
     # ========================================================================
     # Resolución de ataques
     # ========================================================================
     
-    def resolver_ataque(self, atacante: Personaje, defensor: Personaje) -> ResultadoAtaque:
+    def resolver_ataque(self, atacante: Combatiente, defensor: Combatiente) -> Resultado:
         """
         Resuelve un ataque completo entre dos personajes.
         Implementa las reglas de combate de Ether Blades.
@@ -100,6 +224,13 @@ class CombateService:
         Returns:
             Resultado detallado del ataque
         """
+        inicio_dados = self.registro.total_dados if self.registro is not None else 0
+        resultado = self._resolver_ataque(atacante, defensor)
+        self._registrar("ataque", atacante, defensor, resultado, inicio_dados)
+        return resultado
+    
+    def _resolver_ataque(self, atacante: Combatiente, defensor: Combatiente) -> Resultado:
+        """Resolución de un ataque (también usada por los contraataques)"""
         # Verificar que ambos están en condiciones de combatir
         if not atacante.esta_en_condiciones_combate():
             raise ValueError(f"{atacante.nombre} no puede combatir")
@@ -108,13 +239,13 @@ class CombateService:
             raise ValueError(f"{defensor.nombre} no puede combatir")
         
         # Calcular coeficientes
-        ca = self._calcular_coeficiente_ataque(atacante)
-        cd = self._calcular_coeficiente_defensa(defensor)
+        ca, dados_ataque = self._calcular_coeficiente_ataque(atacante)
+        cd, dados_defensa = self._calcular_coeficiente_defensa(defensor)
         
         diferencia = ca - cd
         
         # Publicar evento de ataque realizado
-        self.event_bus.publicar(TipoEvento.ATAQUE_REALIZADO, {
+        self.event_bus.publicar(TipoEvento.ATAQUE_REALIZADO, lambda: {
             "atacante": atacante.nombre,
             "defensor": defensor.nombre,
             "ca": ca,
@@ -125,7 +256,7 @@ class CombateService:
         # Determinar resultado según la diferencia
         if diferencia > 0:
             # Atacante gana: reduce stamina del defensor
-            return self._aplicar_reduccion_stamina(atacante, defensor, diferencia)
+            resultado = self._aplicar_reduccion_stamina(atacante, defensor, diferencia)
         
         elif diferencia <= Constantes.UMBRAL_CONTRAATAQUE:
             # Defensor tiene derecho a contraataque (diferencia <= -3)
@@ -133,41 +264,103 @@ class CombateService:
         
         else:
             # Ataque bloqueado (diferencia entre -2 y 0)
-            return self._ataque_bloqueado(atacante, defensor, ca, cd)
+            resultado = self._ataque_bloqueado(atacante, defensor, ca, cd)
+        
+        resultado.coeficiente_ataque = ca
+        resultado.coeficiente_defensa = cd
+        resultado.diferencia = diferencia
+        resultado.dados_ataque = dados_ataque
+        resultado.dados_defensa = dados_defensa
+        return resultado
     
-    def _calcular_coeficiente_ataque(self, atacante: Personaje) -> int:
+    def _calcular_coeficiente_ataque(self, atacante: Combatiente) -> Tuple[int, List[int]]:
         """
         Calcula el Coeficiente de Ataque (CA).
         Fórmula: Stat base + 3d6 + bonus_arma + bonus_habilidad
+        
+        Returns:
+            (CA, dados tirados)
         """
-        # Obtener estrategia según tipo de arma
-        if atacante.arma_equipada:
-            estrategia = RegistroEstrategiasAtaque.obtener(atacante.arma_equipada.tipo_ataque)
-        else:
-            # Pugilismo (sin arma)
-            estrategia = RegistroEstrategiasAtaque.obtener(TipoAtaque.MELEE)
+        perfil = self.perfil_combate(atacante)
         
         # Tirar dados
-        tirada = tirar_dados(Constantes.DADOS_ATAQUE, 6)
+        tirada = tirar_dados(Constantes.DADOS_ATAQUE, 6, self.generador)
         
-        # Calcular usando la estrategia
-        ca = estrategia.calcular_coeficiente(atacante, atacante.arma_equipada, tirada.dados)
+        if perfil.aditiva:
+            return perfil.base_ataque + tirada.total, tirada.dados
         
-        return ca
+        # Estrategia personalizada: se delega el cálculo completo
+        if type(atacante) is CombatienteRapido:
+            atacante = atacante.origen
+        ca = perfil.estrategia.calcular_coeficiente(atacante, atacante.arma_equipada, tirada.dados)
+        return ca, tirada.dados
     
-    def _calcular_coeficiente_defensa(self, defensor: Personaje) -> int:
+    def _obtener_estrategia(self, atacante: Personaje) -> EstrategiaAtaque:
+        """Obtiene la estrategia de ataque según el tipo de arma"""
+        if atacante.arma_equipada:
+            return RegistroEstrategiasAtaque.obtener(atacante.arma_equipada.tipo_ataque)
+        # Pugilismo (sin arma)
+        return RegistroEstrategiasAtaque.obtener(TipoAtaque.MELEE)
+    
+    def perfil_combate(self, personaje: Combatiente) -> PerfilCombate:
+        """
+        Perfil de combate cacheado del personaje.
+        Se recalcula si cambió su equipo, nivel o ficha, o el registro de estrategias.
+        Un CombatienteRapido usa siempre el perfil con que fue creado.
+        """
+        if type(personaje) is CombatienteRapido:
+            return personaje.perfil
+        perfil = personaje.obtener_perfil_combate(self._calcular_perfil)
+        if perfil.version_estrategias != RegistroEstrategiasAtaque.version():
+            personaje.invalidar_perfil_combate()
+            perfil = personaje.obtener_perfil_combate(self._calcular_perfil)
+        return perfil
+    
+    def base_ataque(self, personaje: Combatiente) -> int:
+        """
+        Parte fija del CA (sin dados) según el perfil de combate.
+        Las estrategias no aditivas se evalúan sin dados.
+        """
+        perfil = self.perfil_combate(personaje)
+        if perfil.aditiva:
+            return perfil.base_ataque
+        if type(personaje) is CombatienteRapido:
+            personaje = personaje.origen
+        return perfil.estrategia.calcular_coeficiente(personaje, personaje.arma_equipada, [])
+    
+    def _calcular_perfil(self, personaje: Personaje) -> PerfilCombate:
+        estrategia = self._obtener_estrategia(personaje)
+        arma = personaje.arma_equipada
+        armadura = personaje.armadura_equipada
+        
+        return PerfilCombate(
+            estrategia=estrategia,
+            aditiva=type(estrategia) in _ESTRATEGIAS_ADITIVAS,
+            stat_base=estrategia.obtener_stat_base(personaje),
+            bonus_arma=arma.bonus if arma else 0,
+            bonus_habilidad=personaje.obtener_bonus_habilidad_arma(arma),
+            modificador_reflejos=personaje.obtener_modificador_reflejos(),
+            reduccion_daño=armadura.reduccion_total() if armadura else 0,
+            arma_usada=arma.nombre if arma else "Puños",
+            version_estrategias=RegistroEstrategiasAtaque.version()
+        )
+    
+    def _calcular_coeficiente_defensa(self, defensor: Combatiente) -> Tuple[int, List[int]]:
         """
         Calcula el Coeficiente de Defensa (CD).
         Fórmula: Reflejos + 2d6 + bonus_armadura
+        
+        Returns:
+            (CD, dados tirados)
         """
-        tirada = tirar_dados(Constantes.DADOS_DEFENSA, 6)
-        cd = defensor.obtener_modificador_reflejos() + tirada.total
+        tirada = tirar_dados(Constantes.DADOS_DEFENSA, 6, self.generador)
+        cd = self.perfil_combate(defensor).modificador_reflejos + tirada.total
         
-        return cd
+        return cd, tirada.dados
     
-    def _aplicar_reduccion_stamina(self, atacante: Personaje, 
-                                   defensor: Personaje, 
-                                   diferencia: int) -> ResultadoAtaque:
+    def _aplicar_reduccion_stamina(self, atacante: Combatiente, 
+                                   defensor: Combatiente, 
+                                   diferencia: int) -> Resultado:
         """
         Aplica reducción de stamina cuando el atacante gana.
         Si la stamina llega a 0, permite golpe de gracia.
@@ -175,14 +368,14 @@ class CombateService:
         # Reducir stamina
         defensor.gastar_stamina(diferencia)
         
-        resultado = ResultadoAtaque(
+        resultado = self._crear_resultado(
             tipo=TipoResultadoAtaque.EXITO,
             atacante_nombre=atacante.nombre,
             defensor_nombre=defensor.nombre,
             stamina_perdida=diferencia,
             defensor_pv_restantes=defensor.pv_actuales,
             defensor_stamina_restante=defensor.ps_actuales,
-            arma_usada=atacante.arma_equipada.nombre if atacante.arma_equipada else "Puños"
+            arma_usada=self.perfil_combate(atacante).arma_usada
         )
         
         # Verificar si quedó sin stamina -> GOLPE DE GRACIA
@@ -196,19 +389,19 @@ class CombateService:
         
         return resultado
     
-    def _golpe_de_gracia(self, atacante: Personaje, defensor: Personaje) -> ResultadoAtaque:
+    def _golpe_de_gracia(self, atacante: Combatiente, defensor: Combatiente) -> Resultado:
         """
         Ejecuta un golpe de gracia cuando el defensor no tiene stamina.
         El ataque no encuentra resistencia.
         """
         # Calcular CA sin resistencia
-        ca = self._calcular_coeficiente_ataque(atacante)
+        ca, _ = self._calcular_coeficiente_ataque(atacante)
         daño = ca  # Sin reducción por CD
         
         # Aplicar daño
         daño_real = defensor.recibir_daño(daño)
         
-        resultado = ResultadoAtaque(
+        resultado = self._crear_resultado(
             tipo=TipoResultadoAtaque.CRITICO,
             atacante_nombre=atacante.nombre,
             defensor_nombre=defensor.nombre,
@@ -218,11 +411,11 @@ class CombateService:
             defensor_stamina_restante=0,
             defensor_muerto=not defensor.esta_vivo,
             fue_golpe_gracia=True,
-            arma_usada=atacante.arma_equipada.nombre if atacante.arma_equipada else "Puños"
+            arma_usada=self.perfil_combate(atacante).arma_usada
         )
         
         # Publicar evento
-        self.event_bus.publicar(TipoEvento.GOLPE_GRACIA, {
+        self.event_bus.publicar(TipoEvento.GOLPE_GRACIA, lambda: {
             "atacante": atacante.nombre,
             "defensor": defensor.nombre,
             "daño": daño_real,
@@ -230,34 +423,34 @@ class CombateService:
         })
         
         if not defensor.esta_vivo:
-            self.event_bus.publicar(TipoEvento.PERSONAJE_MUERTO, {
+            self.event_bus.publicar(TipoEvento.PERSONAJE_MUERTO, lambda: {
                 "personaje": defensor.nombre
             })
         
         return resultado
     
-    def _contraataque(self, atacante_original: Personaje, 
-                     defensor_original: Personaje,
-                     diferencia_original: int) -> ResultadoAtaque:
+    def _contraataque(self, atacante_original: Combatiente, 
+                     defensor_original: Combatiente,
+                     diferencia_original: int) -> Resultado:
         """
         El defensor contraataca cuando la diferencia es <= -3.
         """
-        self.event_bus.publicar(TipoEvento.CONTRAATAQUE, {
+        self.event_bus.publicar(TipoEvento.CONTRAATAQUE, lambda: {
             "atacante": defensor_original.nombre,
             "defensor": atacante_original.nombre
         })
         
         # El defensor ahora ataca
-        resultado_contra = self.resolver_ataque(defensor_original, atacante_original)
+        resultado_contra = self._resolver_ataque(defensor_original, atacante_original)
         resultado_contra.fue_contraataque = True
         resultado_contra.tipo = TipoResultadoAtaque.CONTRAATAQUE
         
         return resultado_contra
     
-    def _ataque_bloqueado(self, atacante: Personaje, defensor: Personaje,
-                         ca: int, cd: int) -> ResultadoAtaque:
+    def _ataque_bloqueado(self, atacante: Combatiente, defensor: Combatiente,
+                         ca: int, cd: int) -> Resultado:
         """Ataque bloqueado sin consecuencias"""
-        resultado = ResultadoAtaque(
+        resultado = self._crear_resultado(
             tipo=TipoResultadoAtaque.BLOQUEADO,
             atacante_nombre=atacante.nombre,
             defensor_nombre=defensor.nombre,
@@ -266,10 +459,10 @@ class CombateService:
             diferencia=ca - cd,
             defensor_pv_restantes=defensor.pv_actuales,
             defensor_stamina_restante=defensor.ps_actuales,
-            arma_usada=atacante.arma_equipada.nombre if atacante.arma_equipada else "Puños"
+            arma_usada=self.perfil_combate(atacante).arma_usada
         )
         
-        self.event_bus.publicar(TipoEvento.ATAQUE_BLOQUEADO, {
+        self.event_bus.publicar(TipoEvento.ATAQUE_BLOQUEADO, lambda: {
             "atacante": atacante.nombre,
             "defensor": defensor.nombre
         })
@@ -280,11 +473,17 @@ class CombateService:
     # Ataques especiales
     # ========================================================================
     
-    def ataque_sigilo(self, atacante: Personaje, defensor: Personaje) -> ResultadoAtaque:
+    def ataque_sigilo(self, atacante: Combatiente, defensor: Combatiente) -> Resultado:
         """
         Ataque desde las sombras.
         Daño extra = (Sigilo - Percepción) × 2
         """
+        inicio_dados = self.registro.total_dados if self.registro is not None else 0
+        resultado = self._ataque_sigilo(atacante, defensor)
+        self._registrar("sigilo", atacante, defensor, resultado, inicio_dados)
+        return resultado
+    
+    def _ataque_sigilo(self, atacante: Combatiente, defensor: Combatiente) -> Resultado:
         sigilo = atacante.ficha.talento.sigilo
         percepcion = defensor.ficha.talento.percepcion
         
@@ -292,13 +491,13 @@ class CombateService:
         
         if diferencia > 0:
             # Ataque furtivo exitoso
-            ca = self._calcular_coeficiente_ataque(atacante)
+            ca, dados_ataque = self._calcular_coeficiente_ataque(atacante)
             daño_extra = diferencia * 2
             daño_total = ca + daño_extra
             
             daño_real = defensor.recibir_daño(daño_total)
             
-            resultado = ResultadoAtaque(
+            resultado = self._crear_resultado(
                 tipo=TipoResultadoAtaque.SIGILO_EXITOSO,
                 atacante_nombre=atacante.nombre,
                 defensor_nombre=defensor.nombre,
@@ -306,10 +505,11 @@ class CombateService:
                 daño_infligido=daño_real,
                 defensor_pv_restantes=defensor.pv_actuales,
                 defensor_muerto=not defensor.esta_vivo,
-                arma_usada=atacante.arma_equipada.nombre if atacante.arma_equipada else "Puños"
+                arma_usada=self.perfil_combate(atacante).arma_usada,
+                dados_ataque=dados_ataque
             )
             
-            self.event_bus.publicar(TipoEvento.ATAQUE_REALIZADO, {
+            self.event_bus.publicar(TipoEvento.ATAQUE_REALIZADO, lambda: {
                 "atacante": atacante.nombre,
                 "defensor": defensor.nombre,
                 "tipo": "sigilo",
@@ -321,6 +521,143 @@ class CombateService:
             # Detectado: el defensor contraataca
             return self._contraataque(atacante, defensor, diferencia)
     
+    def _registrar(self, accion: str, atacante: Combatiente, defensor: Combatiente,
+                   resultado: ResultadoAtaque, inicio_dados: int):
+        """Anota el ataque en el registro compacto, si hay uno"""
+        if self.registro is None:
+            return
+        if not self.registro.nombres:
+            raise ValueError("Iniciar el combate antes de registrar ataques")
+        ronda = self.estado.turno_actual if self.estado else 0
+        self.registro.registrar_ataque(ronda, atacante.nombre, defensor.nombre,
+                                       accion, resultado, inicio_dados)
+    
+    # ========================================================================
+    # Combate completo sin interacción
+    # ========================================================================
+    
+    def ejecutar_combate(
+        self,
+        combatientes: List[Combatiente],
+        comportamientos: Optional[Dict[str, Union[str, ComportamientoIA]]] = None,
+        bandos: Optional[Dict[str, str]] = None,
+        max_rondas: int = 100,
+        reroll_iniciativa: bool = False,
+        acciones_por_ronda: Optional[Dict[str, int]] = None,
+        limite_historial: Optional[int] = None
+    ) -> EstadoCombate:
+        """
+        Ejecuta un combate completo, sin entrada ni salida por consola.
+        Cada combatiente actúa según su ComportamientoIA hasta que quede
+        un solo bando en pie.
+        
+        Args:
+            combatientes: Personajes que participan
+            comportamientos: Nombre del personaje -> IA (nombre registrado o
+                instancia). Por defecto "agresiva"
+            bandos: Nombre del personaje -> bando. Sin bando, cada personaje
+                lucha por su cuenta
+            max_rondas: Rondas máximas antes de cortar el combate
+            reroll_iniciativa: Si la iniciativa se vuelve a tirar cada ronda
+            acciones_por_ronda: Nombre -> turnos por ronda (por defecto 1)
+            limite_historial: Resultados de ataque a conservar en el estado
+                (None = todos). Para reproducir el combate usar un RegistroCombate
+        
+        Returns:
+            Estado final del combate (ganador = bando o nombre del último en pie)
+        """
+        comportamientos = comportamientos or {}
+        bandos = bandos or {}
+        estado = self.iniciar_combate(combatientes)
+        estado.limite_historial = limite_historial
+        por_nombre = {c.nombre: c for c in combatientes}
+        
+        for comb in estado.combatientes:
+            comb.bando = bandos.get(comb.nombre)
+        
+        ias = {}
+        for nombre in por_nombre:
+            ia = comportamientos.get(nombre, "agresiva")
+            ias[nombre] = RegistroComportamientosIA.obtener(ia) if isinstance(ia, str) else ia
+        
+        planificador = self.crear_planificador(combatientes, reroll_iniciativa, acciones_por_ronda)
+        en_pie = self._en_pie = _BandosEnPie(combatientes, bandos)
+        
+        try:
+            while not en_pie.terminado():
+                turno = planificador.siguiente()
+                if turno is None or turno.ronda >= max_rondas:
+                    estado.turno_actual = max_rondas
+                    break
+                
+                estado.turno_actual = turno.ronda
+                actor = por_nombre[turno.nombre]
+                objetivo = self._ejecutar_turno_ia(actor, ias[actor.nombre], en_pie.objetivos(actor))
+                if objetivo is not None:
+                    self.sincronizar_estado([actor, objetivo])
+        finally:
+            self._en_pie = None
+        
+        # Los conteos solo deciden cuándo parar; el estado fija el ganador
+        estado.verificar_fin_combate()
+        estado.recortar_historial()
+        return estado
+    
+    def _ejecutar_turno_ia(self, actor: Combatiente, ia: ComportamientoIA,
+                           objetivos: List[Combatiente]) -> Optional[Combatiente]:
+        """
+        Ejecuta la acción que decide la IA para el turno de un combatiente.
+        Retorna el objetivo atacado, si hubo ataque.
+        """
+        if not objetivos:
+            return None
+        
+        self.event_bus.publicar(TipoEvento.TURNO_INICIADO, lambda: {
+            "personaje": actor.nombre,
+            "turno": self.estado.turno_actual
+        })
+        
+        accion = ia.decidir_accion(actor, objetivos, {
+            "turno": self.estado.turno_actual,
+            "estado": self.estado
+        })
+        
+        if accion["tipo"] == "atacar" and accion["objetivo"] is not None:
+            resultado = self.resolver_ataque(actor, accion["objetivo"])
+            self.estado.agregar_resultado_ataque(resultado)
+            return accion["objetivo"]
+        # "defender" y acciones no implementadas: el turno pasa sin ataque
+        return None
+    
+    def sincronizar_estado(self, combatientes: List[Combatiente]):
+        """
+        Copia PV/PS/estado vital de los personajes indicados al EstadoCombate.
+        Usar tras resolver un ataque fuera de ejecutar_combate (p. ej. al
+        reproducir un registro).
+        """
+        for personaje in combatientes:
+            comb = self.estado.obtener_combatiente_por_nombre(personaje.nombre)
+            if self._en_pie is not None:
+                self._en_pie.actualizar(comb, personaje)
+            comb.pv_actuales = personaje.pv_actuales
+            comb.ps_actuales = personaje.ps_actuales
+            comb.esta_vivo = personaje.esta_vivo
+            comb.esta_inconsciente = personaje.esta_inconsciente
+    
+    # ========================================================================
+    # Análisis de probabilidades
+    # ========================================================================
+    
+    def probabilidades_ataque(self, atacante: Combatiente, defensor: Combatiente) -> Dict[str, float]:
+        """
+        Probabilidades exactas de cada desenlace de resolver_ataque, sin tirar dados.
+        
+        Returns:
+            Dict con las probabilidades de "exito", "bloqueado" y "contraataque"
+        """
+        base_defensa = self.perfil_combate(defensor).modificador_reflejos
+        return probabilidades_ataque(self.base_ataque(atacante), base_defensa)
+    
     # ========================================================================
     # Utilidades
     # ========================================================================
@@ -2,7 +2,6 @@
 Servicio de creación de personajes.
 Implementa un wizard interactivo para guiar al jugador en la creación.
 """
-import json
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 from entidades import (
@@ -10,6 +9,7 @@ from entidades import (
     Caracteristicas, HabilidadesCombate, HabilidadesEducacion, HabilidadesTalento,
     Constantes, crear_espada_basica, crear_arco_basico, crear_baston_basico
 )
+from patrones import cargar_json
 
 
 class CreacionPersonajeService:
@@ -30,12 +30,12 @@ class CreacionPersonajeService:
         self._cargar_datos()
     
     def _cargar_datos(self):
-        """Carga las definiciones de clases y hephix desde JSON"""
-        with open(self.ruta_clases, 'r', encoding='utf-8') as f:
-            self.clases_data = json.load(f)
-        
-        with open(self.ruta_hephix, 'r', encoding='utf-8') as f:
-            self.hephix_data = json.load(f)
+        """
+        Carga las definiciones de clases y hephix desde JSON (compilados:
+        cada definición se decodifica la primera vez que se usa)
+        """
+        self.clases_data = cargar_json(self.ruta_clases)
+        self.hephix_data = cargar_json(self.ruta_hephix)
     
     # ========================================================================
     # Método no interactivo para testing y creación programática
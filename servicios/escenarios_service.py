@@ -0,0 +1,207 @@
+"""
+Servicio de Escenarios - Ejecución masiva de combates definidos en JSON.
+Permite someter al motor de reglas a volúmenes de producción repartiendo
+las repeticiones de cada escenario entre varios procesos.
+"""
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from pydantic import BaseModel, Field
+from entidades import Personaje, ClaseTipo, HephixTipo, derivar_semillas
+from patrones import EventBus
+from .combate_service import CombateService
+from .creacion_personaje_service import CreacionPersonajeService
+
+
+class PersonajeEscenario(BaseModel):
+    """Parámetros de CreacionPersonajeService.crear_personaje"""
+    nombre: str
+    clase: ClaseTipo
+    hephix_tipo: HephixTipo
+    edad: int = 25
+    raza: str = "Humano"
+    historia: str = ""
+    objetivo: str = ""
+    caracteristicas: Dict[str, int] = Field(default_factory=dict)
+    habilidades_combate: Dict[str, int] = Field(default_factory=dict)
+    habilidades_educacion: Dict[str, int] = Field(default_factory=dict)
+    habilidades_talento: Dict[str, int] = Field(default_factory=dict)
+
+
+class CombatienteEscenario(BaseModel):
+    """Un participante del escenario con su bando e IA"""
+    personaje: PersonajeEscenario
+    bando: Optional[str] = None
+    ia: str = "agresiva"
+
+
+class Escenario(BaseModel):
+    """Definición de un combate a repetir"""
+    nombre: str
+    descripcion: str = ""
+    semilla: int = 0
+    repeticiones: int = Field(default=1, ge=1)
+    max_rondas: int = Field(default=100, ge=1)
+    combatientes: List[CombatienteEscenario]
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "Escenario":
+        """Carga un escenario desde un archivo JSON"""
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return cls.model_validate(json.load(f))
+
+
+class ResumenEscenario(BaseModel):
+    """Resultados agregados de todas las repeticiones de un escenario"""
+    nombre: str
+    repeticiones: int = 0
+    victorias: Dict[str, int] = Field(default_factory=dict)  # bando/nombre -> victorias
+    sin_ganador: int = 0
+    rondas_totales: int = 0
+    ataques_totales: int = 0
+
+    def rondas_promedio(self) -> float:
+        return self.rondas_totales / self.repeticiones if self.repeticiones else 0.0
+
+    def tasa_victoria(self, bando: str) -> float:
+        return self.victorias.get(bando, 0) / self.repeticiones if self.repeticiones else 0.0
+
+    def combinar(self, otro: "ResumenEscenario"):
+        """Acumula los resultados de otro resumen del mismo escenario"""
+        self.repeticiones += otro.repeticiones
+        self.victorias = dict(Counter(self.victorias) + Counter(otro.victorias))
+        self.sin_ganador += otro.sin_ganador
+        self.rondas_totales += otro.rondas_totales
+        self.ataques_totales += otro.ataques_totales
+
+    def resumen(self) -> str:
+        lineas = [f"=== {self.nombre} ({self.repeticiones} combates) ==="]
+        for bando, victorias in sorted(self.victorias.items(), key=lambda x: -x[1]):
+            lineas.append(f"  {bando}: {self.tasa_victoria(bando):.1%}")
+        lineas.append(f"  Sin ganador: {self.sin_ganador}")
+        lineas.append(f"  Rondas promedio: {self.rondas_promedio():.2f}")
+        return "\n".join(lineas)
+
+
+# ============================================================================
+# Ejecución (nivel de módulo para poder enviarla a otros procesos)
+# ============================================================================
+
+_creacion_proceso: Optional[CreacionPersonajeService] = None
+
+
+def _crear_personajes(escenario: Escenario) -> List[Personaje]:
+    """Crea los personajes del escenario reutilizando un servicio por proceso"""
+    global _creacion_proceso
+    if _creacion_proceso is None:
+        _creacion_proceso = CreacionPersonajeService()
+    return [
+        _creacion_proceso.crear_personaje(**c.personaje.model_dump())
+        for c in escenario.combatientes
+    ]
+
+
+def ejecutar_escenario(escenario: Escenario,
+                       semillas: Optional[Sequence[int]] = None) -> ResumenEscenario:
+    """
+    Ejecuta un escenario una vez por semilla con CombateService.ejecutar_combate.
+
+    Args:
+        escenario: Escenario a ejecutar
+        semillas: Semilla de cada repetición (None = todas las del escenario)
+    """
+    if semillas is None:
+        semillas = derivar_semillas(escenario.semilla, escenario.repeticiones)
+
+    plantillas = _crear_personajes(escenario)
+    comportamientos = {c.personaje.nombre: c.ia for c in escenario.combatientes}
+    bandos = {c.personaje.nombre: c.bando for c in escenario.combatientes if c.bando}
+
+    resumen = ResumenEscenario(nombre=escenario.nombre)
+    victorias = Counter()
+
+    for semilla in semillas:
+        # Combatientes rápidos: no hace falta copiar las plantillas en cada repetición
+        servicio = CombateService(EventBus(guardar_historial=False), semilla=semilla,
+                                  resultados_compactos=True)
+        combatientes = [servicio.crear_combatiente_rapido(p) for p in plantillas]
+        estado = servicio.ejecutar_combate(combatientes, comportamientos, bandos,
+                                           max_rondas=escenario.max_rondas,
+                                           limite_historial=0)
+
+        resumen.repeticiones += 1
+        resumen.rondas_totales += estado.turno_actual
+        resumen.ataques_totales += estado.ataques_totales
+        if estado.combate_activo or estado.ganador is None:
+            resumen.sin_ganador += 1
+        else:
+            victorias[estado.ganador] += 1
+
+    resumen.victorias = dict(victorias)
+    return resumen
+
+
+def _ejecutar_tarea(tarea: Tuple[dict, List[int]]) -> ResumenEscenario:
+    """Ejecuta un bloque de repeticiones de un escenario serializado"""
+    datos, semillas = tarea
+    return ejecutar_escenario(Escenario.model_validate(datos), semillas)
+
+
+class EjecutorEscenarios:
+    """
+    Ejecuta lotes de escenarios JSON repartiendo las repeticiones en un
+    ProcessPoolExecutor. Las semillas de cada repetición se derivan de la
+    semilla del escenario, así que los resultados no dependen del número
+    de procesos.
+    """
+
+    def __init__(self, procesos: Optional[int] = None, repeticiones_por_tarea: int = 50):
+        """
+        Args:
+            procesos: Procesos del pool (None = CPUs disponibles, 1 = sin pool)
+            repeticiones_por_tarea: Repeticiones de un escenario por tarea enviada
+        """
+        self.procesos = procesos
+        self.repeticiones_por_tarea = repeticiones_por_tarea
+
+    def ejecutar(self, escenarios: Sequence[Escenario]) -> List[ResumenEscenario]:
+        """Ejecuta todos los escenarios y retorna un resumen por escenario"""
+        tareas, indices = [], []
+        for i, escenario in enumerate(escenarios):
+            datos = escenario.model_dump(mode='json')
+            semillas = derivar_semillas(escenario.semilla, escenario.repeticiones)
+            for k in range(0, len(semillas), self.repeticiones_por_tarea):
+                tareas.append((datos, semillas[k:k + self.repeticiones_por_tarea]))
+                indices.append(i)
+
+        if self.procesos == 1:
+            parciales = [_ejecutar_tarea(t) for t in tareas]
+        else:
+            with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                parciales = list(pool.map(_ejecutar_tarea, tareas))
+
+        resumenes = [ResumenEscenario(nombre=e.nombre) for e in escenarios]
+        for i, parcial in zip(indices, parciales):
+            resumenes[i].combinar(parcial)
+        return resumenes
+
+    def ejecutar_archivos(self, rutas: Sequence[str]) -> List[ResumenEscenario]:
+        """Carga y ejecuta escenarios desde archivos JSON (acepta directorios)"""
+        archivos: List[Path] = []
+        for ruta in map(Path, rutas):
+            archivos.extend(sorted(ruta.glob("*.json")) if ruta.is_dir() else [ruta])
+        return self.ejecutar([Escenario.cargar(str(a)) for a in archivos])
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    rutas = sys.argv[1:] or ["data/escenarios"]
+
+    inicio = time.perf_counter()
+    for resumen in EjecutorEscenarios().ejecutar_archivos(rutas):
+        print(resumen.resumen())
+    print(f"\n({time.perf_counter() - inicio:.2f}s)")
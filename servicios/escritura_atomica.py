@@ -0,0 +1,42 @@
+"""
+Escritura atómica de archivos.
+La usan los guardados (PersistenciaService) y la exportación del almacén
+SQLite: el destino tiene siempre el contenido anterior o el nuevo completo.
+"""
+import os
+from pathlib import Path
+
+
+def escribir_atomico(ruta: Path, contenido: bytes, sincronizar: bool = True):
+    """
+    Escribe en un temporal y lo renombra: nunca queda un archivo a medias.
+    Con sincronizar, el contenido y el renombre se llevan a disco (fsync)
+    antes de retornar, así el archivo sobrevive a un corte de energía.
+    """
+    temporal = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+            if sincronizar:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+    if sincronizar:
+        sincronizar_directorio(ruta.parent)
+
+
+def sincronizar_directorio(directorio: Path):
+    """fsync del directorio para que el renombre quede registrado (POSIX)"""
+    try:
+        descriptor = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return  # Windows no permite abrir directorios
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
@@ -2,10 +2,12 @@
 Estructuras de datos para el sistema de persistencia.
 Define el formato de guardado completo.
 """
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+from entidades import CONTEXTO_GUARDADO
 
 
 class TipoEvento(str, Enum):
@@ -148,7 +150,7 @@ class DatosPartida(BaseModel):
     # Metadata
     version: str = "1.0.0"
     timestamp: datetime = Field(default_factory=datetime.now)
-    slot: int = Field(ge=1, le=10, description="Slot de guardado (1-10)")
+    slot: int = Field(ge=1, description="Slot de guardado (1-10 en archivos, sin límite en SQLite)")
     
     # Info general
     nombre_partida: str
@@ -166,6 +168,10 @@ class DatosPartida(BaseModel):
     # Datos adicionales
     configuracion: Dict[str, Any] = Field(default_factory=dict)
     
+    def to_dict_guardado(self, **kwargs) -> Dict[str, Any]:
+        """Serializa la partida para guardado (JSON, objetos del catálogo como ID + deltas)"""
+        return self.model_dump(mode='json', context=CONTEXTO_GUARDADO, **kwargs)
+    
     def nombre_archivo(self) -> str:
         """Genera el nombre del archivo de guardado"""
         fecha = self.timestamp.strftime("%Y%m%d_%H%M%S")
@@ -207,6 +213,38 @@ class InfoSlot(BaseModel):
         )
 
 
+class EntradaManifiesto(BaseModel):
+    """Resumen de un slot en el manifiesto, con la firma del archivo resumido"""
+    info: InfoSlot
+    version: Optional[str] = None
+    mtime_ns: int
+    tamaño: int
+
+
+class ManifiestoSlots(BaseModel):
+    """
+    Índice de los slots de guardado.
+    Permite listar partidas sin abrir cada archivo; una entrada solo es
+    válida mientras el archivo del slot conserve su mtime y tamaño.
+    """
+    version_formato: int = 1
+    slots: Dict[int, EntradaManifiesto] = Field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class InstantaneaPartida:
+    """
+    Estado de una partida capturado para escribirlo más tarde.
+    Las secciones son datos JSON (dicts) desligados de los modelos, así que
+    el juego puede seguir modificando el personaje mientras se escribe.
+    Es un dataclass y no un modelo para no revalidar las secciones.
+    """
+    slot: int
+    metadata: Dict[str, Any]             # Campos de DatosPartida salvo las secciones
+    secciones: Dict[str, Dict[str, Any]]  # personaje, contexto y combate (no se modifican)
+    info: InfoSlot
+
+
 if __name__ == "__main__":
     print("=== Sistema de Estructuras de Persistencia ===\n")
     
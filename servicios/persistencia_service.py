@@ -3,34 +3,95 @@ Servicio de Persistencia - Gestión de guardado y carga de partidas.
 Implementa el patrón Singleton para garantizar un único gestor.
 """
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Set, Tuple
 from datetime import datetime, timedelta
-from entidades import Personaje
+from pydantic import BaseModel
+from entidades import Personaje, CONTEXTO_GUARDADO
 from patrones import SingletonMeta
 from .persistencia_estructuras import (
     DatosPartida, ContextoNarrativo, InfoSlot,
-    EstadoCombateGuardado
+    EstadoCombateGuardado, EntradaManifiesto, ManifiestoSlots, InstantaneaPartida
 )
+from .carga_confiable import adaptador
+from .codec_guardado import CODECS, leer_guardado, extensiones_guardado
+from .escritura_atomica import escribir_atomico
+
+
+# Secciones de un guardado que se serializan por separado
+SECCIONES = ("personaje", "contexto", "combate")
+
+
+class _PersonajeGuardado(BaseModel):
+    """Vista de un guardado que solo valida el personaje"""
+    personaje: Personaje
 
 
 class PersistenciaService(metaclass=SingletonMeta):
     """
     Servicio de persistencia con patrón Singleton.
     Gestiona guardado y carga de partidas en formato JSON.
+    
+    Cada guardado lleva un hash de integridad. Al cargar con confiable=True,
+    si el hash coincide, el archivo se parsea y valida en una sola pasada
+    (con el personaje incluido); si no coincide se usa la carga completa.
+    
+    Un manifiesto (manifiesto.json) resume cada slot para listar partidas
+    sin abrirlas. Se actualiza al guardar y eliminar, y si un slot cambió
+    por fuera del servicio su entrada se rehace sola.
+    
+    Los archivos se escriben en un temporal que se sincroniza a disco y se
+    renombra, así un corte a mitad de guardado no daña el slot. Cada sección
+    (personaje, contexto, combate) se serializa por separado y se recuerda
+    por slot. Los guardados son completos salvo que se pida incremental=True:
+    entonces solo se reserializan las secciones marcadas con
+    marcar_modificado (los cambios en el lugar no se detectan solos).
+    
+    Guardar tiene dos etapas: capturar (rápida, copia el estado) y escribir
+    (serializa y va a disco). escribir puede llamarse desde otro hilo; ver
+    AutoguardadoService.
+    
+    El formato de los archivos lo define un codec (ver codec_guardado),
+    elegido con Settings.formato_guardado. Cada codec usa su extensión
+    (slot_01.json, slot_01.ebs, ...). Se lee cualquier formato, así que
+    cambiar de codec no invalida los slots existentes; al volver a guardar
+    un slot se borra su archivo del formato anterior.
     """
     
-    def __init__(self, directorio_guardados: str = "guardados"):
+    def __init__(self, directorio_guardados: str = "guardados",
+                 formato: Optional[str] = None):
         """
         Args:
             directorio_guardados: Directorio donde se almacenan las partidas
+            formato: Codec de escritura ("json", "compacto", "zlib");
+                     None = Settings.formato_guardado
         """
         self.directorio = Path(directorio_guardados)
         self.directorio.mkdir(exist_ok=True)
         
+        if formato is None:
+            from config import settings
+            formato = settings.formato_guardado
+        self.codec = CODECS.crear(formato)
+        # La del codec configurado primero: es la que se busca antes
+        self._extensiones = [self.codec.extension] + [
+            extension for extension in extensiones_guardado() if extension != self.codec.extension
+        ]
+        
         # Tracking de tiempo de juego
         self._tiempo_inicio: Optional[datetime] = None
         self._tiempo_acumulado: timedelta = timedelta()
+        
+        # Por (slot, sección): última captura (objeto de origen, datos JSON)
+        self._capturas: Dict[Tuple[int, str], Tuple[Any, Dict[str, Any]]] = {}
+        # Secciones marcadas como modificadas, por slot
+        self._modificadas: Dict[int, Set[str]] = {}
+        # Por (slot, sección): última serialización (datos capturados, fragmento)
+        self._fragmentos: Dict[Tuple[int, str], Tuple[Dict[str, Any], str]] = {}
+        # Protege escrituras, fragmentos y manifiesto entre hilos
+        self._lock = threading.RLock()
     
     # ========================================================================
     # Guardado de partidas
@@ -41,7 +102,9 @@ class PersistenciaService(metaclass=SingletonMeta):
         personaje: Personaje,
         contexto: ContextoNarrativo,
         slot: int = 1,
-        nombre_partida: Optional[str] = None
+        nombre_partida: Optional[str] = None,
+        combate: Optional[EstadoCombateGuardado] = None,
+        incremental: bool = False
     ) -> Path:
         """
         Guarda una partida completa en un slot.
@@ -51,6 +114,9 @@ class PersistenciaService(metaclass=SingletonMeta):
             contexto: Contexto narrativo
             slot: Número de slot (1-10)
             nombre_partida: Nombre descriptivo de la partida
+            combate: Estado de combate (None = fuera de combate)
+            incremental: Reutilizar las secciones del slot no marcadas como
+                         modificadas (ver marcar_modificado)
         
         Returns:
             Path del archivo guardado
@@ -58,58 +124,137 @@ class PersistenciaService(metaclass=SingletonMeta):
         Raises:
             ValueError: Si el slot es inválido
         """
+        return self.escribir(self.capturar(
+            personaje, contexto, slot, nombre_partida, combate, incremental
+        ))
+    
+    def capturar(
+        self,
+        personaje: Personaje,
+        contexto: ContextoNarrativo,
+        slot: int = 1,
+        nombre_partida: Optional[str] = None,
+        combate: Optional[EstadoCombateGuardado] = None,
+        incremental: bool = False
+    ) -> InstantaneaPartida:
+        """
+        Captura el estado a guardar sin serializarlo ni escribirlo.
+        Con incremental, las secciones del slot no marcadas reutilizan la
+        captura anterior. Los argumentos son los de guardar_partida.
+        """
         if not 1 <= slot <= 10:
             raise ValueError("El slot debe estar entre 1 y 10")
         
-        # Preparar datos de partida
-        datos = DatosPartida(
+        # Metadata (las secciones se capturan aparte)
+        cabecera = DatosPartida.model_construct(
             slot=slot,
             nombre_partida=nombre_partida or f"Partida de {personaje.nombre}",
-            tiempo_jugado=self._formatear_tiempo_jugado(),
-            personaje=personaje.to_dict_guardado(),
-            contexto=contexto,
-            combate=EstadoCombateGuardado()  # TODO: Integrar con CombateService
+            tiempo_jugado=self._formatear_tiempo_jugado()
         )
+        objetos = {
+            "personaje": personaje,
+            "contexto": contexto,
+            "combate": combate or EstadoCombateGuardado()  # TODO: Integrar con CombateService
+        }
+        secciones = {
+            seccion: self._capturar_seccion(slot, seccion, objetos[seccion], incremental)
+            for seccion in SECCIONES
+        }
+        self._modificadas.pop(slot, None)
+        
+        info = InfoSlot(
+            slot=slot,
+            existe=True,
+            nombre_personaje=personaje.nombre,
+            nivel=personaje.nivel,
+            ubicacion=contexto.ubicacion_actual,
+            timestamp=cabecera.timestamp,
+            tiempo_jugado=cabecera.tiempo_jugado
+        )
+        return InstantaneaPartida(
+            slot=slot,
+            metadata=cabecera.to_dict_guardado(exclude=set(SECCIONES)),
+            secciones=secciones,
+            info=info
+        )
+    
+    def escribir(self, instantanea: InstantaneaPartida) -> Path:
+        """
+        Serializa y escribe una captura en su slot (de forma atómica) y
+        actualiza el manifiesto. Se puede llamar desde cualquier hilo.
         
-        # Determinar nombre de archivo
-        archivo = self._obtener_ruta_slot(slot)
-        
-        # Guardar como JSON
-        with open(archivo, 'w', encoding='utf-8') as f:
-            json.dump(
-                datos.model_dump(mode='json'),
-                f,
-                ensure_ascii=False,
-                indent=2,
-                default=str  # Para datetime
+        Returns:
+            Path del archivo guardado
+        """
+        with self._lock:
+            fragmentos = {
+                campo: self._fragmento_seccion(instantanea.slot, campo, instantanea.secciones[campo])
+                if campo in instantanea.secciones else self.codec.fragmento(instantanea.metadata[campo])
+                for campo in DatosPartida.model_fields
+            }
+            
+            # Guardar con el codec configurado (incluye el hash de integridad)
+            version = instantanea.metadata['version']
+            archivo = self._obtener_ruta_slot(instantanea.slot)
+            escribir_atomico(archivo, self.codec.armar(fragmentos, version))
+            for anterior in self._rutas_slot(instantanea.slot)[1:]:
+                anterior.unlink(missing_ok=True)
+            
+            manifiesto = self._leer_manifiesto()
+            manifiesto.slots[instantanea.slot] = self._entrada_manifiesto(
+                instantanea.info, version, archivo.stat()
             )
+            self._escribir_manifiesto(manifiesto)
         
         return archivo
     
+    def marcar_modificado(self, *secciones: str, slot: Optional[int] = None):
+        """
+        Marca secciones del estado de juego como modificadas desde el último
+        guardado (sin argumentos, todas). El próximo guardado incremental del
+        slot las vuelve a capturar y serializar; el resto se copia del anterior.
+        
+        Args:
+            secciones: "personaje", "contexto" y/o "combate"
+            slot: Slot afectado (None = todos)
+        """
+        desconocidas = set(secciones) - set(SECCIONES)
+        if desconocidas:
+            raise ValueError(f"Secciones desconocidas: {sorted(desconocidas)}")
+        slots = [slot] if slot is not None else {slot for slot, _ in self._capturas}
+        for marcado in slots:
+            self._modificadas.setdefault(marcado, set()).update(secciones or SECCIONES)
+    
     def autoguardar(
         self,
         personaje: Personaje,
         contexto: ContextoNarrativo,
-        slot: int = 1
+        slot: int = 1,
+        combate: Optional[EstadoCombateGuardado] = None,
+        incremental: bool = False
     ) -> Path:
         """
         Realiza un guardado automático.
-        Alias de guardar_partida con logging.
+        Por defecto captura todas las secciones. Con incremental=True solo
+        reserializa las marcadas con marcar_modificado (o cuyos objetos no son
+        los del guardado anterior del slot): quien lo pide debe marcar cada
+        cambio. No escribe en consola: para avisar al jugador usar
+        AutoguardadoService y su EventBus.
         """
-        archivo = self.guardar_partida(personaje, contexto, slot)
-        print(f"💾 Autoguardado en slot {slot}")
-        return archivo
+        return self.guardar_partida(personaje, contexto, slot, combate=combate,
+                                    incremental=incremental)
     
     # ========================================================================
     # Carga de partidas
     # ========================================================================
     
-    def cargar_partida(self, slot: int) -> DatosPartida:
+    def cargar_partida(self, slot: int, confiable: bool = False) -> DatosPartida:
         """
         Carga una partida desde un slot.
         
         Args:
             slot: Número de slot a cargar
+            confiable: Cargar por el camino rápido si el hash de integridad coincide
         
         Returns:
             Datos completos de la partida
@@ -118,21 +263,30 @@ class PersistenciaService(metaclass=SingletonMeta):
             FileNotFoundError: Si el slot está vacío
             ValueError: Si el slot es inválido o los datos están corruptos
         """
+        return self._cargar(slot, DatosPartida, confiable)
+    
+    def _cargar(self, slot: int, tipo: type, confiable: bool):
+        """
+        Carga el slot como `tipo`. Si es confiable y el hash coincide, se
+        parsea y valida en una sola pasada; si no, se carga la partida completa.
+        """
         if not 1 <= slot <= 10:
             raise ValueError("El slot debe estar entre 1 y 10")
         
-        archivo = self._obtener_ruta_slot(slot)
+        archivo = self._buscar_archivo_slot(slot)
         
-        if not archivo.exists():
+        if archivo is None:
             raise FileNotFoundError(f"El slot {slot} está vacío")
         
         try:
-            with open(archivo, 'r', encoding='utf-8') as f:
-                datos_raw = json.load(f)
+            leido = leer_guardado(archivo.read_bytes())
+            if confiable and leido.verificado:
+                return adaptador(tipo).validate_json(leido.cuerpo)
             
             # Validar y parsear con Pydantic
-            datos = DatosPartida.model_validate(datos_raw)
-            
+            datos = DatosPartida.model_validate(json.loads(leido.cuerpo))
+            if tipo is _PersonajeGuardado:
+                return _PersonajeGuardado(personaje=Personaje.from_dict_guardado(datos.personaje))
             return datos
             
         except json.JSONDecodeError as e:
@@ -140,31 +294,31 @@ class PersistenciaService(metaclass=SingletonMeta):
         except Exception as e:
             raise ValueError(f"Error al cargar slot {slot}: {e}")
     
-    def cargar_personaje(self, slot: int) -> Personaje:
+    def cargar_personaje(self, slot: int, confiable: bool = False) -> Personaje:
         """
         Carga solo el personaje desde un slot.
         
         Args:
             slot: Número de slot
+            confiable: Cargar por el camino rápido si el hash de integridad coincide
         
         Returns:
             Personaje restaurado
         """
-        datos = self.cargar_partida(slot)
-        personaje = Personaje.from_dict_guardado(datos.personaje)
-        return personaje
+        return self._cargar(slot, _PersonajeGuardado, confiable).personaje
     
-    def cargar_contexto(self, slot: int) -> ContextoNarrativo:
+    def cargar_contexto(self, slot: int, confiable: bool = False) -> ContextoNarrativo:
         """
         Carga solo el contexto narrativo desde un slot.
         
         Args:
             slot: Número de slot
+            confiable: Cargar por el camino rápido si el hash de integridad coincide
         
         Returns:
             Contexto narrativo restaurado
         """
-        datos = self.cargar_partida(slot)
+        datos = self.cargar_partida(slot, confiable)
         return datos.contexto
     
     # ========================================================================
@@ -178,37 +332,16 @@ class PersistenciaService(metaclass=SingletonMeta):
         Returns:
             Lista con información de cada slot (vacíos y ocupados)
         """
-        slots = []
-        
-        for slot_num in range(1, 11):
-            archivo = self._obtener_ruta_slot(slot_num)
-            
-            if archivo.exists():
-                try:
-                    datos = self.cargar_partida(slot_num)
-                    info = InfoSlot(
-                        slot=slot_num,
-                        existe=True,
-                        nombre_personaje=datos.personaje.get('nombre'),
-                        nivel=datos.personaje.get('nivel'),
-                        ubicacion=datos.contexto.ubicacion_actual,
-                        timestamp=datos.timestamp,
-                        tiempo_jugado=datos.tiempo_jugado
-                    )
-                except Exception:
-                    # Slot corrupto, marcarlo como vacío
-                    info = InfoSlot(slot=slot_num, existe=False)
-            else:
-                info = InfoSlot(slot=slot_num, existe=False)
-            
-            slots.append(info)
-        
-        return slots
+        manifiesto = self._manifiesto_vigente()
+        return [
+            manifiesto.slots[slot_num].info if slot_num in manifiesto.slots
+            else InfoSlot(slot=slot_num, existe=False)
+            for slot_num in range(1, 11)
+        ]
     
     def existe_partida(self, slot: int) -> bool:
-        """Verifica si existe una partida en el slot"""
-        archivo = self._obtener_ruta_slot(slot)
-        return archivo.exists()
+        """Verifica si existe una partida en el slot (en cualquier formato)"""
+        return self._buscar_archivo_slot(slot) is not None
     
     def eliminar_partida(self, slot: int) -> bool:
         """
@@ -220,11 +353,15 @@ class PersistenciaService(metaclass=SingletonMeta):
         Returns:
             True si se eliminó, False si no existía
         """
-        archivo = self._obtener_ruta_slot(slot)
-        
-        if archivo.exists():
-            archivo.unlink()
-            return True
+        with self._lock:
+            archivos = [ruta for ruta in self._rutas_slot(slot) if ruta.exists()]
+            for archivo in archivos:
+                archivo.unlink()
+            if archivos:
+                manifiesto = self._leer_manifiesto()
+                if manifiesto.slots.pop(slot, None) is not None:
+                    self._escribir_manifiesto(manifiesto)
+                return True
         
         return False
     
@@ -265,8 +402,128 @@ class PersistenciaService(metaclass=SingletonMeta):
     # ========================================================================
     
     def _obtener_ruta_slot(self, slot: int) -> Path:
-        """Obtiene la ruta del archivo de un slot"""
-        return self.directorio / f"slot_{slot:02d}.json"
+        """Ruta donde el codec configurado escribe un slot"""
+        return self.directorio / f"slot_{slot:02d}{self.codec.extension}"
+    
+    def _rutas_slot(self, slot: int) -> List[Path]:
+        """Rutas posibles de un slot, una por formato (la del codec configurado primero)"""
+        return [self.directorio / f"slot_{slot:02d}{extension}" for extension in self._extensiones]
+    
+    def _buscar_archivo_slot(self, slot: int, nombres: Optional[Set[str]] = None) -> Optional[Path]:
+        """
+        Archivo existente de un slot en cualquier formato (p. ej. un .json
+        previo al cambio de codec). Con `nombres` (listado del directorio)
+        no se consulta el disco.
+        """
+        for ruta in self._rutas_slot(slot):
+            existe = ruta.exists() if nombres is None else ruta.name in nombres
+            if existe:
+                return ruta
+        return None
+    
+    def _capturar_seccion(self, slot: int, seccion: str, objeto: Any,
+                          incremental: bool) -> Dict[str, Any]:
+        """Datos JSON de una sección, reutilizados si es incremental y no se marcó"""
+        anterior = self._capturas.get((slot, seccion))
+        if (incremental and seccion not in self._modificadas.get(slot, ())
+                and anterior is not None and anterior[0] is objeto):
+            return anterior[1]
+        
+        if seccion == "personaje":
+            datos = objeto.to_dict_guardado()
+        else:
+            datos = objeto.model_dump(mode='json', context=CONTEXTO_GUARDADO)
+        self._capturas[(slot, seccion)] = (objeto, datos)
+        return datos
+    
+    def _fragmento_seccion(self, slot: int, seccion: str, datos: Dict[str, Any]) -> str:
+        """Fragmento serializado de una sección, reutilizado si es la misma captura"""
+        anterior = self._fragmentos.get((slot, seccion))
+        if anterior is not None and anterior[0] is datos:
+            return anterior[1]
+        
+        fragmento = self.codec.fragmento(datos)
+        self._fragmentos[(slot, seccion)] = (datos, fragmento)
+        return fragmento
+    
+    # ========================================================================
+    # Manifiesto de slots
+    # ========================================================================
+    
+    def _ruta_manifiesto(self) -> Path:
+        return self.directorio / "manifiesto.json"
+    
+    def _leer_manifiesto(self) -> ManifiestoSlots:
+        """Lee el manifiesto; si falta o está dañado se empieza de cero"""
+        try:
+            manifiesto = ManifiestoSlots.model_validate_json(self._ruta_manifiesto().read_bytes())
+        except (OSError, ValueError):
+            return ManifiestoSlots()
+        return manifiesto if manifiesto.version_formato == ManifiestoSlots().version_formato \
+            else ManifiestoSlots()
+    
+    def _escribir_manifiesto(self, manifiesto: ManifiestoSlots):
+        # Sin fsync: si se pierde, se reconstruye desde los slots
+        escribir_atomico(self._ruta_manifiesto(), manifiesto.model_dump_json().encode('utf-8'),
+                         sincronizar=False)
+    
+    def _entrada_manifiesto(self, info: InfoSlot, version: Optional[str],
+                            estado: os.stat_result) -> EntradaManifiesto:
+        """Entrada del manifiesto con la firma (mtime, tamaño) del archivo"""
+        return EntradaManifiesto(
+            info=info,
+            version=version,
+            mtime_ns=estado.st_mtime_ns,
+            tamaño=estado.st_size
+        )
+    
+    def _manifiesto_vigente(self) -> ManifiestoSlots:
+        """
+        Manifiesto con las entradas verificadas contra los archivos (un
+        listado del directorio y un stat por slot ocupado). Solo se abren
+        los slots que cambiaron desde su entrada.
+        """
+        with self._lock:
+            manifiesto = self._leer_manifiesto()
+            cambiado = False
+            nombres = set(os.listdir(self.directorio))
+            
+            for slot in range(1, 11):
+                archivo = self._buscar_archivo_slot(slot, nombres)
+                try:
+                    if archivo is None:
+                        raise FileNotFoundError(slot)
+                    estado = archivo.stat()
+                except FileNotFoundError:
+                    cambiado |= manifiesto.slots.pop(slot, None) is not None
+                    continue
+            
+                entrada = manifiesto.slots.get(slot)
+                if (entrada is not None and entrada.mtime_ns == estado.st_mtime_ns
+                        and entrada.tamaño == estado.st_size):
+                    continue
+            
+                try:
+                    datos = self.cargar_partida(slot, confiable=True)
+                    info = InfoSlot(
+                        slot=slot,
+                        existe=True,
+                        nombre_personaje=datos.personaje.get('nombre'),
+                        nivel=datos.personaje.get('nivel'),
+                        ubicacion=datos.contexto.ubicacion_actual,
+                        timestamp=datos.timestamp,
+                        tiempo_jugado=datos.tiempo_jugado
+                    )
+                    version = datos.version
+                except Exception:
+                    # Slot corrupto: se lista como vacío
+                    info, version = InfoSlot(slot=slot, existe=False), None
+                manifiesto.slots[slot] = self._entrada_manifiesto(info, version, estado)
+                cambiado = True
+            
+            if cambiado:
+                self._escribir_manifiesto(manifiesto)
+            return manifiesto
     
     # ========================================================================
     # Validación e integridad
@@ -281,7 +538,23 @@ class PersistenciaService(metaclass=SingletonMeta):
         
         Returns:
             (es_valido, mensaje_error)
+        
+        Si el hash de integridad coincide, el archivo es el que escribió el
+        servicio y los datos se toman del manifiesto sin volver a validarlo.
         """
+        archivo = self._buscar_archivo_slot(slot)
+        try:
+            if archivo is not None and leer_guardado(archivo.read_bytes()).verificado:
+                entrada = self._manifiesto_vigente().slots.get(slot)
+                if entrada is not None and entrada.info.existe:
+                    if not entrada.info.nombre_personaje:
+                        return False, "Datos de personaje incompletos"
+                    if entrada.version != "1.0.0":
+                        return False, f"Versión incompatible: {entrada.version}"
+                    return True, None
+        except (OSError, ValueError):
+            pass
+        
         try:
             datos = self.cargar_partida(slot)
             
@@ -0,0 +1,173 @@
+"""
+Planificador de turnos de combate basado en una cola de prioridad.
+Permite re-tirar la iniciativa cada ronda, agregar o quitar combatientes
+en O(log n) y turnos extra por velocidad, sin recorrer la lista completa.
+"""
+import heapq
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Turno:
+    """Un turno asignado por el planificador"""
+    nombre: str
+    ronda: int
+    accion: int  # Índice de la acción dentro de la ronda (0 = primera)
+    iniciativa: int
+
+
+# Entrada del heap: (tiempo, -iniciativa, secuencia, nombre, ronda, accion)
+_Entrada = Tuple[float, int, int, str, int, int]
+
+
+@dataclass
+class _Participante:
+    iniciativa: int
+    acciones_por_ronda: int
+    pendiente: Optional[_Entrada] = None  # Única entrada vigente en el heap
+
+
+class PlanificadorTurnos:
+    """
+    Cola de turnos ordenada por (momento de la ronda, iniciativa).
+
+    Un combatiente con N acciones por ronda actúa en los momentos
+    ronda + k/N, así que los turnos extra se intercalan con los del resto.
+    Quitar a alguien solo invalida sus entradas; se descartan al salir
+    del heap, igual que las de quien ya no está en condiciones de combatir.
+    """
+
+    def __init__(self, tirar_iniciativa: Optional[Callable[[str], int]] = None,
+                 puede_actuar: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            tirar_iniciativa: nombre -> nueva iniciativa. Si se indica, la
+                iniciativa se vuelve a tirar al comienzo de cada ronda
+            puede_actuar: nombre -> si sigue en condiciones de combatir.
+                Quien no puede actuar se quita al llegar su turno
+        """
+        self._tirar_iniciativa = tirar_iniciativa
+        self._puede_actuar = puede_actuar
+        self._heap: List[_Entrada] = []
+        self._participantes: Dict[str, _Participante] = {}
+        self._secuencia = 0
+        self._obsoletas = 0
+        self.tiempo = 0.0  # Momento del último turno entregado
+
+    def __len__(self) -> int:
+        return len(self._participantes)
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self._participantes
+
+    @property
+    def ronda_actual(self) -> int:
+        return int(self.tiempo)
+
+    def agregar(self, nombre: str, iniciativa: int, acciones_por_ronda: int = 1,
+                ronda: Optional[int] = None):
+        """
+        Agrega un combatiente en O(log n).
+
+        Args:
+            nombre: Identificador del combatiente
+            iniciativa: Iniciativa inicial (mayor actúa antes)
+            acciones_por_ronda: Turnos por ronda (velocidad)
+            ronda: Primera ronda en que actúa (None = la actual)
+        """
+        if acciones_por_ronda < 1:
+            raise ValueError("acciones_por_ronda debe ser >= 1")
+        if nombre in self._participantes:
+            raise ValueError(f"{nombre} ya está en el planificador")
+
+        participante = _Participante(iniciativa, acciones_por_ronda)
+        self._participantes[nombre] = participante
+
+        inicio = self.ronda_actual if ronda is None else max(ronda, self.ronda_actual)
+        self._programar(nombre, participante, max(float(inicio), self.tiempo), inicio, 0)
+
+    def quitar(self, nombre: str) -> bool:
+        """Quita a un combatiente en O(1); sus entradas quedan obsoletas"""
+        if self._participantes.pop(nombre, None) is None:
+            return False
+        self._obsoletas += 1
+        self._compactar_si_conviene()
+        return True
+
+    def cambiar_iniciativa(self, nombre: str, iniciativa: int):
+        """Cambia la iniciativa del próximo turno del combatiente en O(log n)"""
+        self._reprogramar(nombre, iniciativa)
+
+    def cambiar_velocidad(self, nombre: str, acciones_por_ronda: int):
+        """Cambia las acciones por ronda a partir de la próxima ronda"""
+        if acciones_por_ronda < 1:
+            raise ValueError("acciones_por_ronda debe ser >= 1")
+        self._participantes[nombre].acciones_por_ronda = acciones_por_ronda
+
+    def siguiente(self) -> Optional[Turno]:
+        """
+        Entrega el próximo turno y programa el siguiente de ese combatiente.
+        Retorna None si no queda nadie.
+        """
+        while self._heap:
+            entrada = heapq.heappop(self._heap)
+            tiempo, _, _, nombre, ronda, accion = entrada
+            participante = self._participantes.get(nombre)
+
+            if participante is None or participante.pendiente is not entrada:
+                self._obsoletas -= 1
+                continue
+            if self._puede_actuar is not None and not self._puede_actuar(nombre):
+                del self._participantes[nombre]
+                continue
+
+            self.tiempo = tiempo
+            turno = Turno(nombre, ronda, accion, participante.iniciativa)
+
+            if accion + 1 < participante.acciones_por_ronda:
+                self._programar(nombre, participante,
+                                ronda + (accion + 1) / participante.acciones_por_ronda,
+                                ronda, accion + 1)
+            else:
+                if self._tirar_iniciativa is not None:
+                    participante.iniciativa = self._tirar_iniciativa(nombre)
+                self._programar(nombre, participante, float(ronda + 1), ronda + 1, 0)
+
+            return turno
+
+        return None
+
+    def orden_previsto(self) -> List[str]:
+        """Nombres en el orden de sus próximos turnos (O(n log n), para mostrar)"""
+        return [e[3] for e in sorted(p.pendiente for p in self._participantes.values())]
+
+    # ========================================================================
+    # Internos
+    # ========================================================================
+
+    def _programar(self, nombre: str, participante: _Participante,
+                   tiempo: float, ronda: int, accion: int):
+        self._secuencia += 1
+        entrada = (tiempo, -participante.iniciativa, self._secuencia, nombre, ronda, accion)
+        participante.pendiente = entrada
+        heapq.heappush(self._heap, entrada)
+
+    def _reprogramar(self, nombre: str, iniciativa: int):
+        """Invalida la entrada pendiente y la vuelve a programar con otra iniciativa"""
+        participante = self._participantes[nombre]
+        if participante.iniciativa == iniciativa:
+            return
+
+        participante.iniciativa = iniciativa
+        tiempo, _, _, _, ronda, accion = participante.pendiente
+        self._obsoletas += 1
+        self._programar(nombre, participante, tiempo, ronda, accion)
+        self._compactar_si_conviene()
+
+    def _compactar_si_conviene(self):
+        """Reconstruye el heap cuando la mitad de las entradas son obsoletas"""
+        if self._obsoletas * 2 > len(self._heap) and self._obsoletas > 16:
+            self._heap = [p.pendiente for p in self._participantes.values()]
+            heapq.heapify(self._heap)
+            self._obsoletas = 0
@@ -0,0 +1,373 @@
+"""
+Registro compacto de combates y reproducción determinista.
+
+El registro guarda la semilla, cada dado tirado (dos bytes por dado) y un
+struct de tamaño fijo por ataque, en lugar de un ResultadoAtaque por
+intercambio. Puede volcarse a disco a medida que se escribe, y a partir
+de él ReproductorCombate reconstruye cualquier EstadoCombate intermedio.
+"""
+import random
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from entidades import Personaje
+from patrones import EventBus
+from .combate_estructuras import ResultadoAtaque, TipoResultadoAtaque, EstadoCombate
+
+
+# Códigos de un byte para acciones y resultados
+ACCIONES = ("ataque", "sigilo")
+CODIGOS_RESULTADO: Tuple[TipoResultadoAtaque, ...] = tuple(TipoResultadoAtaque)
+
+_MAGIA = b"EBRC"
+_VERSION = 2
+# Tipo de array de los dados según la versión del formato (la 1 usaba un byte)
+_TIPO_DADOS = {1: "B", 2: "H"}
+_CABECERA = struct.Struct("<4sBBQH")  # magia, versión, tiene_semilla, semilla, n_nombres
+_BLOQUE = struct.Struct("<BH")        # tipo de bloque, tamaño
+_ATAQUE = struct.Struct("<HHHBBHII")  # ronda, atacante, defensor, acción, código, daño, dados
+_BLOQUE_DADOS, _BLOQUE_ATAQUE = 0, 1
+
+
+class AtaqueRegistrado(NamedTuple):
+    """Un ataque del registro (los índices refieren a RegistroCombate.nombres)"""
+    ronda: int
+    atacante: int
+    defensor: int
+    accion: int
+    codigo: int
+    daño: int
+    inicio_dados: int  # Dados tirados en el ataque: dados[inicio_dados:fin_dados]
+    fin_dados: int
+
+    @property
+    def tipo(self) -> TipoResultadoAtaque:
+        return CODIGOS_RESULTADO[self.codigo]
+
+
+class RegistroCombate:
+    """
+    Registro append-only de un combate.
+
+    En memoria ocupa dos bytes por dado (valores de 0 a 65535) y 18 bytes
+    por ataque. Con ruta, cada
+    ataque se escribe al archivo en cuanto ocurre; con guardar_en_memoria=False
+    además no se retiene, así que combates y simulaciones largas no crecen
+    sin límite.
+    """
+
+    def __init__(self, semilla: Optional[int] = None, ruta: Optional[str] = None,
+                 guardar_en_memoria: bool = True):
+        """
+        Args:
+            semilla: Semilla del generador del combate (None = desconocida)
+            ruta: Archivo al que volcar el registro a medida que se escribe
+            guardar_en_memoria: Si además se conserva en memoria
+        """
+        if ruta is None and not guardar_en_memoria:
+            raise ValueError("Sin ruta, el registro debe guardarse en memoria")
+
+        self.semilla = semilla
+        self.nombres: List[str] = []
+        self.dados = array(_TIPO_DADOS[_VERSION])
+        self.total_dados = 0
+        self._ataques = bytearray()
+        self._total_ataques = 0
+        self._indices: Dict[str, int] = {}
+        self._guardar_en_memoria = guardar_en_memoria
+
+        self._ruta = Path(ruta) if ruta else None
+        self._archivo: Optional[BinaryIO] = None
+        self._dados_pendientes = array(_TIPO_DADOS[_VERSION])  # Aún no volcados al archivo
+
+    # ========================================================================
+    # Escritura
+    # ========================================================================
+
+    def iniciar(self, nombres: Sequence[str]):
+        """Fija los participantes (en el orden en que se pasaron a iniciar_combate)"""
+        if self.nombres:
+            raise ValueError("El registro ya fue iniciado")
+        self.nombres = list(nombres)
+        self._indices = {n: i for i, n in enumerate(self.nombres)}
+        if self._ruta:
+            self._archivo = open(self._ruta, "wb")
+            self._archivo.write(_cabecera(self.semilla, self.nombres))
+
+    def registrar_dado(self, valor: int):
+        """
+        Agrega un dado tirado (en el orden de consumo).
+
+        Raises:
+            ValueError: Si el valor no entra en el registro (0 a 65535)
+        """
+        if not 0 <= valor <= 0xFFFF:
+            raise ValueError(f"Dado {valor} fuera del rango que admite el registro (0 a 65535)")
+        self.total_dados += 1
+        if self._guardar_en_memoria:
+            self.dados.append(valor)
+        if self._archivo:
+            self._dados_pendientes.append(valor)
+
+    def registrar_ataque(self, ronda: int, atacante: str, defensor: str, accion: str,
+                         resultado: ResultadoAtaque, inicio_dados: int):
+        """
+        Agrega un ataque con su resultado.
+
+        Args:
+            inicio_dados: total_dados antes de resolver el ataque
+        """
+        empaquetado = _ATAQUE.pack(
+            min(ronda, 0xFFFF), self._indices[atacante], self._indices[defensor],
+            ACCIONES.index(accion), CODIGOS_RESULTADO.index(resultado.tipo),
+            min(resultado.daño_infligido, 0xFFFF), inicio_dados, self.total_dados
+        )
+        self._total_ataques += 1
+
+        if self._guardar_en_memoria:
+            self._ataques += empaquetado
+        if self._archivo:
+            self._escribir_dados_pendientes()
+            self._archivo.write(_BLOQUE.pack(_BLOQUE_ATAQUE, len(empaquetado)) + empaquetado)
+
+    def cerrar(self):
+        """Vuelca lo pendiente y cierra el archivo (si hay)"""
+        if self._archivo:
+            self._escribir_dados_pendientes()
+            self._archivo.close()
+            self._archivo = None
+
+    def __enter__(self) -> "RegistroCombate":
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    # ========================================================================
+    # Lectura
+    # ========================================================================
+
+    def __len__(self) -> int:
+        return self._total_ataques
+
+    def __getitem__(self, i: int) -> AtaqueRegistrado:
+        if not self._guardar_en_memoria:
+            raise ValueError("El registro no se guarda en memoria; usar RegistroCombate.cargar")
+        if i < 0:
+            i += self._total_ataques
+        if not 0 <= i < self._total_ataques:
+            raise IndexError(i)
+        return AtaqueRegistrado(*_ATAQUE.unpack_from(self._ataques, i * _ATAQUE.size))
+
+    def __iter__(self) -> Iterator[AtaqueRegistrado]:
+        return (self[i] for i in range(len(self)))
+
+    def tamaño_bytes(self) -> int:
+        """Memoria ocupada por los datos del registro"""
+        return len(self.dados) * self.dados.itemsize + len(self._ataques)
+
+    def guardar(self, ruta: str) -> Path:
+        """Escribe el registro completo en un archivo"""
+        archivo = Path(ruta)
+        with open(archivo, "wb") as f:
+            f.write(_cabecera(self.semilla, self.nombres))
+            escritos = 0
+            for ataque in self:
+                _escribir_dados(f, self.dados[escritos:ataque.fin_dados])
+                escritos = ataque.fin_dados
+                f.write(_BLOQUE.pack(_BLOQUE_ATAQUE, _ATAQUE.size) + _ATAQUE.pack(*ataque))
+            _escribir_dados(f, self.dados[escritos:])
+        return archivo
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "RegistroCombate":
+        """Lee un registro escrito con guardar() o volcado durante el combate"""
+        datos = Path(ruta).read_bytes()
+        magia, version, tiene_semilla, semilla, n_nombres = _CABECERA.unpack_from(datos)
+        if magia != _MAGIA or version not in _TIPO_DADOS:
+            raise ValueError(f"{ruta} no es un registro de combate válido")
+
+        registro = cls(semilla if tiene_semilla else None)
+        posicion = _CABECERA.size
+        nombres = []
+        for _ in range(n_nombres):
+            (largo,) = struct.unpack_from("<H", datos, posicion)
+            posicion += 2
+            nombres.append(datos[posicion:posicion + largo].decode("utf-8"))
+            posicion += largo
+        registro.iniciar(nombres)
+
+        while posicion < len(datos):
+            tipo, tamaño = _BLOQUE.unpack_from(datos, posicion)
+            posicion += _BLOQUE.size
+            contenido = datos[posicion:posicion + tamaño]
+            posicion += tamaño
+
+            if tipo == _BLOQUE_DADOS:
+                dados = _leer_dados(contenido, _TIPO_DADOS[version])
+                registro.dados.extend(dados)
+                registro.total_dados += len(dados)
+            else:
+                registro._ataques += contenido
+                registro._total_ataques += 1
+
+        return registro
+
+    def _escribir_dados_pendientes(self):
+        _escribir_dados(self._archivo, self._dados_pendientes)
+        self._dados_pendientes = array(_TIPO_DADOS[_VERSION])
+
+
+def _cabecera(semilla: Optional[int], nombres: Sequence[str]) -> bytes:
+    partes = [_CABECERA.pack(_MAGIA, _VERSION, semilla is not None, semilla or 0, len(nombres))]
+    for nombre in nombres:
+        codificado = nombre.encode("utf-8")
+        partes.append(struct.pack("<H", len(codificado)) + codificado)
+    return b"".join(partes)
+
+
+def _escribir_dados(archivo: BinaryIO, dados: array):
+    """Escribe dados (little-endian) en bloques de hasta 65535 bytes"""
+    por_bloque = 0xFFFF // dados.itemsize
+    for k in range(0, len(dados), por_bloque):
+        trozo = dados[k:k + por_bloque]
+        if sys.byteorder == "big":
+            trozo.byteswap()
+        trozo = trozo.tobytes()
+        archivo.write(_BLOQUE.pack(_BLOQUE_DADOS, len(trozo)) + trozo)
+
+
+def _leer_dados(contenido: bytes, tipo: str) -> array:
+    """Dados de un bloque escrito con _escribir_dados"""
+    dados = array(tipo, contenido)
+    if sys.byteorder == "big":
+        dados.byteswap()
+    return dados
+
+
+# ============================================================================
+# Generadores
+# ============================================================================
+
+class GeneradorRegistrado:
+    """
+    Envuelve un stream aleatorio y anota en el registro cada valor entregado
+    por randint (la única operación que usan las tiradas de dados).
+    """
+
+    def __init__(self, base: Optional[random.Random], registro: RegistroCombate):
+        self._base = base or random.Random()
+        self._registro = registro
+
+    def randint(self, a: int, b: int) -> int:
+        valor = self._base.randint(a, b)
+        self._registro.registrar_dado(valor)
+        return valor
+
+    def __getattr__(self, nombre):
+        if nombre.startswith("_"):
+            raise AttributeError(nombre)
+        return getattr(self._base, nombre)
+
+
+class GeneradorReproduccion:
+    """Entrega los dados de un registro en el mismo orden en que se tiraron"""
+
+    def __init__(self, dados: Sequence[int]):
+        self._dados = dados
+        self.posicion = 0
+
+    def randint(self, a: int, b: int) -> int:
+        if self.posicion >= len(self._dados):
+            raise ValueError("El registro no tiene más dados: no corresponde a este combate")
+        valor = self._dados[self.posicion]
+        if not a <= valor <= b:
+            raise ValueError(f"Dado {valor} fuera de rango [{a}, {b}] en la posición {self.posicion}")
+        self.posicion += 1
+        return valor
+
+
+# ============================================================================
+# Reproducción
+# ============================================================================
+
+class ReproductorCombate:
+    """
+    Reconstruye un combate a partir de su registro y de los personajes tal
+    como estaban al iniciarlo. Cada ataque se vuelve a resolver con
+    CombateService usando los dados anotados y se verifica que el resultado
+    coincida con el registrado.
+    """
+
+    def __init__(self, registro: RegistroCombate, personajes: Sequence[Personaje]):
+        """
+        Args:
+            registro: Registro cargado en memoria
+            personajes: Participantes en su estado previo al combate (no se modifican)
+        """
+        por_nombre = {p.nombre: p for p in personajes}
+        faltantes = [n for n in registro.nombres if n not in por_nombre]
+        if faltantes:
+            raise ValueError(f"Faltan personajes del registro: {', '.join(faltantes)}")
+
+        self.registro = registro
+        self._plantillas = [por_nombre[n] for n in registro.nombres]
+
+    def pasos(self) -> Iterator[Tuple[ResultadoAtaque, EstadoCombate]]:
+        """Reproduce el combate ataque por ataque (el estado se reutiliza entre pasos)"""
+        servicio, copias, generador = self._nuevo_combate()
+        for i, ataque in enumerate(self.registro):
+            yield self._aplicar(servicio, copias, generador, ataque, i), servicio.estado
+
+    def estado_en(self, paso: int) -> EstadoCombate:
+        """
+        Estado del combate después de los primeros `paso` ataques.
+        paso=0 es el combate recién iniciado; paso=len(registro) el final.
+        """
+        if not 0 <= paso <= len(self.registro):
+            raise IndexError(paso)
+
+        servicio, copias, generador = self._nuevo_combate()
+        for i in range(paso):
+            self._aplicar(servicio, copias, generador, self.registro[i], i)
+        return servicio.estado
+
+    def verificar(self) -> EstadoCombate:
+        """Reproduce el combate completo; ValueError si el registro no coincide"""
+        return self.estado_en(len(self.registro))
+
+    def _nuevo_combate(self):
+        from .combate_service import CombateService  # Evita la importación circular
+
+        generador = GeneradorReproduccion(self.registro.dados)
+        servicio = CombateService(EventBus(guardar_historial=False), generador=generador)
+        copias = [p.model_copy(deep=True) for p in self._plantillas]
+        servicio.iniciar_combate(copias)
+        return servicio, copias, generador
+
+    def _aplicar(self, servicio, copias: List[Personaje], generador: GeneradorReproduccion,
+                 ataque: AtaqueRegistrado, indice: int) -> ResultadoAtaque:
+        atacante, defensor = copias[ataque.atacante], copias[ataque.defensor]
+        servicio.estado.turno_actual = ataque.ronda
+
+        # Los dados tirados entre ataques (p. ej. iniciativa por ronda) se saltan
+        generador.posicion = ataque.inicio_dados
+        if ACCIONES[ataque.accion] == "sigilo":
+            resultado = servicio.ataque_sigilo(atacante, defensor)
+        else:
+            resultado = servicio.resolver_ataque(atacante, defensor)
+
+        if (resultado.tipo != ataque.tipo or min(resultado.daño_infligido, 0xFFFF) != ataque.daño
+                or generador.posicion != ataque.fin_dados):
+            raise ValueError(
+                f"El ataque {indice} no coincide con el registro "
+                f"({resultado.tipo.value}/{resultado.daño_infligido} vs "
+                f"{ataque.tipo.value}/{ataque.daño})"
+            )
+
+        servicio.estado.agregar_resultado_ataque(resultado)
+        servicio.sincronizar_estado([atacante, defensor])
+        servicio.verificar_fin_combate()
+        return resultado
@@ -0,0 +1,344 @@
+"""
+Servicio de Simulación - Duelos Monte Carlo sobre las reglas de combate.
+Permite medir el balance de clases, Hephix y Constantes sin jugar partidas.
+"""
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from entidades import Personaje, Constantes, derivar_semillas
+from patrones import EventBus
+from .combate_service import CombateService
+
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para la simulación vectorizada
+    np = None
+
+
+@dataclass(frozen=True)
+class PerfilDuelo:
+    """
+    Valores fijos de un combatiente que usan las reglas de combate.
+    El CA aleatorio es base_ataque + 3d6 y el CD es defensa + 2d6.
+    """
+    nombre: str
+    base_ataque: int
+    defensa: int
+    reduccion_daño: int
+    pv: int
+    ps: int
+    stamina: int
+    sigilo: int
+    percepcion: int
+
+    @classmethod
+    def desde_personaje(cls, personaje: Personaje,
+                        servicio: Optional[CombateService] = None) -> "PerfilDuelo":
+        """Extrae el perfil del perfil de combate que usa CombateService"""
+        servicio = servicio or CombateService(EventBus())
+        perfil = servicio.perfil_combate(personaje)
+
+        return cls(
+            nombre=personaje.nombre,
+            base_ataque=servicio.base_ataque(personaje),
+            defensa=perfil.modificador_reflejos,
+            reduccion_daño=perfil.reduccion_daño,
+            pv=personaje.pv_actuales,
+            ps=personaje.ps_maximos,
+            stamina=personaje.ficha.stamina,
+            sigilo=personaje.ficha.talento.sigilo,
+            percepcion=personaje.ficha.talento.percepcion
+        )
+
+
+@dataclass
+class ResultadoSimulacion:
+    """Estadísticas agregadas de una serie de duelos A vs B"""
+    nombre_a: str
+    nombre_b: str
+    n_duelos: int = 0
+    victorias_a: int = 0
+    victorias_b: int = 0
+    empates: int = 0
+
+    # Histogramas: valor -> cantidad de ocurrencias
+    turnos: Dict[int, int] = field(default_factory=dict)
+    daño_por_golpe_a: Dict[int, int] = field(default_factory=dict)
+    daño_por_golpe_b: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def tasa_victoria_a(self) -> float:
+        return self.victorias_a / self.n_duelos if self.n_duelos else 0.0
+
+    @property
+    def tasa_victoria_b(self) -> float:
+        return self.victorias_b / self.n_duelos if self.n_duelos else 0.0
+
+    def turnos_promedio(self) -> float:
+        total = sum(self.turnos.values())
+        if not total:
+            return 0.0
+        return sum(t * c for t, c in self.turnos.items()) / total
+
+    def resumen(self) -> str:
+        """Genera un resumen legible de la simulación"""
+        return "\n".join([
+            f"=== {self.nombre_a} vs {self.nombre_b} ({self.n_duelos} duelos) ===",
+            f"  Victorias {self.nombre_a}: {self.tasa_victoria_a:.1%}",
+            f"  Victorias {self.nombre_b}: {self.tasa_victoria_b:.1%}",
+            f"  Empates (límite de turnos): {self.empates}",
+            f"  Turnos promedio: {self.turnos_promedio():.2f}",
+        ])
+
+
+class SimuladorDuelos:
+    """
+    Simulador Monte Carlo de duelos 1 vs 1.
+
+    Reglas simuladas: iniciativa (Sta + 1d10), CA vs CD, desgaste de stamina,
+    golpe de gracia, contraataque (diferencia <= umbral) y ataque de sigilo
+    opcional como primera acción de quien gana la iniciativa.
+
+    Ofrece dos caminos con las mismas estadísticas de salida:
+    - simular_con_servicio: ejecuta CombateService real (referencia, lento)
+    - simular_vectorizado: avanza miles de duelos a la vez con NumPy
+    """
+
+    def __init__(self, max_turnos: int = 200, max_contraataques: int = 50,
+                 sigilo_inicial: bool = False):
+        """
+        Args:
+            max_turnos: Acciones máximas por duelo antes de declarar empate
+            max_contraataques: Contraataques encadenados máximos en una acción
+            sigilo_inicial: Si quien gana la iniciativa abre con ataque_sigilo
+        """
+        self.max_turnos = max_turnos
+        self.max_contraataques = max_contraataques
+        self.sigilo_inicial = sigilo_inicial
+
+    def simular(self, a: Personaje, b: Personaje, n_duelos: int,
+                semilla: Optional[int] = None) -> ResultadoSimulacion:
+        """Simula por el camino vectorizado si NumPy está disponible"""
+        if np is not None:
+            return self.simular_vectorizado(a, b, n_duelos, semilla)
+        return self.simular_con_servicio(a, b, n_duelos, semilla)
+
+    # ========================================================================
+    # Camino de referencia (CombateService)
+    # ========================================================================
+
+    def simular_con_servicio(self, a: Personaje, b: Personaje, n_duelos: int,
+                             semilla: Optional[int] = None) -> ResultadoSimulacion:
+        """
+        Ejecuta n_duelos con CombateService sobre copias de los personajes.
+        Cada duelo usa su propio stream aleatorio derivado de la semilla.
+        """
+        resultado = ResultadoSimulacion(nombre_a=a.nombre, nombre_b=b.nombre)
+        turnos = Counter()
+        daño = {"A": Counter(), "B": Counter()}
+        semilla_base = semilla if semilla is not None else random.randrange(2 ** 63)
+
+        for semilla_duelo in derivar_semillas(semilla_base, n_duelos):
+            copia_a = a.model_copy(deep=True)
+            copia_b = b.model_copy(deep=True)
+            # Nombres únicos para atribuir resultados aun en duelos espejo
+            copia_a.nombre, copia_b.nombre = "A", "B"
+
+            ganador, n_turnos = self._duelo_con_servicio(copia_a, copia_b, semilla_duelo, daño)
+            turnos[n_turnos] += 1
+
+            if ganador == "A":
+                resultado.victorias_a += 1
+            elif ganador == "B":
+                resultado.victorias_b += 1
+            else:
+                resultado.empates += 1
+
+        resultado.n_duelos = n_duelos
+        resultado.turnos = dict(turnos)
+        resultado.daño_por_golpe_a = dict(daño["A"])
+        resultado.daño_por_golpe_b = dict(daño["B"])
+        return resultado
+
+    def _duelo_con_servicio(self, a: Personaje, b: Personaje, semilla: int,
+                            daño: Dict[str, Counter]) -> tuple:
+        """Ejecuta un duelo completo y retorna (ganador, turnos)"""
+        servicio = CombateService(EventBus(guardar_historial=False), semilla=semilla)
+        estado = servicio.iniciar_combate([a, b])
+        por_nombre = {a.nombre: a, b.nombre: b}
+        primero = por_nombre[estado.orden_turnos[0]]
+        segundo = b if primero is a else a
+
+        for turno in range(self.max_turnos):
+            atacante, defensor = (primero, segundo) if turno % 2 == 0 else (segundo, primero)
+
+            try:
+                if turno == 0 and self.sigilo_inicial:
+                    res = servicio.ataque_sigilo(atacante, defensor)
+                else:
+                    res = servicio.resolver_ataque(atacante, defensor)
+            except RecursionError:
+                # Cadena de contraataques sin fin: se cuenta como empate
+                return None, turno + 1
+
+            if res.daño_infligido:
+                daño[res.atacante_nombre][res.daño_infligido] += 1
+
+            if not a.esta_vivo or not b.esta_vivo:
+                return ("A" if a.esta_vivo else "B"), turno + 1
+
+        return None, self.max_turnos
+
+    # ========================================================================
+    # Camino vectorizado (NumPy)
+    # ========================================================================
+
+    def simular_vectorizado(self, a: Personaje, b: Personaje, n_duelos: int,
+                            semilla: Optional[int] = None) -> ResultadoSimulacion:
+        """
+        Avanza n_duelos en paralelo: cada iteración resuelve una acción en
+        todos los duelos que siguen activos.
+
+        Supone estrategias de ataque aditivas (CA = base + 3d6), como las
+        registradas por defecto en RegistroEstrategiasAtaque.
+        """
+        if np is None:
+            raise ImportError("La simulación vectorizada requiere NumPy. Instalar con: pip install numpy")
+
+        rng = np.random.default_rng(semilla)
+        perfiles = [PerfilDuelo.desde_personaje(a), PerfilDuelo.desde_personaje(b)]
+        base = np.array([p.base_ataque for p in perfiles])
+        defensa = np.array([p.defensa for p in perfiles])
+        reduccion = np.array([p.reduccion_daño for p in perfiles])
+
+        pv = np.tile([p.pv for p in perfiles], (n_duelos, 1))
+        ps = np.tile([p.ps for p in perfiles], (n_duelos, 1))
+
+        # Iniciativa: Sta + 1d10, empate a favor de A (orden estable)
+        ini_a = perfiles[0].stamina + rng.integers(1, 11, n_duelos)
+        ini_b = perfiles[1].stamina + rng.integers(1, 11, n_duelos)
+        primero = np.where(ini_a >= ini_b, 0, 1)
+
+        turnos = np.full(n_duelos, self.max_turnos)
+        activos = np.arange(n_duelos)
+        golpes: List[List["np.ndarray"]] = [[], []]
+
+        for turno in range(self.max_turnos):
+            if activos.size == 0:
+                break
+
+            atacante = primero[activos] if turno % 2 == 0 else 1 - primero[activos]
+
+            if turno == 0 and self.sigilo_inicial:
+                self._accion_sigilo(rng, perfiles, base, defensa, reduccion,
+                                    pv, ps, activos, atacante, golpes)
+            else:
+                self._resolver_ataques(rng, base, defensa, reduccion,
+                                       pv, ps, activos, atacante, golpes)
+
+            terminados = (pv[activos] == 0).any(axis=1)
+            turnos[activos[terminados]] = turno + 1
+            activos = activos[~terminados]
+
+        vivos = pv > 0
+        victorias_a = int((vivos[:, 0] & ~vivos[:, 1]).sum())
+        victorias_b = int((vivos[:, 1] & ~vivos[:, 0]).sum())
+
+        return ResultadoSimulacion(
+            nombre_a=a.nombre,
+            nombre_b=b.nombre,
+            n_duelos=n_duelos,
+            victorias_a=victorias_a,
+            victorias_b=victorias_b,
+            empates=n_duelos - victorias_a - victorias_b,
+            turnos=_histograma(turnos),
+            daño_por_golpe_a=_histograma(np.concatenate(golpes[0])) if golpes[0] else {},
+            daño_por_golpe_b=_histograma(np.concatenate(golpes[1])) if golpes[1] else {}
+        )
+
+    def _resolver_ataques(self, rng, base, defensa, reduccion, pv, ps,
+                          carriles, atacante, golpes):
+        """Equivalente vectorizado de CombateService.resolver_ataque"""
+        for _ in range(self.max_contraataques + 1):
+            if carriles.size == 0:
+                return
+
+            defensor = 1 - atacante
+            ca = base[atacante] + rng.integers(1, 7, (carriles.size, Constantes.DADOS_ATAQUE)).sum(axis=1)
+            cd = defensa[defensor] + rng.integers(1, 7, (carriles.size, Constantes.DADOS_DEFENSA)).sum(axis=1)
+            diferencia = ca - cd
+
+            # Éxito: desgaste de stamina y posible golpe de gracia
+            exito = diferencia > 0
+            c_exito, d_exito = carriles[exito], defensor[exito]
+            ps[c_exito, d_exito] = np.maximum(0, ps[c_exito, d_exito] - diferencia[exito])
+            gracia = ps[c_exito, d_exito] == 0
+            self._aplicar_daño(rng, base, reduccion, pv, c_exito[gracia],
+                               atacante[exito][gracia], d_exito[gracia], 0, golpes)
+
+            # Contraataque: se invierten los roles y se vuelve a resolver
+            contra = diferencia <= Constantes.UMBRAL_CONTRAATAQUE
+            carriles, atacante = carriles[contra], defensor[contra]
+
+    def _accion_sigilo(self, rng, perfiles, base, defensa, reduccion, pv, ps,
+                       carriles, atacante, golpes):
+        """Equivalente vectorizado de CombateService.ataque_sigilo"""
+        sigilo = np.array([p.sigilo for p in perfiles])
+        percepcion = np.array([p.percepcion for p in perfiles])
+        diferencia = sigilo[atacante] - percepcion[1 - atacante]
+
+        exito = diferencia > 0
+        self._aplicar_daño(rng, base, reduccion, pv, carriles[exito], atacante[exito],
+                           1 - atacante[exito], diferencia[exito] * 2, golpes)
+
+        # Detectado: el defensor contraataca
+        self._resolver_ataques(rng, base, defensa, reduccion, pv, ps,
+                               carriles[~exito], 1 - atacante[~exito], golpes)
+
+    def _aplicar_daño(self, rng, base, reduccion, pv, carriles, atacante,
+                      defensor, daño_extra, golpes):
+        """Ataque sin resistencia (golpe de gracia o sigilo): CA + extra - armadura"""
+        if carriles.size == 0:
+            return
+
+        ca = base[atacante] + rng.integers(1, 7, (carriles.size, Constantes.DADOS_ATAQUE)).sum(axis=1)
+        daño = np.maximum(0, ca + daño_extra - reduccion[defensor])
+        pv[carriles, defensor] = np.maximum(0, pv[carriles, defensor] - daño)
+
+        for lado in (0, 1):
+            golpes[lado].append(daño[atacante == lado])
+
+
+def _histograma(valores: "np.ndarray") -> Dict[int, int]:
+    """Convierte un array de enteros en {valor: ocurrencias}"""
+    conteos = np.bincount(valores.astype(np.int64))
+    return {int(v): int(c) for v, c in enumerate(conteos) if c}
+
+
+if __name__ == "__main__":
+    import time
+    from .creacion_personaje_service import CreacionPersonajeService
+    from entidades import HephixTipo, ClaseTipo
+
+    creacion = CreacionPersonajeService()
+    guerrero = creacion.crear_personaje(
+        nombre="Guerrero", edad=25, raza="Humano", historia="", objetivo="",
+        hephix_tipo=HephixTipo.ELEMENTAL, clase=ClaseTipo.GUERRERO,
+        caracteristicas={"fuerza": 8, "reflejos": 4, "resistencia": 6, "stamina": 2},
+        habilidades_combate={"armas_cortantes": 10},
+        habilidades_educacion={}, habilidades_talento={}
+    )
+    explorador = creacion.crear_personaje(
+        nombre="Explorador", edad=25, raza="Elfo", historia="", objetivo="",
+        hephix_tipo=HephixTipo.OCULTA, clase=ClaseTipo.EXPLORADOR,
+        caracteristicas={"punteria": 8, "reflejos": 6, "resistencia": 4, "stamina": 2},
+        habilidades_combate={"armas_distancia": 10},
+        habilidades_educacion={}, habilidades_talento={"sigilo": 10}
+    )
+
+    simulador = SimuladorDuelos()
+    inicio = time.perf_counter()
+    resultado = simulador.simular(guerrero, explorador, 100_000, semilla=1)
+    print(resultado.resumen())
+    print(f"  ({time.perf_counter() - inicio:.2f}s)")
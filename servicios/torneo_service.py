@@ -0,0 +1,240 @@
+"""
+Servicio de Torneo - Round-robin de builds Clase × Hephix en varios procesos.
+Cada enfrentamiento se simula con SimuladorDuelos y los resultados se
+combinan en una matriz de tasas de victoria guardada en disco.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from entidades import Personaje, ClaseTipo, HephixTipo, derivar_semillas
+from .creacion_personaje_service import CreacionPersonajeService
+from .simulacion_service import SimuladorDuelos
+
+
+# Build representativo de cada clase (20 pts de características, 10 por habilidad)
+BUILDS_POR_CLASE: Dict[ClaseTipo, Dict[str, Dict[str, int]]] = {
+    ClaseTipo.GUERRERO: {
+        "caracteristicas": {"fuerza": 8, "reflejos": 4, "resistencia": 5, "stamina": 3},
+        "combate": {"armas_cortantes": 10},
+        "educacion": {"medicina": 5, "manual": 5},
+        "talento": {"percepcion": 5, "sigilo": 5},
+    },
+    ClaseTipo.MAGO: {
+        "caracteristicas": {"voluntad": 8, "reflejos": 4, "resistencia": 5, "stamina": 3},
+        "combate": {"armas_magicas": 10},
+        "educacion": {"arcanismo": 10},
+        "talento": {"mentalidad": 5, "percepcion": 5},
+    },
+    ClaseTipo.EXPLORADOR: {
+        "caracteristicas": {"punteria": 8, "reflejos": 5, "resistencia": 4, "stamina": 3},
+        "combate": {"armas_distancia": 10},
+        "educacion": {"medicina": 5, "manual": 5},
+        "talento": {"sigilo": 7, "percepcion": 3},
+    },
+    ClaseTipo.CURANDERO: {
+        "caracteristicas": {"fuerza": 6, "reflejos": 4, "resistencia": 7, "stamina": 3},
+        "combate": {"armas_cortantes": 10},
+        "educacion": {"medicina": 10},
+        "talento": {"percepcion": 5, "astralidad": 5},
+    },
+    ClaseTipo.ARTESANO: {
+        "caracteristicas": {"fuerza": 7, "reflejos": 4, "resistencia": 6, "stamina": 3},
+        "combate": {"armas_cortantes": 10},
+        "educacion": {"manual": 10},
+        "talento": {"percepcion": 5, "mentalidad": 5},
+    },
+    ClaseTipo.DIPLOMATICO: {
+        "caracteristicas": {"punteria": 7, "reflejos": 5, "resistencia": 5, "stamina": 3},
+        "combate": {"armas_distancia": 10},
+        "educacion": {"elocuencia": 10},
+        "talento": {"percepcion": 5, "sigilo": 5},
+    },
+}
+
+
+def nombre_build(clase: ClaseTipo, hephix: HephixTipo) -> str:
+    """Identificador de un build en el torneo"""
+    return f"{clase.value}-{hephix.value}"
+
+
+def generar_builds(clases: Optional[Sequence[ClaseTipo]] = None,
+                   hephix: Optional[Sequence[HephixTipo]] = None,
+                   creacion: Optional[CreacionPersonajeService] = None) -> List[Personaje]:
+    """
+    Crea un personaje representativo por cada par Clase × Hephix.
+
+    Args:
+        clases: Clases a incluir (None = todas)
+        hephix: Tipos de Hephix a incluir (None = todos)
+        creacion: Servicio de creación a reutilizar (opcional)
+    """
+    creacion = creacion or CreacionPersonajeService()
+    builds = []
+
+    for clase in clases or list(ClaseTipo):
+        build = BUILDS_POR_CLASE[clase]
+        for hephix_tipo in hephix or list(HephixTipo):
+            builds.append(creacion.crear_personaje(
+                nombre=nombre_build(clase, hephix_tipo),
+                edad=25,
+                raza="Humano",
+                historia="",
+                objetivo="",
+                hephix_tipo=hephix_tipo,
+                clase=clase,
+                caracteristicas=build["caracteristicas"],
+                habilidades_combate=build["combate"],
+                habilidades_educacion=build["educacion"],
+                habilidades_talento=build["talento"]
+            ))
+
+    return builds
+
+
+@dataclass
+class ResultadoTorneo:
+    """Matriz de tasas de victoria: tasas[i][j] = P(build i vence a build j)"""
+    builds: List[str]
+    n_duelos: int
+    semilla: int
+    tasas: List[List[Optional[float]]] = field(default_factory=list)
+
+    def tasa_media(self, build: str) -> float:
+        """Tasa de victoria media de un build contra todos los demás"""
+        fila = [t for t in self.tasas[self.builds.index(build)] if t is not None]
+        return sum(fila) / len(fila) if fila else 0.0
+
+    def ranking(self) -> List[Tuple[str, float]]:
+        """Builds ordenados por tasa de victoria media"""
+        return sorted(((b, self.tasa_media(b)) for b in self.builds),
+                      key=lambda x: x[1], reverse=True)
+
+    def guardar(self, ruta: str) -> Path:
+        """Guarda la matriz como JSON"""
+        archivo = Path(ruta)
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump({
+                "builds": self.builds,
+                "n_duelos": self.n_duelos,
+                "semilla": self.semilla,
+                "tasas": self.tasas
+            }, f, ensure_ascii=False)
+        return archivo
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "ResultadoTorneo":
+        """Carga una matriz guardada con guardar()"""
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return cls(**json.load(f))
+
+
+# ============================================================================
+# Trabajadores (nivel de módulo para poder enviarlos a otros procesos)
+# ============================================================================
+
+_builds_trabajador: List[Personaje] = []
+_simulador_trabajador: Optional[SimuladorDuelos] = None
+
+
+def _inicializar_trabajador(clases, hephix, opciones_simulador):
+    """Construye los builds una sola vez por proceso"""
+    global _builds_trabajador, _simulador_trabajador
+    _builds_trabajador = generar_builds(clases, hephix)
+    _simulador_trabajador = SimuladorDuelos(**opciones_simulador)
+
+
+def _jugar_lote(lote: List[Tuple[int, int, int]], n_duelos: int) -> List[Tuple[int, int, float, float]]:
+    """Simula un lote de enfrentamientos (i, j, semilla)"""
+    resultados = []
+    for i, j, semilla in lote:
+        res = _simulador_trabajador.simular(
+            _builds_trabajador[i], _builds_trabajador[j], n_duelos, semilla
+        )
+        resultados.append((i, j, res.tasa_victoria_a, res.tasa_victoria_b))
+    return resultados
+
+
+class TorneoRoundRobin:
+    """
+    Enfrenta todos los builds entre sí repartiendo los cruces en un
+    ProcessPoolExecutor. Cada cruce tiene su propia semilla derivada de
+    la semilla del torneo, así que el resultado no depende del número
+    de procesos ni del orden en que terminan.
+    """
+
+    def __init__(self, n_duelos: int = 1000, procesos: Optional[int] = None,
+                 semilla: int = 0, tamaño_lote: int = 32,
+                 clases: Optional[Sequence[ClaseTipo]] = None,
+                 hephix: Optional[Sequence[HephixTipo]] = None,
+                 **opciones_simulador):
+        """
+        Args:
+            n_duelos: Duelos por enfrentamiento
+            procesos: Procesos del pool (None = CPUs disponibles, 1 = sin pool)
+            semilla: Semilla maestra del torneo
+            tamaño_lote: Enfrentamientos por tarea enviada al pool
+            clases: Clases a incluir (None = todas)
+            hephix: Tipos de Hephix a incluir (None = todos)
+            **opciones_simulador: Parámetros para SimuladorDuelos
+        """
+        self.n_duelos = n_duelos
+        self.procesos = procesos
+        self.semilla = semilla
+        self.tamaño_lote = tamaño_lote
+        self.clases = list(clases) if clases else list(ClaseTipo)
+        self.hephix = list(hephix) if hephix else list(HephixTipo)
+        self.opciones_simulador = opciones_simulador
+
+    def ejecutar(self, ruta_salida: Optional[str] = None) -> ResultadoTorneo:
+        """
+        Ejecuta el torneo completo.
+
+        Args:
+            ruta_salida: Si se indica, guarda la matriz en ese archivo JSON
+        """
+        nombres = [nombre_build(c, h) for c in self.clases for h in self.hephix]
+        cruces = list(combinations(range(len(nombres)), 2))
+        semillas = derivar_semillas(self.semilla, len(cruces))
+        tareas = [(i, j, s) for (i, j), s in zip(cruces, semillas)]
+        lotes = [tareas[k:k + self.tamaño_lote] for k in range(0, len(tareas), self.tamaño_lote)]
+
+        argumentos_inicio = (self.clases, self.hephix, self.opciones_simulador)
+
+        if self.procesos == 1:
+            _inicializar_trabajador(*argumentos_inicio)
+            resultados = [_jugar_lote(lote, self.n_duelos) for lote in lotes]
+        else:
+            with ProcessPoolExecutor(max_workers=self.procesos,
+                                     initializer=_inicializar_trabajador,
+                                     initargs=argumentos_inicio) as pool:
+                resultados = list(pool.map(_jugar_lote, lotes, [self.n_duelos] * len(lotes)))
+
+        tasas: List[List[Optional[float]]] = [[None] * len(nombres) for _ in nombres]
+        for lote in resultados:
+            for i, j, tasa_i, tasa_j in lote:
+                tasas[i][j] = tasa_i
+                tasas[j][i] = tasa_j
+
+        resultado = ResultadoTorneo(builds=nombres, n_duelos=self.n_duelos,
+                                    semilla=self.semilla, tasas=tasas)
+        if ruta_salida:
+            resultado.guardar(ruta_salida)
+        return resultado
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    n_duelos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    inicio = time.perf_counter()
+    torneo = TorneoRoundRobin(n_duelos=n_duelos, semilla=1)
+    resultado = torneo.ejecutar("torneo.json")
+    print(f"Torneo de {len(resultado.builds)} builds en {time.perf_counter() - inicio:.1f}s\n")
+
+    for build, tasa in resultado.ranking()[:10]:
+        print(f"  {build:<28} {tasa:.1%}")
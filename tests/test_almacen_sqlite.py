@@ -0,0 +1,131 @@
+"""
+Tests para el almacén de partidas en SQLite.
+Ejecutar con: pytest tests/test_almacen_sqlite.py -v
+"""
+import threading
+import pytest
+from servicios import AlmacenPartidasSQLite, PersistenciaService, PoolConexiones
+from servicios.persistencia_estructuras import ContextoNarrativo
+from entidades import Personaje, Ficha, Hephix, HephixTipo, ClaseTipo, crear_espada_basica
+from patrones import SingletonMeta
+
+
+def crear_personaje(nombre: str, nivel: int = 1) -> Personaje:
+    return Personaje(
+        nombre=nombre, edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+        hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=Ficha(), nivel=nivel
+    )
+
+
+class TestAlmacenPartidasSQLite:
+    """Tests para el almacén SQLite"""
+
+    @pytest.fixture(params=["json", "zlib"])
+    def almacen(self, request, tmp_path):
+        almacen = AlmacenPartidasSQLite(str(tmp_path / "partidas.db"), formato=request.param)
+        yield almacen
+        almacen.cerrar()
+
+    def test_espacios_por_jugador_y_slots_sin_limite(self, almacen):
+        """Verifica que cada jugador tiene sus slots y que no hay tope de 10"""
+        personaje = crear_personaje("Aldric", nivel=3)
+        personaje.equipar_arma(crear_espada_basica())
+        almacen.guardar_partida("ana", personaje, ContextoNarrativo(), slot=1)
+        almacen.guardar_partida("ana", personaje, ContextoNarrativo(ubicacion_actual="Puerto"), slot=250)
+        almacen.guardar_partida("beto", crear_personaje("Brenna"), ContextoNarrativo(), slot=1)
+
+        assert [i.slot for i in almacen.listar_partidas("ana")] == [1, 250]
+        assert almacen.listar_partidas("beto")[0].nombre_personaje == "Brenna"
+        assert almacen.cargar_partida("ana", 250, confiable=True) == almacen.cargar_partida("ana", 250)
+        assert almacen.cargar_personaje("ana", 1) == personaje
+        assert almacen.contar_jugadores() == 2
+
+        assert almacen.eliminar_partida("ana", 250)
+        assert not almacen.eliminar_partida("ana", 250)
+        with pytest.raises(KeyError):
+            almacen.cargar_partida("ana", 250)
+        assert almacen.eliminar_jugador("ana") == 1
+        with pytest.raises(ValueError):
+            almacen.guardar_partida("ana", personaje, ContextoNarrativo(), slot=0)
+
+    def test_buscar_por_columnas_indexadas(self, almacen):
+        """Verifica la búsqueda entre jugadores y que usa los índices"""
+        for i in range(30):
+            almacen.guardar_partida(
+                f"jugador{i}", crear_personaje(f"Heroe{i}", nivel=1 + i % 10),
+                ContextoNarrativo(ubicacion_actual="Puerto" if i % 3 == 0 else "Amarth")
+            )
+
+        resultados = almacen.buscar_partidas(nivel_min=5, ubicacion="Puerto")
+        assert {j for j, _ in resultados} == {f"jugador{i}" for i in range(30)
+                                              if i % 3 == 0 and 1 + i % 10 >= 5}
+        assert all(info.ubicacion == "Puerto" for _, info in resultados)
+        timestamps = [info.timestamp for _, info in almacen.buscar_partidas(limite=5)]
+        assert len(timestamps) == 5 and timestamps == sorted(timestamps, reverse=True)
+        assert almacen.buscar_partidas(nombre_personaje="Heroe7")[0][0] == "jugador7"
+
+        with almacen.pool.conexion() as conexion:
+            plan = conexion.execute(
+                "EXPLAIN QUERY PLAN SELECT slot FROM partidas WHERE ubicacion = ?", ("Puerto",)
+            ).fetchall()
+            modo = conexion.execute("PRAGMA journal_mode").fetchone()[0]
+        assert "idx_partidas_ubicacion" in str(plan)
+        assert modo == "wal"
+
+    def test_importar_y_exportar_json(self, almacen, tmp_path):
+        """Verifica el intercambio con los archivos de PersistenciaService"""
+        SingletonMeta.reset_instances()
+        archivos = PersistenciaService(str(tmp_path / "guardados"), formato="json")
+        personaje = crear_personaje("Aldric")
+        archivos.guardar_partida(personaje, ContextoNarrativo(), slot=2)
+        archivos.guardar_partida(personaje, ContextoNarrativo(ubicacion_actual="Puerto"), slot=7)
+
+        assert almacen.importar("ana", sorted((tmp_path / "guardados").glob("slot_*.json"))) == 2
+        assert almacen.listar_partidas("ana")[1].ubicacion == "Puerto"
+        assert almacen.cargar_partida("ana", 2) == archivos.cargar_partida(2)
+
+        # El slot 11 solo existe en SQLite: no se exporta
+        almacen.guardar_partida("ana", personaje, ContextoNarrativo(), slot=11)
+        exportados = almacen.exportar("ana", str(tmp_path / "exportados"))
+        assert [a.name for a in exportados] == ["slot_02.json", "slot_07.json"]
+        assert sorted(p.name for p in (tmp_path / "exportados").iterdir()) == \
+            ["slot_02.json", "slot_07.json"]
+        SingletonMeta.reset_instances()
+        releidos = PersistenciaService(str(tmp_path / "exportados"), formato="json")
+        assert releidos.cargar_partida(7, confiable=True) == archivos.cargar_partida(7)
+        assert releidos.verificar_integridad(7) == (True, None)
+        SingletonMeta.reset_instances()
+
+    def test_sesiones_concurrentes(self, almacen):
+        """Verifica guardados desde varios hilos con el pool de conexiones"""
+        errores = []
+
+        def sesion(n: int):
+            try:
+                for slot in range(1, 6):
+                    almacen.guardar_partida(f"jugador{n}", crear_personaje(f"H{n}"),
+                                            ContextoNarrativo(), slot=slot)
+                    almacen.listar_partidas(f"jugador{n}")
+            except Exception as e:
+                errores.append(e)
+
+        hilos = [threading.Thread(target=sesion, args=(n,)) for n in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        assert errores == []
+        assert almacen.contar_jugadores() == 8
+        assert len(almacen.pool._abiertas) <= almacen.pool.tamaño
+
+    def test_pool_agota_conexiones(self, tmp_path):
+        """Verifica la espera acotada cuando todas las conexiones están en uso"""
+        pool = PoolConexiones(str(tmp_path / "pool.db"), tamaño=1, timeout=0.05)
+        with pool.conexion() as primera:
+            with pytest.raises(TimeoutError):
+                with pool.conexion():
+                    pass
+        with pool.conexion() as otra:
+            assert otra is primera
+        pool.cerrar()
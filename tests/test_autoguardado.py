@@ -0,0 +1,94 @@
+"""
+Tests para el autoguardado en segundo plano.
+Ejecutar con: pytest tests/test_autoguardado.py -v
+"""
+import time
+import pytest
+from servicios import AutoguardadoService, PersistenciaService
+from servicios.persistencia_estructuras import ContextoNarrativo
+from entidades import Personaje, Ficha, Hephix, HephixTipo, ClaseTipo
+from patrones import EventBus, TipoEvento, SingletonMeta
+
+
+class TestAutoguardadoService:
+    """Tests para el servicio de autoguardado"""
+
+    @pytest.fixture
+    def persistencia(self, tmp_path):
+        SingletonMeta.reset_instances()
+        yield PersistenciaService(directorio_guardados=str(tmp_path), formato="json")
+        SingletonMeta.reset_instances()
+
+    @pytest.fixture
+    def eventos(self):
+        return []
+
+    @pytest.fixture
+    def bus(self, eventos):
+        bus = EventBus()
+        bus.suscribir(TipoEvento.PARTIDA_GUARDADA, eventos.append)
+        bus.suscribir(TipoEvento.ERROR_SISTEMA, eventos.append)
+        return bus
+
+    @pytest.fixture
+    def personaje(self):
+        return Personaje(
+            nombre="Aldric", edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+            hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=Ficha()
+        )
+
+    def test_agrupa_solicitudes_por_slot(self, persistencia, bus, eventos, personaje):
+        """Verifica que una ráfaga se escribe una vez por slot con el último estado"""
+        contexto = ContextoNarrativo()
+        with AutoguardadoService(persistencia, bus, espera=30) as autoguardado:
+            for i in range(20):
+                contexto.ubicacion_actual = f"Camino {i}"
+                autoguardado.solicitar(personaje, contexto, slot=1)
+            # Los cambios en el lugar se capturan sin marcarlos
+            personaje.nivel = 3
+            autoguardado.solicitar(personaje, contexto, slot=2)
+
+            # La captura queda fija aunque el juego siga modificando
+            contexto.ubicacion_actual = "Sin guardar"
+            personaje.nivel = 7
+
+            assert autoguardado.pendientes() == [1, 2]
+            assert autoguardado.vaciar(timeout=5)
+            assert autoguardado.pendientes() == []
+
+        guardados = {e.datos["slot"]: e.datos["solicitudes"] for e in eventos}
+        assert guardados == {1: 20, 2: 1}
+        datos = persistencia.cargar_partida(1)
+        assert datos.contexto.ubicacion_actual == "Camino 19"
+        assert datos.personaje["nivel"] == 1
+        assert persistencia.cargar_partida(2).personaje["nivel"] == 3
+
+    def test_espera_y_cierre(self, persistencia, bus, eventos, personaje):
+        """Verifica la escritura tras el debounce y el vaciado al cerrar"""
+        autoguardado = AutoguardadoService(persistencia, bus, espera=0.05)
+        autoguardado.solicitar(personaje, ContextoNarrativo(), slot=3)
+        limite = time.monotonic() + 5
+        while not eventos and time.monotonic() < limite:
+            time.sleep(0.01)
+        assert persistencia.existe_partida(3)
+
+        autoguardado.espera = 30
+        autoguardado.solicitar(personaje, ContextoNarrativo(), slot=4)
+        autoguardado.cerrar()
+        assert persistencia.existe_partida(4)
+        with pytest.raises(RuntimeError):
+            autoguardado.solicitar(personaje, ContextoNarrativo(), slot=4)
+
+    def test_error_se_informa_por_el_bus(self, persistencia, bus, eventos, personaje, monkeypatch):
+        """Verifica que un fallo de escritura publica ERROR_SISTEMA"""
+        def fallar(instantanea):
+            raise OSError("disco lleno")
+        monkeypatch.setattr(persistencia, "escribir", fallar)
+
+        with AutoguardadoService(persistencia, bus, espera=30) as autoguardado:
+            autoguardado.solicitar(personaje, ContextoNarrativo(), slot=1)
+            assert autoguardado.vaciar(timeout=5)
+
+        (evento,) = eventos
+        assert evento.tipo == TipoEvento.ERROR_SISTEMA
+        assert evento.datos == {"origen": "autoguardado", "slot": 1, "error": "disco lleno"}
@@ -0,0 +1,113 @@
+"""
+Tests para las tablas de botín.
+Ejecutar con: pytest tests/test_botin.py -v
+"""
+import json
+import random
+import pytest
+from servicios.botin_service import BotinService
+from servicios.botin_estructuras import TablaAlias, EntradaBotin, TablaBotin
+from entidades import RarezaItem, ItemConsumible, Arma
+
+
+class TestTablaAlias:
+    """Tests para la tabla de alias"""
+
+    def test_probabilidades_exactas(self):
+        """Verifica que la tabla reproduce exactamente los pesos"""
+        pesos = [5.0, 1.0, 0.5, 3.5, 10.0]
+        entradas = [EntradaBotin(objeto=None) for _ in pesos]
+        tabla = TablaAlias.construir(entradas, pesos)
+
+        for obtenida, peso in zip(tabla.probabilidades(), pesos):
+            assert obtenida == pytest.approx(peso / sum(pesos))
+
+    def test_sorteo_y_lote_respetan_distribucion(self):
+        """Verifica las frecuencias del sorteo individual y del vectorizado"""
+        np = pytest.importorskip("numpy")
+        pesos = [1.0, 2.0, 7.0]
+        tabla = TablaAlias.construir([EntradaBotin() for _ in pesos], pesos)
+
+        generador = random.Random(3)
+        individuales = [tabla.sortear(generador) for _ in range(20_000)]
+        lote = tabla.sortear_lote(200_000, np.random.default_rng(3))
+
+        for i, peso in enumerate(pesos):
+            assert individuales.count(i) / 20_000 == pytest.approx(peso / 10, abs=0.015)
+            assert (lote == i).mean() == pytest.approx(peso / 10, abs=0.005)
+
+    def test_tabla_sin_pesos(self):
+        """Verifica el error con una tabla vacía"""
+        with pytest.raises(ValueError):
+            TablaAlias.construir([], [])
+
+
+class TestBotinService:
+    """Tests para el servicio de botín"""
+
+    @pytest.fixture
+    def servicio(self, tmp_path):
+        tablas = {
+            "cofre": {
+                "tipo_clase": "tabla_botin",
+                "nombre": "Cofre",
+                "pesos_rareza": {"comun": 1, "raro": 1},
+                "bonus_rareza_por_nivel": 0.5,
+                "entradas": [
+                    {"objeto": "pocion_vida_menor", "peso": 1, "cantidad": 2},
+                    {"objeto": "espada_basica", "peso": 1, "rareza": "raro"},
+                    {"objeto": "kit_atencion_medica", "peso": 1, "nivel_minimo": 5}
+                ]
+            }
+        }
+        ruta = tmp_path / "botin.json"
+        ruta.write_text(json.dumps(tablas), encoding="utf-8")
+        return BotinService(str(ruta))
+
+    def test_cantidad_solo_para_items(self):
+        """Verifica que solo los ítems del catálogo aceptan cantidad > 1"""
+        with pytest.raises(ValueError, match="apilable"):
+            TablaBotin(nombre="Armería", entradas=[{"objeto": "espada_basica", "cantidad": 3}])
+        entrada = EntradaBotin(objeto="pocion_vida_menor", cantidad=3)
+        assert TablaAlias.construir([entrada], [1.0]).materializar(0).cantidad == 3
+
+    def test_carga_desde_json(self, servicio):
+        """Verifica que la tabla se construye con la fábrica y se reutiliza"""
+        tabla = servicio.tabla("cofre")
+        assert isinstance(tabla, TablaBotin)
+        assert tabla is servicio.tabla("cofre")
+        assert tabla.compilar(1) is tabla.compilar(1)
+        with pytest.raises(ValueError):
+            servicio.tabla("inexistente")
+
+    def test_nivel_filtra_y_pondera(self, servicio):
+        """Verifica las entradas por nivel y el bonus de rareza"""
+        tabla = servicio.tabla("cofre")
+        assert tabla.compilar(1).probabilidades() == pytest.approx([0.5, 0.5])
+
+        # Nivel 5: la rara pesa 1 + 0.5 * 4 * 2 = 5 veces más
+        alias = tabla.compilar(5)
+        objetos = [e.objeto for e in alias.entradas]
+        probabilidades = dict(zip(objetos, alias.probabilidades()))
+        assert probabilidades["espada_basica"] == pytest.approx(5 / 7)
+        assert probabilidades["kit_atencion_medica"] == pytest.approx(1 / 7)
+        assert tabla.entradas[0].rareza_efectiva() == RarezaItem.COMUN
+
+    def test_generar_crea_objetos_del_catalogo(self, servicio):
+        """Verifica los objetos creados y la reproducibilidad con semilla"""
+        botin = servicio.generar("cofre", sorteos=50, generador=random.Random(9))
+        otra = servicio.generar("cofre", sorteos=50, generador=random.Random(9))
+
+        assert [o.nombre for o in botin] == [o.nombre for o in otra]
+        assert all(isinstance(o, (ItemConsumible, Arma)) for o in botin)
+        assert all(o.cantidad == 2 for o in botin if isinstance(o, ItemConsumible))
+
+    def test_generar_lote(self, servicio):
+        """Verifica el lote vectorizado y sus conteos"""
+        np = pytest.importorskip("numpy")
+        lote = servicio.generar_lote("cofre", 10_000, generador=np.random.default_rng(1))
+
+        conteos = lote.conteos()
+        assert sum(conteos.values()) == len(lote) == 10_000
+        assert set(conteos) == {"pocion_vida_menor", "espada_basica"}
+        assert lote[0].id_catalogo in conteos
@@ -2,14 +2,24 @@
 Tests para el servicio de combate.
 Ejecutar con: pytest tests/test_combate.py -v
 """
+import warnings
 import pytest
 from servicios.combate_service import CombateService
-from servicios.combate_estructuras import TipoResultadoAtaque
+from servicios.combate_estructuras import TipoResultadoAtaque, ResultadoAtaque
+from servicios.combate_estructuras import EstadoCombate, EstadoCombatiente
+from servicios.combate_estructuras import CombatienteRapido, ResultadoAtaqueCompacto
+from servicios.escenarios_service import Escenario, EjecutorEscenarios
+from servicios.batalla_service import BatallaMasivaService
+from servicios.planificador_turnos import PlanificadorTurnos
+from servicios.registro_combate import RegistroCombate, ReproductorCombate
 from entidades import (
     Personaje, Ficha, Hephix, HephixTipo, ClaseTipo,
-    crear_espada_basica, establecer_semilla
+    crear_espada_basica, crear_arco_basico, crear_armadura_ligera,
+    establecer_semilla, derivar_semillas
+)
+from patrones import (
+    EventBus, TipoEvento, RegistroEstrategiasAtaque, EstrategiaAtaqueMelee, TipoAtaque
 )
-from patrones import EventBus, TipoEvento
 
 
 class TestCombateService:
@@ -205,6 +215,14 @@ class TestCombateService:
             assert resultado.stamina_perdida == 0
             assert resultado.daño_infligido == 0
     
+    def test_probabilidades_ataque(self, servicio_combate, guerrero, enemigo_debil):
+        """Verifica el cálculo exacto de desenlaces sin tirar dados"""
+        probs = servicio_combate.probabilidades_ataque(guerrero, enemigo_debil)
+        
+        assert set(probs) == {"exito", "bloqueado", "contraataque"}
+        assert abs(sum(probs.values()) - 1.0) < 1e-12
+        assert probs["exito"] > 0.9  # Fuerza 8 + espada vs Reflejos 3
+    
     # ========================================================================
     # Tests de Ataques Especiales
     # ========================================================================
@@ -296,6 +314,31 @@ class TestCombateService:
         # Debería ser detectado y contraatacar (Sigilo 2 - Percepción 15 = -13 < 0)
         assert resultado.fue_contraataque or resultado.tipo == TipoResultadoAtaque.CONTRAATAQUE
     
+    # ========================================================================
+    # Tests de Streams Aleatorios
+    # ========================================================================
+    
+    def test_combate_reproducible_con_semilla_propia(self, guerrero, enemigo_debil):
+        """Verifica que un combate con stream propio no depende del estado global"""
+        resultados = []
+        for semilla_global in (1, 2):
+            establecer_semilla(semilla_global)
+            servicio = CombateService(EventBus(), semilla=123)
+            estado = servicio.iniciar_combate([guerrero, enemigo_debil])
+            ataque = servicio.resolver_ataque(guerrero, enemigo_debil)
+            resultados.append((estado.orden_turnos, ataque.model_dump()))
+            guerrero.restaurar_stats_completos()
+            enemigo_debil.restaurar_stats_completos()
+        
+        assert resultados[0] == resultados[1]
+    
+    def test_derivar_semillas(self):
+        """Verifica que las semillas derivadas son deterministas y distintas"""
+        semillas = derivar_semillas(42, 5)
+        
+        assert semillas == derivar_semillas(42, 5)
+        assert len(set(semillas)) == 5
+    
     # ========================================================================
     # Tests de Eventos
     # ========================================================================
@@ -362,6 +405,524 @@ class TestCombateService:
         assert servicio_combate.verificar_fin_combate()
         assert servicio_combate.estado.ganador == "Aldric"
 
+    
+    # ========================================================================
+    # Tests de Combate Completo
+    # ========================================================================
+    
+    def test_ejecutar_combate_hasta_el_final(self, servicio_combate, guerrero, enemigo_debil):
+        """Verifica que el combate sin interacción termina con un ganador"""
+        estado = servicio_combate.ejecutar_combate([guerrero, enemigo_debil])
+        
+        assert not estado.combate_activo
+        assert estado.ganador in ("Aldric", "Goblin")
+        assert len(estado.historial_ataques) > 0
+        perdedor = enemigo_debil if estado.ganador == "Aldric" else guerrero
+        assert not perdedor.esta_vivo
+        assert not estado.obtener_combatiente_por_nombre(perdedor.nombre).esta_vivo
+    
+    def test_ejecutar_combate_por_bandos(self, guerrero, enemigo_debil):
+        """Verifica que los aliados no se atacan y gana un bando"""
+        aliado = enemigo_debil.model_copy(deep=True)
+        aliado.nombre = "Goblin 2"
+        servicio = CombateService(EventBus(), semilla=3)
+        
+        estado = servicio.ejecutar_combate(
+            [guerrero, enemigo_debil, aliado],
+            comportamientos={"Aldric": "tactica"},
+            bandos={"Goblin": "goblins", "Goblin 2": "goblins", "Aldric": "heroes"}
+        )
+        
+        assert estado.ganador in ("goblins", "heroes")
+        for ataque in estado.historial_ataques:
+            assert {"Goblin", "Goblin 2"} != {ataque.atacante_nombre, ataque.defensor_nombre}
+
+    def test_ejecutar_combate_cuenta_vivos_por_bando(self, guerrero, enemigo_debil, monkeypatch):
+        """Verifica que el fin se decide con los conteos, sin recorrer a todos por turno"""
+        aliado = enemigo_debil.model_copy(deep=True)
+        aliado.nombre = "Goblin 2"
+        llamadas = []
+        original = EstadoCombate.verificar_fin_combate
+        monkeypatch.setattr(EstadoCombate, "verificar_fin_combate",
+                            lambda estado: llamadas.append(1) or original(estado))
+        servicio = CombateService(EventBus(), semilla=3)
+
+        estado = servicio.ejecutar_combate(
+            [guerrero, enemigo_debil, aliado],
+            bandos={"Goblin": "goblins", "Goblin 2": "goblins", "Aldric": "heroes"}
+        )
+
+        assert len(llamadas) == 1
+        assert len(estado.historial_ataques) > 2
+        vivos = {c.bando for c in estado.combatientes if c.esta_vivo}
+        assert vivos == {estado.ganador}
+        assert servicio._en_pie is None
+
+    
+    def test_ejecutar_combate_con_reroll_y_velocidad(self, guerrero, enemigo_debil):
+        """Verifica el combate con iniciativa por ronda y turnos extra"""
+        servicio = CombateService(EventBus(), semilla=5)
+        
+        estado = servicio.ejecutar_combate(
+            [guerrero, enemigo_debil], reroll_iniciativa=True,
+            acciones_por_ronda={"Aldric": 2}
+        )
+        
+        assert not estado.combate_activo
+        atacantes = [a.atacante_nombre for a in estado.historial_ataques if not a.fue_contraataque]
+        assert atacantes.count("Aldric") >= atacantes.count("Goblin")
+
+    
+    def test_resultado_incluye_dados(self, servicio_combate, guerrero, enemigo_debil):
+        """Verifica que el resultado guarda los dados de la tirada"""
+        resultado = servicio_combate.resolver_ataque(guerrero, enemigo_debil)
+        
+        assert len(resultado.dados_ataque) == 3
+        assert len(resultado.dados_defensa) == 2
+    
+    def test_limite_historial(self, guerrero, enemigo_debil):
+        """Verifica que el historial acotado conserva solo los últimos ataques"""
+        servicio = CombateService(EventBus(), semilla=8)
+        
+        estado = servicio.ejecutar_combate([guerrero, enemigo_debil], limite_historial=1)
+        
+        assert len(estado.historial_ataques) == 1
+        assert estado.ataques_totales >= 1
+        
+        # Recorte en bloque: nunca supera el doble del límite
+        acotado = EstadoCombate(limite_historial=3)
+        ultimo = estado.historial_ataques[0]
+        for i in range(10):
+            acotado.agregar_resultado_ataque(ultimo.model_copy(update={"daño_infligido": i}))
+            assert len(acotado.historial_ataques) < 6
+        acotado.recortar_historial()
+        assert [r.daño_infligido for r in acotado.historial_ataques] == [7, 8, 9]
+
+    # ========================================================================
+    # Tests de Perfil de Combate
+    # ========================================================================
+    
+    def test_perfil_combate_cacheado(self, servicio_combate, guerrero):
+        """Verifica que el perfil se reutiliza mientras nada cambie"""
+        perfil = servicio_combate.perfil_combate(guerrero)
+        
+        assert perfil.base_ataque == 8 + guerrero.arma_equipada.bonus + 2
+        assert perfil.modificador_reflejos == 4
+        assert servicio_combate.perfil_combate(guerrero) is perfil
+    
+    def test_perfil_combate_edicion_ficha(self, servicio_combate, guerrero):
+        """Verifica que editar una característica invalida el perfil"""
+        version = guerrero.ficha.version_stats()
+        base = servicio_combate.perfil_combate(guerrero).base_ataque
+        
+        guerrero.ficha.caracteristicas.fuerza = 10
+        
+        assert guerrero.ficha.version_stats() != version
+        assert servicio_combate.perfil_combate(guerrero).base_ataque == base + 2
+    
+    def test_perfil_combate_equipamiento(self, servicio_combate, guerrero):
+        """Verifica que cambiar arma o armadura invalida el perfil"""
+        perfil = servicio_combate.perfil_combate(guerrero)
+        
+        guerrero.equipar_arma(crear_arco_basico())
+        perfil_arco = servicio_combate.perfil_combate(guerrero)
+        assert perfil_arco is not perfil
+        assert perfil_arco.stat_base == guerrero.ficha.punteria
+        
+        guerrero.equipar_armadura(crear_armadura_ligera())
+        perfil_armadura = servicio_combate.perfil_combate(guerrero)
+        assert perfil_armadura.modificador_reflejos == guerrero.obtener_modificador_reflejos()
+        assert perfil_armadura.reduccion_daño == guerrero.armadura_equipada.reduccion_total()
+
+    def test_perfil_combate_mejora_en_el_lugar(self, servicio_combate, guerrero):
+        """Verifica que mejorar el arma o la armadura equipadas invalida el perfil"""
+        perfil = servicio_combate.perfil_combate(guerrero)
+
+        assert guerrero.arma_equipada.aplicar_mejora_mecanica(nivel_manual=12)
+        assert servicio_combate.perfil_combate(guerrero) is not perfil
+        guerrero.arma_equipada.bonus += 2
+        assert servicio_combate.perfil_combate(guerrero).base_ataque == perfil.base_ataque + 2
+
+        guerrero.equipar_armadura(crear_armadura_ligera())
+        reduccion = servicio_combate.perfil_combate(guerrero).reduccion_daño
+        guerrero.armadura_equipada.reduccion_daño += 3
+        assert servicio_combate.perfil_combate(guerrero).reduccion_daño == reduccion + 3
+    
+    def test_perfil_combate_estrategia_personalizada(self, guerrero, enemigo_debil):
+        """Verifica que registrar una estrategia recalcula el perfil y se respeta"""
+        class EstrategiaFija(EstrategiaAtaqueMelee):
+            def calcular_coeficiente(self, atacante, arma, dados):
+                return 100
+        
+        servicio = CombateService(EventBus(), semilla=3)
+        original = RegistroEstrategiasAtaque.obtener(TipoAtaque.MELEE)
+        servicio.perfil_combate(guerrero)
+        
+        RegistroEstrategiasAtaque.registrar(TipoAtaque.MELEE, EstrategiaFija())
+        try:
+            perfil = servicio.perfil_combate(guerrero)
+            ca, _ = servicio._calcular_coeficiente_ataque(guerrero)
+        finally:
+            RegistroEstrategiasAtaque.registrar(TipoAtaque.MELEE, original)
+        
+        assert not perfil.aditiva
+        assert ca == 100
+
+    # ========================================================================
+    # Tests de Combatiente Rápido
+    # ========================================================================
+    
+    def test_combatiente_rapido_mismo_combate(self, guerrero, enemigo_debil):
+        """Verifica que el combate con combatientes rápidos es idéntico"""
+        copias = [guerrero.model_copy(deep=True), enemigo_debil.model_copy(deep=True)]
+        estado = CombateService(EventBus(), semilla=21).ejecutar_combate(copias)
+        
+        servicio = CombateService(EventBus(), semilla=21, resultados_compactos=True)
+        rapidos = [servicio.crear_combatiente_rapido(p) for p in (guerrero, enemigo_debil)]
+        estado_rapido = servicio.ejecutar_combate(rapidos)
+        
+        assert estado_rapido.ganador == estado.ganador
+        assert estado_rapido.ataques_totales == estado.ataques_totales
+        assert [r.pv_actuales for r in rapidos] == [p.pv_actuales for p in copias]
+        # El historial guarda los compactos sin validar y se serializa igual
+        assert isinstance(estado_rapido.historial_ataques[0], ResultadoAtaqueCompacto)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert estado_rapido.model_dump() == estado.model_dump()
+        assert EstadoCombate.model_validate_json(
+            estado_rapido.model_dump_json()).historial_ataques == estado.historial_ataques
+        assert estado_rapido.obtener_historial() == estado.historial_ataques
+        assert isinstance(estado_rapido.historial_ataques[0], ResultadoAtaque)
+        # Los personajes originales no se tocan hasta volcar el estado
+        assert guerrero.pv_actuales == guerrero.pv_maximos
+    
+    def test_combatiente_rapido_conversion(self, servicio_combate, guerrero):
+        """Verifica que convertir ida y vuelta no pierde datos"""
+        rapido = servicio_combate.crear_combatiente_rapido(guerrero)
+        rapido.recibir_daño(5)
+        rapido.gastar_stamina(3)
+        
+        copia = rapido.a_personaje(copiar=True)
+        assert guerrero.pv_actuales == guerrero.pv_maximos
+        
+        personaje = rapido.a_personaje()
+        assert personaje is guerrero
+        assert personaje.model_dump() == copia.model_dump()
+        assert personaje.pv_actuales == rapido.pv_actuales
+        assert personaje.ps_actuales == rapido.ps_actuales
+    
+    def test_resultado_compacto_conversion(self, servicio_combate, guerrero, enemigo_debil):
+        """Verifica la conversión sin pérdida entre resultados"""
+        resultado = servicio_combate.resolver_ataque(guerrero, enemigo_debil)
+        
+        compacto = ResultadoAtaqueCompacto.desde_resultado(resultado)
+        
+        assert compacto.a_resultado() == resultado
+        assert compacto.descripcion_corta() == resultado.descripcion_corta()
+
+
+class TestRegistroCombate:
+    """Tests para el registro compacto y la reproducción de combates"""
+    
+    @pytest.fixture
+    def participantes(self):
+        """Tres combatientes en su estado previo al combate"""
+        personajes = []
+        for nombre, fuerza in (("Aldric", 8), ("Goblin", 5), ("Orco", 6)):
+            ficha = Ficha()
+            ficha.caracteristicas.fuerza = fuerza
+            ficha.caracteristicas.reflejos = 4
+            ficha.caracteristicas.resistencia = 4
+            ficha.caracteristicas.stamina = 2
+            ficha.combate.armas_cortantes = 10
+            personaje = Personaje(
+                nombre=nombre, edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+                hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=ficha
+            )
+            personaje.equipar_arma(crear_espada_basica())
+            personajes.append(personaje)
+        return personajes
+    
+    def combatir(self, participantes, registro):
+        copias = [p.model_copy(deep=True) for p in participantes]
+        servicio = CombateService(EventBus(), semilla=21, registro=registro)
+        estado = servicio.ejecutar_combate(copias, reroll_iniciativa=True)
+        return copias, estado
+    
+    def test_reproduccion_completa(self, participantes):
+        """Verifica que reproducir el registro llega al mismo estado final"""
+        registro = RegistroCombate()
+        copias, estado = self.combatir(participantes, registro)
+        
+        final = ReproductorCombate(registro, participantes).verificar()
+        
+        assert registro.semilla == 21
+        assert len(registro) == estado.ataques_totales
+        assert final.ganador == estado.ganador
+        for copia in copias:
+            assert final.obtener_combatiente_por_nombre(copia.nombre).pv_actuales == copia.pv_actuales
+    
+    def test_estado_intermedio(self, participantes):
+        """Verifica que estado_en reconstruye cualquier paso del combate"""
+        registro = RegistroCombate()
+        self.combatir(participantes, registro)
+        reproductor = ReproductorCombate(registro, participantes)
+        
+        paso = len(registro) // 2
+        for i, (_, estado) in enumerate(reproductor.pasos(), start=1):
+            if i == paso:
+                esperado = [(c.nombre, c.pv_actuales, c.ps_actuales) for c in estado.combatientes]
+                break
+        
+        estado = reproductor.estado_en(paso)
+        
+        assert estado.ataques_totales == paso
+        assert [(c.nombre, c.pv_actuales, c.ps_actuales) for c in estado.combatientes] == esperado
+    
+    def test_volcado_a_disco(self, participantes, tmp_path):
+        """Verifica que el registro volcado durante el combate se puede cargar"""
+        ruta = tmp_path / "combate.ebrc"
+        with RegistroCombate(ruta=str(ruta), guardar_en_memoria=False) as registro:
+            _, estado = self.combatir(participantes, registro)
+        
+        cargado = RegistroCombate.cargar(str(ruta))
+        
+        assert registro.tamaño_bytes() == 0
+        assert cargado.nombres == ["Aldric", "Goblin", "Orco"]
+        assert len(cargado) == estado.ataques_totales
+        assert ReproductorCombate(cargado, participantes).verificar().ganador == estado.ganador
+    
+    def test_guardar_y_cargar(self, participantes, tmp_path):
+        """Verifica el formato de archivo escrito por guardar()"""
+        registro = RegistroCombate()
+        self.combatir(participantes, registro)
+        
+        cargado = RegistroCombate.cargar(str(registro.guardar(str(tmp_path / "c.ebrc"))))
+        
+        assert cargado.semilla == registro.semilla
+        assert list(cargado) == list(registro)
+        assert cargado.dados == registro.dados
+    
+    def test_dados_de_muchas_caras(self, tmp_path):
+        """Verifica que el registro admite dados mayores a 255 y rechaza los que no entran"""
+        registro = RegistroCombate(semilla=1)
+        registro.iniciar(["A", "B"])
+        for valor in (1, 300, 65535):
+            registro.registrar_dado(valor)
+        with pytest.raises(ValueError):
+            registro.registrar_dado(70000)
+        
+        cargado = RegistroCombate.cargar(str(registro.guardar(str(tmp_path / "c.ebrc"))))
+        assert list(cargado.dados) == [1, 300, 65535]
+        assert cargado.total_dados == 3
+    
+    def test_registro_no_coincide(self, participantes):
+        """Verifica que reproducir con otros personajes detecta la divergencia"""
+        registro = RegistroCombate()
+        self.combatir(participantes, registro)
+        participantes[0].ficha.caracteristicas.fuerza = 20
+        
+        with pytest.raises(ValueError):
+            ReproductorCombate(registro, participantes).verificar()
+
+
+class TestPlanificadorTurnos:
+    """Tests para el planificador de turnos con cola de prioridad"""
+    
+    def tomar(self, planificador, n):
+        return [planificador.siguiente().nombre for _ in range(n)]
+    
+    def test_orden_por_iniciativa(self):
+        """Verifica el orden por iniciativa y el desempate por llegada"""
+        planificador = PlanificadorTurnos()
+        planificador.agregar("A", 10)
+        planificador.agregar("B", 15)
+        planificador.agregar("C", 10)
+        
+        assert self.tomar(planificador, 6) == ["B", "A", "C", "B", "A", "C"]
+        assert planificador.ronda_actual == 1
+    
+    def test_quitar_y_saltar_caidos(self):
+        """Verifica que los quitados y los caídos no reciben turno"""
+        caidos = {"C"}
+        planificador = PlanificadorTurnos(puede_actuar=lambda n: n not in caidos)
+        for nombre, iniciativa in (("A", 3), ("B", 2), ("C", 1), ("D", 0)):
+            planificador.agregar(nombre, iniciativa)
+        
+        planificador.quitar("B")
+        
+        assert self.tomar(planificador, 4) == ["A", "D", "A", "D"]
+        assert len(planificador) == 2
+    
+    def test_agregar_a_mitad_de_ronda(self):
+        """Verifica que un refuerzo se suma a la ronda en curso"""
+        planificador = PlanificadorTurnos()
+        planificador.agregar("A", 10)
+        planificador.agregar("B", 5)
+        assert planificador.siguiente().nombre == "A"
+        
+        planificador.agregar("R", 1)
+        
+        assert self.tomar(planificador, 3) == ["B", "R", "A"]
+    
+    def test_turnos_extra_por_velocidad(self):
+        """Verifica que las acciones extra se intercalan en la ronda"""
+        planificador = PlanificadorTurnos()
+        planificador.agregar("Rapido", 1, acciones_por_ronda=2)
+        planificador.agregar("Lento", 5)
+        
+        turnos = [planificador.siguiente() for _ in range(3)]
+        
+        assert [t.nombre for t in turnos] == ["Lento", "Rapido", "Rapido"]
+        assert [t.accion for t in turnos] == [0, 0, 1]
+        assert all(t.ronda == 0 for t in turnos)
+    
+    def test_reroll_por_ronda(self):
+        """Verifica que la iniciativa se vuelve a tirar al cerrar la ronda"""
+        tiradas = {"A": iter([1, 9, 0]), "B": iter([8, 2, 0])}
+        planificador = PlanificadorTurnos(tirar_iniciativa=lambda n: next(tiradas[n]))
+        planificador.agregar("A", 10)
+        planificador.agregar("B", 5)
+        
+        assert self.tomar(planificador, 6) == ["A", "B", "B", "A", "A", "B"]
+    
+    def test_cambiar_iniciativa(self):
+        """Verifica que cambiar la iniciativa reordena el próximo turno"""
+        planificador = PlanificadorTurnos()
+        planificador.agregar("A", 10)
+        planificador.agregar("B", 5)
+        
+        planificador.cambiar_iniciativa("B", 20)
+        
+        assert planificador.orden_previsto() == ["B", "A"]
+        assert self.tomar(planificador, 2) == ["B", "A"]
+
+
+class TestEscenarios:
+    """Tests para la ejecución masiva de escenarios"""
+    
+    @pytest.fixture
+    def escenario(self):
+        return Escenario.cargar("data/escenarios/emboscada_bandidos.json")
+    
+    def test_cargar_escenario(self, escenario):
+        """Verifica la carga del escenario de ejemplo"""
+        assert escenario.nombre == "emboscada_bandidos"
+        assert len(escenario.combatientes) == 5
+    
+    def test_resultados_independientes_de_procesos(self, escenario):
+        """Verifica que repartir las repeticiones no cambia el resultado"""
+        escenario.repeticiones = 20
+        
+        en_serie = EjecutorEscenarios(procesos=1).ejecutar([escenario])[0]
+        repartido = EjecutorEscenarios(procesos=2, repeticiones_por_tarea=7).ejecutar([escenario])[0]
+        
+        assert en_serie.repeticiones == 20
+        assert en_serie == repartido
+        assert sum(en_serie.victorias.values()) + en_serie.sin_ganador == 20
+
+
+class TestBatallaMasiva:
+    """Tests para las batallas masivas en formato struct-of-arrays"""
+    
+    @pytest.fixture
+    def ejercitos(self):
+        """Dos ejércitos de 100 soldados"""
+        pytest.importorskip("numpy")
+        soldados = []
+        for bando, fuerza in (("rojo", 7), ("azul", 5)):
+            for i in range(100):
+                ficha = Ficha()
+                ficha.caracteristicas.fuerza = fuerza
+                ficha.caracteristicas.reflejos = 4
+                ficha.caracteristicas.resistencia = 5
+                ficha.caracteristicas.stamina = 3
+                ficha.combate.armas_cortantes = 10
+                soldado = Personaje(
+                    nombre=f"{bando} {i}", edad=25, raza="Humano", clase=ClaseTipo.GUERRERO,
+                    hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL), ficha=ficha
+                )
+                soldado.equipar_arma(crear_espada_basica())
+                soldados.append(soldado)
+        bandos = {s.nombre: s.nombre.split()[0] for s in soldados}
+        return soldados, bandos
+    
+    def test_vistas_leen_en_vivo(self, ejercitos):
+        """Verifica que las vistas reflejan los arrays sin copiar"""
+        soldados, bandos = ejercitos
+        estado = BatallaMasivaService(semilla=1).iniciar_batalla(soldados, bandos)
+        vista = estado.vista("azul 3")
+        
+        assert vista.bando == "azul"
+        assert vista.pv_actuales == soldados[103].pv_maximos
+        
+        estado.pv[estado.fila("azul 3")] = 7
+        assert vista.pv_actuales == 7
+        assert vista.porcentaje_vida() == 7 / vista.pv_maximos * 100
+    
+    def test_filas_usan_perfil_combate(self, ejercitos):
+        """Verifica que ataque, reflejos y reducción salen del perfil de combate"""
+        soldados, bandos = ejercitos
+        soldados[0].equipar_armadura(crear_armadura_ligera())
+        servicio = CombateService(EventBus())
+        estado = BatallaMasivaService(semilla=1).iniciar_batalla(soldados, bandos)
+        perfil = servicio.perfil_combate(soldados[0])
+        
+        assert estado.ataque[0] == servicio.base_ataque(soldados[0]) == perfil.base_ataque
+        assert estado.reflejos[0] == perfil.modificador_reflejos
+        assert estado.reduccion[0] == perfil.reduccion_daño > 0
+    
+    def test_objetivos_son_enemigos_vivos(self, ejercitos):
+        """Verifica que nadie ataca a su bando ni a los caídos"""
+        soldados, bandos = ejercitos
+        servicio = BatallaMasivaService(semilla=2)
+        estado = servicio.iniciar_batalla(soldados, bandos)
+        estado.vivos[150:] = False
+        
+        atacantes, objetivos = servicio._elegir_objetivos()
+        
+        assert len(atacantes) == 150
+        assert estado.vivos[objetivos].all()
+        assert (estado.codigo_bando[atacantes] != estado.codigo_bando[objetivos]).all()
+    
+    def test_batalla_completa(self, ejercitos):
+        """Verifica que la batalla termina y vuelca el estado en los personajes"""
+        soldados, bandos = ejercitos
+        
+        estado = BatallaMasivaService(semilla=3).ejecutar_batalla(soldados, bandos)
+        
+        assert not estado.activa
+        assert estado.ganador == "rojo"  # Más fuerza
+        assert set(estado.vivos_por_bando()) == {"rojo"}
+        for soldado in soldados:
+            assert soldado.esta_vivo == estado.vista(soldado.nombre).esta_vivo
+            assert soldado.pv_actuales == estado.vista(soldado.nombre).pv_actuales
+    
+    def test_batalla_reproducible(self, ejercitos):
+        """Verifica que la misma semilla produce la misma batalla"""
+        soldados, bandos = ejercitos
+        copias = [s.model_copy(deep=True) for s in soldados]
+        
+        e1 = BatallaMasivaService(semilla=4).ejecutar_batalla(soldados, bandos)
+        e2 = BatallaMasivaService(semilla=4).ejecutar_batalla(copias, bandos)
+        
+        assert e1.ronda == e2.ronda
+        assert (e1.pv == e2.pv).all()
+    
+    def test_indice_estado_combate(self):
+        """Verifica la búsqueda por nombre tras agregar combatientes"""
+        estado = EstadoCombate()
+        for nombre in ("A", "B"):
+            estado.combatientes.append(EstadoCombatiente(
+                nombre=nombre, pv_actuales=10, pv_maximos=10, ps_actuales=5,
+                ps_maximos=5, esta_vivo=True, esta_inconsciente=False
+            ))
+            estado.orden_turnos.append(nombre)
+        
+        assert estado.obtener_combatiente_por_nombre("B") is estado.combatientes[1]
+        assert estado.obtener_combatiente_actual().nombre == "A"
+        assert estado.obtener_combatiente_por_nombre("C") is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -4,10 +4,12 @@ Ejecutar con: pytest tests/test_entidades.py -v
 """
 import pytest
 from entidades import (
-    Personaje, Ficha, Hephix, HephixTipo, ClaseTipo,
+    Personaje, Ficha, Caracteristicas, CATEGORIA_HABILIDAD, Hephix, HephixTipo, ClaseTipo,
     Arma, Armadura, Inventario, TipoArma, TipoAtaque,
     tirar_dados, establecer_semilla, Constantes,
-    crear_espada_basica, crear_pocion_vida_menor
+    ResultadoTirada, tirar_dados_lote,
+    distribucion_dados, probabilidades_ataque,
+    crear_espada_basica, crear_pocion_vida_menor, CONTEXTO_GUARDADO
 )
 
 
@@ -38,6 +40,57 @@ class TestDados:
         assert resultado1.total == resultado2.total
         assert resultado1.dados == resultado2.dados
 
+    def test_tirar_dados_lote_rango(self):
+        """Verifica forma y rango de las tiradas en lote"""
+        pytest.importorskip("numpy")
+        lote = tirar_dados_lote(1000, 3, 6)
+
+        assert lote.dados.shape == (1000, 3)
+        assert len(lote) == 1000
+        assert lote.dados.min() >= 1 and lote.dados.max() <= 6
+        assert (lote.totales == lote.dados.sum(axis=1)).all()
+
+    def test_tirar_dados_lote_vistas(self):
+        """Verifica que cada tirada del lote se puede ver como ResultadoTirada"""
+        pytest.importorskip("numpy")
+        establecer_semilla(7)
+        lote = tirar_dados_lote(5, 2, 6)
+
+        resultado = lote[3]
+        assert isinstance(resultado, ResultadoTirada)
+        assert resultado.total == sum(resultado.dados)
+        assert [r.total for r in lote] == lote.totales.tolist()
+
+        establecer_semilla(7)
+        assert tirar_dados_lote(5, 2, 6).totales.tolist() == lote.totales.tolist()
+
+
+class TestDistribuciones:
+    """Tests para las distribuciones exactas de dados"""
+    
+    def test_distribucion_3d6(self):
+        """Verifica la PMF/CDF exacta de 3d6"""
+        dist = distribucion_dados(3, 6)
+        
+        assert dist.minimo == 3 and dist.maximo == 18
+        assert dist.total_combinaciones == 216
+        assert dist.pmf(10) == 27 / 216
+        assert dist.cdf(18) == 1.0
+        assert dist.cdf(2) == 0.0
+        assert dist.media() == 10.5
+    
+    def test_distribucion_memorizada(self):
+        """Verifica que la distribución se calcula una sola vez por (N, M)"""
+        assert distribucion_dados(2, 6) is distribucion_dados(2, 6)
+    
+    def test_probabilidades_ataque_suman_uno(self):
+        """Verifica que los desenlaces de ataque cubren todo el espacio"""
+        probs = probabilidades_ataque(8, 4)
+        
+        assert abs(sum(probs.values()) - 1.0) < 1e-12
+        # CA - CD = 4 + (3d6 - 2d6): el éxito es lo más probable
+        assert probs["exito"] > probs["bloqueado"] > probs["contraataque"]
+
 
 # ============================================================================
 # Tests de Hephix
@@ -138,6 +191,46 @@ class TestFicha:
         
         # Cada 5 puntos = +1 bonus
         assert ficha.obtener_bonus_habilidad('armas_cortantes') == 3
+        assert ficha.obtener_bonus_habilidad('total_puntos') == 0  # No es habilidad
+    
+    def test_stats_derivados_se_recalculan(self):
+        """Verifica que el caché de stats se invalida al editar la ficha"""
+        ficha = Ficha()
+        ficha.caracteristicas.resistencia = 5
+        ficha.caracteristicas.voluntad = 4
+        assert ficha.pv_maximos == 50
+        
+        ficha.caracteristicas.resistencia = 8
+        assert ficha.pv_maximos == 80
+        
+        ficha.hephix_tipo = HephixTipo.SANGRIENTA
+        assert ficha.pv_maximos == 80 + 4 * 5
+        assert ficha.pm_maximos == 0
+        
+        ficha.caracteristicas = Caracteristicas(resistencia=2)
+        assert ficha.pv_maximos == 20
+    
+    def test_igualdad_ignora_caches(self):
+        """Verifica que versiones y cachés no afectan la igualdad"""
+        ficha = Ficha()
+        ficha.caracteristicas.fuerza = 3
+        ficha.caracteristicas.fuerza = 0
+        assert ficha.pv_maximos == 0
+        
+        assert ficha == Ficha()
+        assert ficha.version_stats() != Ficha().version_stats()
+    
+    def test_aplicar_bonificaciones_clase(self):
+        """Verifica que las bonificaciones van a la categoría de cada habilidad"""
+        ficha = Ficha()
+        ficha.aplicar_bonificaciones_clase({"armas_cortantes": 2, "medicina": 3,
+                                            "sigilo": 1, "fuerza": 5})
+        
+        assert CATEGORIA_HABILIDAD["medicina"] == "educacion"
+        assert ficha.combate.armas_cortantes == 2
+        assert ficha.educacion.medicina == 3
+        assert ficha.talento.sigilo == 1
+        assert ficha.fuerza == 0
 
 
 # ============================================================================
@@ -237,6 +330,222 @@ class TestInventario:
         encontrada = inv.buscar_item("Poción de Vida Menor")
         assert encontrada is not None
         assert encontrada.nombre == pocion.nombre
+    
+    def test_indices_tras_serializacion(self):
+        """Verifica que búsquedas y peso siguen correctos tras un round-trip"""
+        from entidades.inventario import Item
+        inv = Inventario(capacidad_maxima=500)
+        for i in range(300):
+            inv.agregar_item(Item(nombre=f"Gema {i}", peso=0.5, cantidad=2))
+        inv.agregar_arma(crear_espada_basica())
+        inv.remover_item("Gema 7", 2)
+        
+        assert inv.peso_total() == pytest.approx(299 * 0.5 * 2)
+        
+        for copia in (Inventario.model_validate(inv.model_dump()), inv.model_copy(deep=True)):
+            assert copia == inv
+            assert copia.buscar_item("GEMA 42").nombre == "Gema 42"
+            assert copia.buscar_item("Gema 7") is None
+            assert copia.buscar_arma(inv.armas[0].nombre.upper()) is not None
+            assert copia.peso_total() == pytest.approx(inv.peso_total())
+            
+            copia.agregar_item(Item(nombre="Gema 42", peso=0.5))
+            assert copia.buscar_item("gema 42").cantidad == 3
+            assert inv.buscar_item("gema 42").cantidad == 2
+
+    def test_model_copy_y_cantidad_directa(self):
+        """Verifica que copia y original mantienen su propio peso"""
+        from entidades.inventario import Item
+        inv = Inventario()
+        inv.agregar_item(Item(nombre="Gema", peso=0.5, cantidad=2))
+        inv.agregar_arma(crear_espada_basica())
+        peso = inv.peso_total()
+
+        copia = inv.model_copy()
+        assert copia == inv
+        copia.agregar_item(Item(nombre="Cuerda", peso=1.0))
+        assert copia.remover_arma(inv.armas[0].nombre) is not None
+        assert copia.peso_total() == pytest.approx(peso + 1.0 - inv.armas[0].peso)
+        assert inv.peso_total() == pytest.approx(peso)
+        assert inv.buscar_item("cuerda") is None
+        assert len(inv.armas) == 1
+
+        # Cambiar la cantidad sin pasar por el inventario
+        inv.buscar_item("gema").cantidad = 6
+        assert inv.peso_total() == pytest.approx(peso + 2.0)
+        assert copia.peso_total() == pytest.approx(3.0 + 1.0)
+
+    def test_remover_mantiene_indices(self):
+        """Verifica que remover actualiza índices, orden y peso"""
+        from entidades.inventario import Item
+        inv = Inventario()
+        for nombre in ("A", "B", "C"):
+            inv.agregar_item(Item(nombre=nombre, peso=1.0))
+        
+        assert inv.remover_item("B")
+        assert not inv.remover_item("B")
+        assert [i.nombre for i in inv.items] == ["A", "C"]
+        assert inv.buscar_item("b") is None
+        assert inv.peso_total() == 2.0
+
+    def test_consultar_coincide_con_filtrado_lineal(self):
+        """Verifica consultas por rareza y rangos, también tras agregar y quitar"""
+        import random
+        from entidades import RarezaItem
+        rng = random.Random(7)
+        rarezas = list(RarezaItem)
+        inv = Inventario(capacidad_maxima=1000)
+        for i in range(200):
+            inv.agregar_arma(Arma(nombre=f"Arma {i}", tipo_arma=TipoArma.CORTANTE_PUNZANTE,
+                                  tipo_ataque=TipoAtaque.MELEE, rareza=rng.choice(rarezas),
+                                  valor=rng.randint(0, 500), peso=rng.randint(1, 20) / 2,
+                                  nivel_requerido=rng.randint(1, 10)))
+
+        def esperado():
+            armas = [a for a in inv.armas
+                     if a.rareza == RarezaItem.EPICO and a.peso <= 5 and a.valor >= 100]
+            return sorted(armas, key=lambda a: a.valor, reverse=True)
+
+        consulta = dict(categoria="armas", rareza=RarezaItem.EPICO,
+                        peso_max=5, valor_min=100, descendente=True)
+        assert [a.valor for a in inv.consultar(**consulta)] == [a.valor for a in esperado()]
+
+        inv.agregar_arma(Arma(nombre="Nueva", tipo_arma=TipoArma.CONTUNDENTE,
+                              tipo_ataque=TipoAtaque.MELEE, rareza=RarezaItem.EPICO,
+                              valor=999, peso=1))
+        for arma in list(inv.armas[:50]):
+            inv.remover_arma(arma.nombre)
+        resultado = inv.consultar(**consulta)
+        assert resultado[0].nombre == "Nueva"
+        assert [a.valor for a in resultado] == [a.valor for a in esperado()]
+
+        # Un rango muy selectivo sobre otra clave da el mismo orden
+        por_nivel = inv.consultar("armas", nivel_min=10, nivel_max=10, ordenar_por="peso")
+        assert [a.peso for a in por_nivel] == sorted(
+            a.peso for a in inv.armas if a.nivel_requerido == 10)
+
+    def test_consultar_paginado(self):
+        """Verifica paginado, mezcla de categorías y validación de parámetros"""
+        from entidades.inventario import Item
+        inv = Inventario(capacidad_maxima=100)
+        for i in range(10):
+            inv.agregar_item(Item(nombre=f"Gema {i}", valor=i * 10, peso=0.1))
+        inv.agregar_arma(Arma(nombre="Daga", tipo_arma=TipoArma.CORTANTE_PUNZANTE,
+                              tipo_ataque=TipoAtaque.MELEE, valor=45, peso=1.0))
+
+        assert inv.peso_total() == pytest.approx(2.0)
+        paginas = [inv.consultar(pagina=p, por_pagina=4) for p in range(3)]
+        assert [len(p) for p in paginas] == [4, 4, 3]
+        assert [o.nombre for o in paginas[1]] == ["Gema 4", "Daga", "Gema 5", "Gema 6"]
+        assert inv.consultar(pagina=5, por_pagina=4) == []
+
+        with pytest.raises(ValueError):
+            inv.consultar("monturas")
+        with pytest.raises(ValueError):
+            inv.consultar(ordenar_por="nombre")
+
+    def test_catalogo_serializa_solo_deltas(self):
+        """Verifica que los objetos del catálogo se guardan como ID + cambios"""
+        from entidades.inventario import ItemConsumible
+        inv = Inventario()
+        inv.agregar_item(crear_pocion_vida_menor())
+        inv.agregar_item(crear_pocion_vida_menor())
+        espada = crear_espada_basica()
+        espada.mejora_mecanica = 3
+        inv.agregar_arma(espada)
+
+        datos = inv.model_dump(mode="json", context=CONTEXTO_GUARDADO)
+        assert datos["items"] == [{"id_catalogo": "pocion_vida_menor", "cantidad": 2}]
+        assert datos["armas"] == [{"id_catalogo": "espada_basica", "mejora_mecanica": 3}]
+
+        # Fuera del guardado model_dump da los datos completos
+        completos = inv.model_dump(mode="json")
+        assert completos["armas"][0]["nombre"] == espada.nombre
+        assert completos["items"][0]["nombre"] == "Poción de Vida Menor"
+
+        cargado = Inventario.model_validate_json(inv.model_dump_json(context=CONTEXTO_GUARDADO))
+        assert cargado == inv
+        assert Inventario.model_validate(completos) == inv
+        assert isinstance(cargado.items[0], ItemConsumible)
+        assert cargado.items[0].efecto == "restaurar_pv"
+
+    def test_catalogo_comparte_definicion(self):
+        """Verifica que las instancias comparten valores y no alteran la definición"""
+        from entidades import CATALOGO
+        a, b = crear_espada_basica(), crear_espada_basica()
+        assert a is not b
+        assert a.descripcion is b.descripcion
+
+        a.mejora_magica = 5
+        assert CATALOGO.definicion("espada_basica").mejora_magica == 0
+        assert crear_espada_basica().mejora_magica == 0
+        with pytest.raises(ValueError):
+            CATALOGO.registrar("espada_basica", a)
+    
+    def test_catalogo_valida_cambios(self):
+        """Verifica que crear valida los cambios contra el modelo de la definición"""
+        from entidades import CATALOGO
+        from entidades.inventario import ItemConsumible
+        pociones = CATALOGO.crear("pocion_vida_menor", cantidad=3)
+        assert isinstance(pociones, ItemConsumible)
+        assert pociones.cantidad == 3 and pociones.efecto == "restaurar_pv"
+        
+        with pytest.raises(ValueError):
+            CATALOGO.crear("pocion_vida_menor", cantidad=0)
+        with pytest.raises(ValueError):
+            CATALOGO.crear("espada_basica", cantidad=2)
+
+    def test_auto_empacar_respeta_limites(self):
+        """Verifica que el auto-empaque elige la mejor combinación posible"""
+        from entidades.inventario import Item
+        inv = Inventario(capacidad_maxima=3, peso_maximo=10.0)
+        inv.agregar_item(Item(nombre="Piedra", valor=1, peso=5.0))
+        inv.agregar_item(Item(nombre="Flecha", valor=2, peso=0.5, cantidad=4))
+        botin = [
+            Item(nombre="Rubí", valor=100, peso=1.0),
+            Item(nombre="Flecha", valor=2, peso=0.5, cantidad=10),
+            Arma(nombre="Hacha", tipo_arma=TipoArma.CORTANTE_PUNZANTE,
+                 tipo_ataque=TipoAtaque.MELEE, valor=30, peso=6.0),
+            Item(nombre="Yunque", valor=500, peso=50.0),
+        ]
+
+        resultado = inv.auto_empacar(botin)
+
+        # Rubí (100) + Hacha (30) + 6 flechas (12) en 3 slots y 10 kg
+        assert resultado.utilidad_total == 142
+        assert inv.cantidad_items_totales() <= 3
+        assert inv.peso_total() <= 10.0
+        assert inv.buscar_item("Flecha").cantidad == 6
+        assert inv.buscar_arma("Hacha") is not None
+        descartados = {o.nombre: getattr(o, "cantidad", 1) for o in resultado.descartados}
+        assert descartados == {"Piedra": 1, "Flecha": 8, "Yunque": 1}
+        assert botin[1].cantidad == 10  # Los candidatos no se modifican
+
+    def test_auto_empacar_utilidad_personalizada(self):
+        """Verifica el auto-empaque con otra utilidad y sin límite de peso"""
+        from entidades.inventario import Item
+        inv = Inventario(capacidad_maxima=2)
+        botin = [Item(nombre=f"Gema {i}", valor=i, peso=float(i)) for i in range(1, 6)]
+
+        inv.auto_empacar(botin, utilidad=lambda objeto: -objeto.valor + 10)
+
+        assert sorted(i.nombre for i in inv.items) == ["Gema 1", "Gema 2"]
+        assert inv.buscar_item("Gema 1") is botin[0]
+
+    def test_auto_empacar_descarta_utilidad_negativa(self):
+        """Verifica que con lugar de sobra solo se completa con utilidad cero"""
+        from entidades.inventario import Item
+        inv = Inventario(capacidad_maxima=10)
+        inv.agregar_item(Item(nombre="Maldición", valor=5))
+        botin = [Item(nombre="Rubí", valor=50), Item(nombre="Piedra", valor=0)]
+        malditos = {"Maldición"}
+
+        resultado = inv.auto_empacar(
+            botin, utilidad=lambda objeto: -1 if objeto.nombre in malditos else objeto.valor)
+
+        assert sorted(i.nombre for i in inv.items) == ["Piedra", "Rubí"]
+        assert [o.nombre for o in resultado.descartados] == ["Maldición"]
+        assert resultado.utilidad_total == 50
 
 
 # ============================================================================
@@ -2,10 +2,16 @@
 Tests unitarios para los patrones de diseño.
 Ejecutar con: pytest tests/test_patrones.py -v
 """
+import json
+import os
 import pytest
 from patrones import (
     SingletonMeta, 
     FactoryConRegistro,
+    FactoryDesdeJSON,
+    ContenidoCompilado,
+    compilar_contenido,
+    cargar_contenido,
     EventBus,
     TipoEvento,
     RegistroEstrategiasAtaque,
@@ -115,6 +121,87 @@ class TestFactory:
         assert len(tipos) == 2
 
 
+class TestContenidoCompilado:
+    """Tests para el compilador de contenido"""
+
+    @pytest.fixture
+    def fuente(self, tmp_path):
+        ruta = tmp_path / "armas.json"
+        ruta.write_text(json.dumps({
+            "espada": {"tipo_clase": "arma", "nombre": "Espada", "daño": 5},
+            "maza": {"tipo_clase": "arma", "nombre": "Maza", "daño": 7}
+        }), encoding="utf-8")
+        return ruta
+
+    def test_compilar_y_leer_packs(self, fuente, tmp_path):
+        """Verifica que el binario conserva cada definición y su pack"""
+        otra = tmp_path / "clases.json"
+        otra.write_text('{"mago": {"nombre": "Mago"}}', encoding="utf-8")
+
+        destino = compilar_contenido([fuente, otra], tmp_path / "pack.ebc")
+        contenido = ContenidoCompilado(destino)
+
+        assert contenido.packs() == ["armas", "clases"]
+        armas = contenido.pack("armas")
+        assert list(armas) == ["espada", "maza"]
+        assert armas["maza"]["daño"] == 7
+        assert armas["maza"] is armas["maza"]  # Se decodifica una sola vez
+        assert dict(contenido.pack("clases")) == {"mago": {"nombre": "Mago"}}
+        contenido.cerrar()
+
+    def test_recompila_si_la_fuente_cambia(self, fuente, tmp_path):
+        """Verifica la recompilación automática por cambio de contenido"""
+        destino = tmp_path / "armas.ebc"
+        primero = cargar_contenido([fuente], destino)
+        assert cargar_contenido([fuente], destino) is primero
+
+        fuente.write_text('{"arco": {"nombre": "Arco"}}', encoding="utf-8")
+        segundo = cargar_contenido([fuente], destino)
+        assert segundo is not primero
+        assert list(segundo.pack("armas")) == ["arco"]
+
+        # Un archivo corrupto también se regenera
+        destino.write_bytes(b"basura")
+        from patrones import contenido_compilado
+        contenido_compilado._abiertos.clear()
+        assert list(cargar_contenido([fuente], destino).pack("armas")) == ["arco"]
+
+    def test_solo_mtime_reescribe_la_firma(self, fuente, tmp_path, monkeypatch):
+        """Verifica que un cambio de mtime sin cambio de contenido no recompila"""
+        from patrones import contenido_compilado
+        destino = tmp_path / "armas.ebc"
+        cargar_contenido([fuente], destino)
+        estado = fuente.stat()
+        os.utime(fuente, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9))
+
+        def no_recompilar(*args):
+            raise AssertionError("no debería recompilar")
+        monkeypatch.setattr(contenido_compilado, "compilar_contenido", no_recompilar)
+        contenido = cargar_contenido([fuente], destino)
+
+        assert contenido.indice["fuentes"][0]["mtime_ns"] == fuente.stat().st_mtime_ns
+        assert contenido.pack("armas")["maza"]["daño"] == 7
+        contenido_compilado._abiertos.clear()
+        reabierto = cargar_contenido([fuente], destino)
+        assert reabierto.indice["fuentes"] == contenido.indice["fuentes"]
+
+    def test_factory_desde_json_compilado(self, fuente):
+        """Verifica que FactoryDesdeJSON crea objetos desde el compilado"""
+        class Arma:
+            def __init__(self, nombre: str, daño: int):
+                self.nombre = nombre
+                self.daño = daño
+
+        base = FactoryConRegistro[Arma]()
+        base.registrar("arma", Arma)
+        factory = FactoryDesdeJSON(str(fuente), base)
+
+        assert factory.crear("maza").daño == 7
+        assert factory.crear("espada", daño=9).daño == 9
+        assert factory.obtener_definicion("espada")["daño"] == 5
+        assert (fuente.parent / "__contenido__" / "armas.ebc").exists()
+
+
 # ============================================================================
 # Tests de Observer
 # ============================================================================
@@ -193,6 +280,39 @@ class TestObserver:
         bus.publicar(TipoEvento.NIVEL_SUBIDO)
         assert len(contador) == 1  # Ahora sí
 
+    def test_eventbus_datos_diferidos(self):
+        """Verifica que los datos diferidos solo se arman si alguien escucha"""
+        bus = EventBus(guardar_historial=False)
+
+        llamadas = []
+        def construir():
+            llamadas.append(1)
+            return {"daño": 7}
+
+        assert not bus.tiene_interesados(TipoEvento.DAÑO_RECIBIDO)
+        bus.publicar(TipoEvento.DAÑO_RECIBIDO, construir)
+        assert len(llamadas) == 0  # Nadie escucha: no se construyó
+
+        recibidos = []
+        bus.suscribir(TipoEvento.DAÑO_RECIBIDO, recibidos.append)
+        assert bus.tiene_interesados(TipoEvento.DAÑO_RECIBIDO)
+        bus.publicar(TipoEvento.DAÑO_RECIBIDO, construir)
+
+        assert len(llamadas) == 1
+        assert recibidos[0].datos == {"daño": 7}
+        assert bus.obtener_historial() == []
+
+    def test_eventbus_historial_acotado(self):
+        """Verifica que el historial conserva solo los últimos eventos"""
+        bus = EventBus()
+
+        for i in range(150):
+            bus.publicar(TipoEvento.ATAQUE_REALIZADO, lambda i=i: {"n": i})
+
+        historial = bus.obtener_historial(limite=200)
+        assert len(historial) == 100
+        assert historial[0].datos == {"n": 149}
+
 
 # ============================================================================
 # Tests de Strategy
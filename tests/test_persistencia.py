@@ -2,14 +2,16 @@
 Tests para el servicio de persistencia.
 Ejecutar con: pytest tests/test_persistencia.py -v
 """
+import json
 import pytest
 import shutil
 from pathlib import Path
 from servicios.persistencia_service import PersistenciaService
+from servicios.codec_guardado import leer_guardado
 from servicios.persistencia_estructuras import (
     ContextoNarrativo, EventoNarrativo, TipoEvento
 )
-from entidades import Personaje, Ficha, Hephix, HephixTipo, ClaseTipo
+from entidades import Personaje, Ficha, Hephix, HephixTipo, ClaseTipo, crear_espada_basica
 from patrones import SingletonMeta
 
 
@@ -120,12 +122,13 @@ class TestPersistenciaService:
         datos = servicio.cargar_partida(1)
         assert datos.personaje['nivel'] == 5
     
-    def test_autoguardar(self, servicio, personaje_prueba, contexto_prueba):
-        """Verifica funcionamiento del autoguardado"""
+    def test_autoguardar(self, servicio, personaje_prueba, contexto_prueba, capsys):
+        """Verifica funcionamiento del autoguardado (sin salida por consola)"""
         archivo = servicio.autoguardar(personaje_prueba, contexto_prueba, slot=2)
         
         assert archivo.exists()
         assert servicio.existe_partida(2)
+        assert capsys.readouterr().out == ""
     
     # ========================================================================
     # Tests de Carga
@@ -298,6 +301,198 @@ class TestPersistenciaService:
         assert valido is False
         assert "vacío" in error.lower()
 
+    # ========================================================================
+    # Tests de Carga Confiable
+    # ========================================================================
+    
+    def test_carga_confiable_equivale_a_validada(self, servicio, personaje_prueba, contexto_prueba):
+        """Verifica que la carga sin validación arma los mismos modelos"""
+        personaje_prueba.equipar_arma(crear_espada_basica())
+        servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        
+        validada = servicio.cargar_partida(1)
+        confiable = servicio.cargar_partida(1, confiable=True)
+        
+        assert confiable == validada
+        assert confiable.contexto.log_narrativo[0].tipo is TipoEvento.COMBATE
+        
+        personaje = servicio.cargar_personaje(1, confiable=True)
+        assert personaje == servicio.cargar_personaje(1)
+        assert personaje.arma_equipada.tipo_arma == personaje_prueba.arma_equipada.tipo_arma
+        assert personaje.pv_maximos == personaje_prueba.pv_maximos
+    
+    def test_carga_confiable_hash_distinto_valida(self, servicio, personaje_prueba, contexto_prueba):
+        """Verifica que un archivo modificado se valida completo"""
+        archivo = servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        assert "integridad" in json.loads(archivo.read_text(encoding="utf-8"))
+        
+        # Fuera de rango, sin actualizar el hash
+        texto = archivo.read_text(encoding="utf-8").replace('"edad": 25', '"edad": 500')
+        archivo.write_text(texto, encoding="utf-8")
+        
+        servicio.cargar_partida(1, confiable=True)  # DatosPartida sigue siendo válida
+        with pytest.raises(ValueError, match="edad"):
+            servicio.cargar_personaje(1, confiable=True)
+
+    # ========================================================================
+    # Tests de Manifiesto
+    # ========================================================================
+    
+    def test_manifiesto_evita_abrir_slots(self, servicio, personaje_prueba, contexto_prueba, monkeypatch):
+        """Verifica que listar usa el manifiesto y que guardar/eliminar lo mantienen"""
+        servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=2)
+        servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=5)
+        servicio.eliminar_partida(5)
+        
+        manifiesto = json.loads((self.test_dir / "manifiesto.json").read_text(encoding="utf-8"))
+        assert set(manifiesto["slots"]) == {"2"}
+        
+        def no_cargar(*args, **kwargs):
+            raise AssertionError("listar no debería abrir los slots")
+        monkeypatch.setattr(servicio, "cargar_partida", no_cargar)
+        
+        slots = servicio.listar_partidas()
+        assert [s.slot for s in slots if s.existe] == [2]
+        assert slots[1].nombre_personaje == "Aldric Test"
+        assert servicio.verificar_integridad(2) == (True, None)
+    
+    def test_manifiesto_se_reconstruye(self, servicio, personaje_prueba, contexto_prueba):
+        """Verifica la reconstrucción si falta el manifiesto o un slot cambió por fuera"""
+        archivo = servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=3)
+        
+        (self.test_dir / "manifiesto.json").write_text("{roto", encoding="utf-8")
+        assert [s.slot for s in servicio.listar_partidas() if s.existe] == [1, 3]
+        
+        # Edición externa (cambia el tamaño) y borrado sin pasar por el servicio
+        texto = archivo.read_text(encoding="utf-8").replace('"nivel": 1', '"nivel": 12')
+        archivo.write_text(texto, encoding="utf-8")
+        (self.test_dir / "slot_03.json").unlink()
+        
+        slots = servicio.listar_partidas()
+        assert slots[0].nivel == 12
+        assert not slots[2].existe
+        
+        # Un slot corrupto se lista como vacío
+        archivo.write_text("no es json", encoding="utf-8")
+        assert not servicio.listar_partidas()[0].existe
+
+    
+    # ========================================================================
+    # Tests de Guardado Atómico e Incremental
+    # ========================================================================
+    
+    def test_guardado_incremental(self, servicio, personaje_prueba, contexto_prueba, monkeypatch):
+        """Verifica que el guardado incremental solo reserializa las secciones marcadas"""
+        serializaciones = []
+        original = Personaje.to_dict_guardado
+        monkeypatch.setattr(Personaje, "to_dict_guardado",
+                            lambda p: serializaciones.append(1) or original(p))
+        
+        servicio.autoguardar(personaje_prueba, contexto_prueba, slot=1, incremental=True)
+        contexto_prueba.agregar_evento(EventoNarrativo(tipo=TipoEvento.OTRO, descripcion="Nuevo"))
+        servicio.marcar_modificado("contexto", slot=1)
+        archivo = servicio.autoguardar(personaje_prueba, contexto_prueba, slot=1, incremental=True)
+        assert len(serializaciones) == 1
+        
+        datos = servicio.cargar_partida(1, confiable=True)
+        assert datos.contexto.log_narrativo[-1].descripcion == "Nuevo"
+        assert servicio.verificar_integridad(1) == (True, None)
+        
+        # Cada slot tiene su propia captura: el primero de otro slot es completo
+        servicio.autoguardar(personaje_prueba, contexto_prueba, slot=3, incremental=True)
+        assert len(serializaciones) == 2
+        
+        # Por defecto el autoguardado es completo: los cambios en el lugar se guardan
+        personaje_prueba.nivel = 4
+        servicio.autoguardar(personaje_prueba, contexto_prueba, slot=1)
+        assert servicio.cargar_partida(1).personaje["nivel"] == 4
+        personaje_prueba.nivel = 5
+        servicio.marcar_modificado("personaje", slot=1)
+        servicio.autoguardar(personaje_prueba, contexto_prueba, slot=1, incremental=True)
+        assert servicio.cargar_partida(1).personaje["nivel"] == 5
+        
+        incremental = archivo.read_text(encoding="utf-8")
+        servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=2)
+        completo = (self.test_dir / "slot_02.json").read_text(encoding="utf-8")
+        assert json.loads(incremental)["personaje"] == json.loads(completo)["personaje"]
+        
+        with pytest.raises(ValueError):
+            servicio.marcar_modificado("inventario")
+    
+    def test_guardado_atomico(self, servicio, personaje_prueba, contexto_prueba, monkeypatch):
+        """Verifica que un fallo al escribir no daña el slot anterior"""
+        archivo = servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        anterior = archivo.read_bytes()
+        
+        def corte(*args):
+            raise OSError("corte de energía")
+        monkeypatch.setattr("servicios.escritura_atomica.os.replace", corte)
+        
+        personaje_prueba.nivel = 9
+        with pytest.raises(OSError):
+            servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        
+        assert archivo.read_bytes() == anterior
+        assert sorted(p.name for p in self.test_dir.iterdir()) == ["manifiesto.json", "slot_01.json"]
+
+    
+    # ========================================================================
+    # Tests de Codecs
+    # ========================================================================
+    
+    @pytest.mark.parametrize("formato", ["compacto", "zlib"])
+    def test_codec_binario(self, formato, personaje_prueba, contexto_prueba):
+        """Verifica el guardado con cabecera y el camino confiable"""
+        servicio = PersistenciaService(directorio_guardados=str(self.test_dir), formato=formato)
+        personaje_prueba.equipar_arma(crear_espada_basica())
+        archivo = servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        
+        leido = leer_guardado(archivo.read_bytes())
+        assert archivo.suffix != ".json"
+        assert archivo.read_bytes().startswith(b"EBSV")
+        assert (leido.codec, leido.version_esquema, leido.verificado) == (formato, "1.0.0", True)
+        assert servicio.cargar_partida(1, confiable=True) == servicio.cargar_partida(1)
+        assert servicio.cargar_personaje(1, confiable=True) == servicio.cargar_personaje(1)
+        assert servicio.listar_partidas()[0].nombre_personaje == "Aldric Test"
+        assert servicio.verificar_integridad(1) == (True, None)
+    
+    def test_lee_slots_de_otro_codec(self, personaje_prueba, contexto_prueba):
+        """Verifica que los slots JSON existentes se leen con otro codec configurado"""
+        servicio = PersistenciaService(directorio_guardados=str(self.test_dir), formato="json")
+        servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        original = servicio.cargar_partida(1)
+        
+        SingletonMeta.reset_instances()
+        servicio = PersistenciaService(directorio_guardados=str(self.test_dir), formato="zlib")
+        assert servicio.existe_partida(1)
+        assert servicio.cargar_partida(1, confiable=True) == original
+        assert servicio.listar_partidas()[0].existe
+        
+        # Al volver a guardar, el .json anterior se reemplaza por el del codec
+        archivo = servicio.guardar_partida(personaje_prueba, contexto_prueba, slot=1)
+        assert leer_guardado(archivo.read_bytes()).codec == "zlib"
+        assert sorted(p.name for p in self.test_dir.glob("slot_*")) == ["slot_01.ebz"]
+        assert servicio.cargar_personaje(1) == personaje_prueba
+        
+        # Codec desconocido en la cabecera
+        archivo.write_bytes(archivo.read_bytes().replace(b"zlib", b"rar\0", 1))
+        with pytest.raises(ValueError, match="rar"):
+            servicio.cargar_partida(1)
+        SingletonMeta.reset_instances()
+        with pytest.raises(ValueError):
+            PersistenciaService(directorio_guardados=str(self.test_dir), formato="rar")
+    
+    def test_nombre_de_codec_largo(self):
+        """Verifica que un nombre que no entra en la cabecera se rechaza"""
+        from servicios.codec_guardado import CodecCompacto
+        
+        class CodecLargo(CodecCompacto):
+            nombre = "compacto_v2"
+        
+        with pytest.raises(ValueError, match="8 bytes"):
+            CodecLargo().armar({"slot": "1"}, "1.0.0")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Tests para el simulador de duelos.
+Ejecutar con: pytest tests/test_simulacion.py -v
+"""
+import pytest
+from servicios.simulacion_service import SimuladorDuelos, PerfilDuelo
+from servicios.torneo_service import TorneoRoundRobin, ResultadoTorneo, generar_builds
+from entidades import (
+    Personaje, Ficha, Hephix, HephixTipo, ClaseTipo, crear_espada_basica,
+    crear_armadura_ligera
+)
+
+
+def crear_luchador(nombre: str, fuerza: int, reflejos: int, sigilo: int = 0) -> Personaje:
+    """Crea un personaje simple para duelos"""
+    ficha = Ficha()
+    ficha.caracteristicas.fuerza = fuerza
+    ficha.caracteristicas.reflejos = reflejos
+    ficha.caracteristicas.resistencia = 5
+    ficha.caracteristicas.stamina = 2
+    ficha.combate.armas_cortantes = 10
+    ficha.talento.sigilo = sigilo
+
+    personaje = Personaje(
+        nombre=nombre,
+        edad=25,
+        raza="Humano",
+        clase=ClaseTipo.GUERRERO,
+        hephix=Hephix.crear_desde_tipo(HephixTipo.ELEMENTAL),
+        ficha=ficha
+    )
+    personaje.equipar_arma(crear_espada_basica())
+    return personaje
+
+
+class TestSimuladorDuelos:
+    """Tests para el simulador Monte Carlo"""
+
+    @pytest.fixture
+    def fuerte(self):
+        return crear_luchador("Fuerte", fuerza=10, reflejos=6)
+
+    @pytest.fixture
+    def debil(self):
+        return crear_luchador("Débil", fuerza=3, reflejos=2)
+
+    def test_perfil_desde_personaje(self, fuerte):
+        """Verifica que el perfil refleja la fórmula de CA sin dados"""
+        perfil = PerfilDuelo.desde_personaje(fuerte)
+
+        # Fuerza 10 + espada 2 + bonus habilidad (10 // 5 = 2)
+        assert perfil.base_ataque == 14
+        assert perfil.defensa == 6
+        assert perfil.pv == 50
+        assert perfil.ps == 10
+
+        fuerte.equipar_armadura(crear_armadura_ligera())
+        perfil = PerfilDuelo.desde_personaje(fuerte)
+        assert perfil.reduccion_daño == fuerte.armadura_equipada.reduccion_total() > 0
+
+    def test_servicio_no_modifica_originales(self, fuerte, debil):
+        """Verifica que la simulación de referencia usa copias"""
+        simulador = SimuladorDuelos()
+        resultado = simulador.simular_con_servicio(fuerte, debil, 20, semilla=1)
+
+        assert resultado.n_duelos == 20
+        assert resultado.victorias_a + resultado.victorias_b + resultado.empates == 20
+        assert fuerte.pv_actuales == fuerte.pv_maximos
+        assert debil.esta_vivo
+
+    def test_vectorizado_reproducible(self, fuerte, debil):
+        """Verifica que la misma semilla produce las mismas estadísticas"""
+        pytest.importorskip("numpy")
+        simulador = SimuladorDuelos(sigilo_inicial=True)
+
+        r1 = simulador.simular_vectorizado(fuerte, debil, 500, semilla=3)
+        r2 = simulador.simular_vectorizado(fuerte, debil, 500, semilla=3)
+
+        assert r1 == r2
+        assert sum(r1.turnos.values()) == 500
+
+    def test_caminos_coinciden(self, fuerte, debil):
+        """Verifica que el camino vectorizado reproduce las reglas del servicio"""
+        pytest.importorskip("numpy")
+        simulador = SimuladorDuelos()
+
+        referencia = simulador.simular_con_servicio(debil, fuerte, 1500, semilla=11)
+        rapido = simulador.simular_vectorizado(debil, fuerte, 20000, semilla=11)
+
+        assert rapido.tasa_victoria_b > 0.9
+        assert abs(referencia.tasa_victoria_b - rapido.tasa_victoria_b) < 0.05
+        assert abs(referencia.turnos_promedio() - rapido.turnos_promedio()) < 0.5
+
+
+class TestTorneo:
+    """Tests para el torneo round-robin"""
+
+    CLASES = [ClaseTipo.GUERRERO, ClaseTipo.MAGO]
+    HEPHIX = [HephixTipo.ELEMENTAL, HephixTipo.SANGRIENTA]
+
+    def test_generar_builds(self):
+        """Verifica un build por cada par Clase × Hephix"""
+        builds = generar_builds(self.CLASES, self.HEPHIX)
+
+        assert [b.nombre for b in builds] == [
+            "guerrero-elemental", "guerrero-sangrienta",
+            "mago-elemental", "mago-sangrienta"
+        ]
+        assert all(b.ficha.caracteristicas.total_puntos() == 20 for b in builds)
+
+    def test_torneo_independiente_de_procesos(self, tmp_path):
+        """Verifica que el resultado no depende del reparto entre procesos"""
+        pytest.importorskip("numpy")
+        opciones = dict(n_duelos=200, semilla=5, tamaño_lote=2,
+                        clases=self.CLASES, hephix=self.HEPHIX)
+
+        local = TorneoRoundRobin(procesos=1, **opciones).ejecutar()
+        ruta = tmp_path / "torneo.json"
+        en_pool = TorneoRoundRobin(procesos=2, **opciones).ejecutar(str(ruta))
+
+        assert local.tasas == en_pool.tasas
+        assert ResultadoTorneo.cargar(str(ruta)).tasas == en_pool.tasas
+        assert local.tasas[0][0] is None
+        assert len(local.ranking()) == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])